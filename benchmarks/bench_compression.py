@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+# Licensed to Anthony Shaw (anthonyshaw@apache.org) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Bytes on the wire and paging time with and without gzip compression, against the
+synthetic server over a simulated WAN link.
+
+    cd benchmarks && python bench_compression.py --records 10000 --bandwidth 5000000
+"""
+
+import argparse
+import time
+
+import workday
+from workday.auth import AnonymousAuthentication
+
+from synthetic import SyntheticServer
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--records", type=int, default=10000)
+    parser.add_argument("--page-size", type=int, default=500)
+    parser.add_argument("--fields", type=int, default=30)
+    parser.add_argument(
+        "--bandwidth", type=int, default=5000000, help="bytes per second, 0 for unlimited"
+    )
+    args = parser.parse_args()
+
+    for compress in (False, True):
+        with SyntheticServer(
+            operations=5,
+            fields=args.fields,
+            records=args.records,
+            page_size=args.page_size,
+            compress=compress,
+        ) as server:
+            client = workday.WorkdayClient(
+                wsdls={"synthetic": server.url},
+                authentication=AnonymousAuthentication(),
+                response_mode="dict",
+                compress_requests=0 if compress else None,
+            )
+            # Generate and compress the pages up front so only the transfer is measured
+            for _ in client.synthetic.Get_Object_0s.iter_records("Object_0"):
+                pass
+            server.bytes_sent = server.bytes_received = 0
+            server.bandwidth = args.bandwidth or None
+
+            start = time.time()
+            count = sum(1 for _ in client.synthetic.Get_Object_0s.iter_records("Object_0"))
+            elapsed = time.time() - start
+            print(
+                "{0:<6}{1:>9} records {2:>12} bytes received {3:>10} bytes sent {4:>8.2f}s".format(
+                    "gzip" if compress else "plain",
+                    count,
+                    server.bytes_sent,
+                    server.bytes_received,
+                    elapsed,
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
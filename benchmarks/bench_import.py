@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+# Licensed to Anthony Shaw (anthonyshaw@apache.org) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""
+Time to import the package in a fresh interpreter. ``import workday`` should not
+load requests, zeep or lxml, these are imported when the client is first used.
+``from workday import WorkdayClient`` loads requests, but zeep, lxml and the optional
+features are imported when an API is first used.
+
+    cd benchmarks && python bench_import.py --max-ms 50 --max-client-ms 150
+
+The exit status is 1 when ``import workday`` takes longer than ``--max-ms`` or
+``from workday import WorkdayClient`` longer than ``--max-client-ms``.
+"""
+
+import argparse
+import subprocess
+import sys
+
+STATEMENTS = (
+    ("import workday", "import workday"),
+    ("import workday.auth", "import workday.auth"),
+    ("WorkdayClient", "from workday import WorkdayClient"),
+)
+
+_TIMER = """
+import time
+start = time.perf_counter()
+{0}
+print(time.perf_counter() - start)
+"""
+
+
+def import_time(statement, repeat=5):
+    """
+    Best time of ``statement`` in fresh interpreters, in seconds
+    """
+    times = []
+    for _ in range(repeat):
+        output = subprocess.check_output(
+            [sys.executable, "-c", _TIMER.format(statement)]
+        )
+        times.append(float(output))
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--max-ms", type=float, default=50.0, help="slowest acceptable import workday"
+    )
+    parser.add_argument(
+        "--max-client-ms",
+        type=float,
+        default=150.0,
+        help="slowest acceptable from workday import WorkdayClient",
+    )
+    args = parser.parse_args()
+
+    results = {}
+    for name, statement in STATEMENTS:
+        results[name] = import_time(statement, args.repeat)
+        print("{0:<22}{1:>10.1f}ms".format(name, results[name] * 1000))
+
+    failed = False
+    if results["import workday"] * 1000 > args.max_ms:
+        print("import workday is slower than {0}ms".format(args.max_ms))
+        failed = True
+    if results["WorkdayClient"] * 1000 > args.max_client_ms:
+        print(
+            "from workday import WorkdayClient is slower than {0}ms".format(
+                args.max_client_ms
+            )
+        )
+        failed = True
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+# Licensed to Anthony Shaw (anthonyshaw@apache.org) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Records per second when pages fetched on several threads are parsed in 0 (in the calling
+process), 1, 2, 4 ... worker processes. Parsing scales with the number of cores until the
+fetching or the synthetic server, which runs in this process, becomes the bottleneck.
+
+    cd benchmarks && python bench_parse_processes.py --records 20000 --processes 0 1 2 4
+"""
+
+import argparse
+import multiprocessing
+import time
+
+import workday
+from workday.auth import AnonymousAuthentication
+
+from synthetic import SyntheticServer
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--records", type=int, default=20000)
+    parser.add_argument("--page-size", type=int, default=500)
+    parser.add_argument("--fields", type=int, default=30)
+    parser.add_argument("--threads", type=int, default=8, help="pages fetched at once")
+    parser.add_argument(
+        "--processes",
+        type=int,
+        nargs="+",
+        default=[0, 1, 2, 4, multiprocessing.cpu_count()],
+    )
+    args = parser.parse_args()
+
+    print("{0} CPUs".format(multiprocessing.cpu_count()))
+    with SyntheticServer(
+        operations=5, fields=args.fields, records=args.records, page_size=args.page_size
+    ) as server:
+        for processes in sorted(set(args.processes)):
+            client = workday.WorkdayClient(
+                wsdls={"synthetic": server.url},
+                authentication=AnonymousAuthentication(),
+                response_mode="dict",
+                max_workers=args.threads,
+                pool_maxsize=args.threads,
+                parse_processes=processes or None,
+            )
+            method = client.synthetic.Get_Object_0s
+            # Start the processes and let the server generate every page once
+            sum(1 for _ in method.iter_records("Object_0"))
+
+            start = time.time()
+            count = sum(1 for _ in method.iter_records("Object_0"))
+            elapsed = time.time() - start
+            client.close()
+            print(
+                "{0:>3} processes {1:>9} records {2:>8.2f}s {3:>10.0f} records/s".format(
+                    processes, count, elapsed, count / elapsed
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
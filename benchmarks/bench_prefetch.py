@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+# Licensed to Anthony Shaw (anthonyshaw@apache.org) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Paging with and without background prefetch, for a service with a fixed latency
+per page and a consumer with a fixed processing time per page.
+
+    cd benchmarks && python bench_prefetch.py --pages 50 --latency 0.02 --process 0.02
+"""
+
+import argparse
+import time
+
+from workday.soap import WorkdayResponse
+
+
+class LatencyService(object):
+    def __init__(self, pages, latency):
+        self.pages = pages
+        self.latency = latency
+
+    def Get_Test(self, **kwargs):
+        page = kwargs.get("Response_Filter", {}).get("Page", 1)
+        time.sleep(self.latency)
+        return {
+            "Response_Results": {
+                "Page": page,
+                "Total_Pages": self.pages,
+                "Total_Results": self.pages,
+                "Page_Results": 1,
+            },
+            "Response_Data": {"Record": [page]},
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--process", type=float, default=0.02)
+    args = parser.parse_args()
+
+    service = LatencyService(args.pages, args.latency)
+    for prefetch in (None, 1, 4):
+        first = WorkdayResponse(
+            service.Get_Test(),
+            service=service,
+            method="Get_Test",
+            called_args=(),
+            called_kwargs={},
+        )
+        start = time.time()
+        pages = first.iter_pages(prefetch=prefetch)
+        for _ in pages:
+            time.sleep(args.process)
+        elapsed = time.time() - start
+        if prefetch:
+            print(
+                "prefetch={0:<5}{1:>8.3f}s  consumer waited {2:.3f}s, producer waited {3:.3f}s".format(
+                    prefetch,
+                    elapsed,
+                    pages.stats.consumer_wait,
+                    pages.stats.producer_wait,
+                )
+            )
+        else:
+            print("prefetch=off  {0:>8.3f}s".format(elapsed))
+
+
+if __name__ == "__main__":
+    main()
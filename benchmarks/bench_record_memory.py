@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+# Licensed to Anthony Shaw (anthonyshaw@apache.org) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Memory held per record by the zeep, dict and slots response modes,
+measured with tracemalloc while all the records of the result set are kept.
+
+    cd benchmarks && python bench_record_memory.py --records 5000 --fields 30
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+
+import workday
+from workday.auth import AnonymousAuthentication
+
+from synthetic import SyntheticServer
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--records", type=int, default=5000)
+    parser.add_argument("--page-size", type=int, default=500)
+    parser.add_argument("--fields", type=int, default=30)
+    args = parser.parse_args()
+
+    with SyntheticServer(
+        operations=5, fields=args.fields, records=args.records, page_size=args.page_size
+    ) as server:
+        for mode in ("zeep", "dict", "slots"):
+            client = workday.WorkdayClient(
+                wsdls={"synthetic": server.url},
+                authentication=AnonymousAuthentication(),
+                response_mode=mode,
+            )
+            api = client.synthetic
+            # Warm up so generated classes and the WSDL are not counted
+            list(api.Get_Object_1s.iter_records("Object_1"))
+
+            gc.collect()
+            tracemalloc.start()
+            before = tracemalloc.get_traced_memory()[0]
+            start = time.time()
+            records = list(api.Get_Object_0s.iter_records("Object_0"))
+            elapsed = time.time() - start
+            gc.collect()
+            held = tracemalloc.get_traced_memory()[0] - before
+            tracemalloc.stop()
+            print(
+                "{0:<6}{1:>9} records {2:>10.0f} bytes/record {3:>8.2f}s".format(
+                    mode, len(records), held / float(len(records)), elapsed
+                )
+            )
+            del records
+
+
+if __name__ == "__main__":
+    main()
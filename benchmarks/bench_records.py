@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+# Licensed to Anthony Shaw (anthonyshaw@apache.org) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Peak memory of streaming records with iter_records() against collecting every page,
+for a synthetic result set.
+
+    cd benchmarks && python bench_records.py --records 1000000 --page-size 1000
+"""
+
+import argparse
+import time
+import tracemalloc
+
+from workday.soap import WorkdayResponse
+
+
+class SyntheticService(object):
+    def __init__(self, records, page_size):
+        self.records = records
+        self.page_size = page_size
+        self.pages = -(-records // page_size)
+
+    def Get_Records(self, **kwargs):
+        page = kwargs.get("Response_Filter", {}).get("Page", 1)
+        start = (page - 1) * self.page_size
+        end = min(start + self.page_size, self.records)
+        return {
+            "Response_Results": {
+                "Page": page,
+                "Total_Pages": self.pages,
+                "Total_Results": self.records,
+                "Page_Results": end - start,
+            },
+            "Response_Data": {
+                "Record": [
+                    {"ID": "ID-{0}".format(i), "Name": "Record {0}".format(i), "Index": i}
+                    for i in range(start, end)
+                ]
+            },
+        }
+
+
+def _first_page(service):
+    return WorkdayResponse(
+        service.Get_Records(),
+        service=service,
+        method="Get_Records",
+        called_args=(),
+        called_kwargs={},
+    )
+
+
+def collect_all(service):
+    first = _first_page(service)
+    results = list(first.data["Record"])
+    for page in first.iter_pages():
+        results.extend(page.data["Record"])
+    return len(results)
+
+
+def stream(service):
+    count = 0
+    for _ in _first_page(service).iter_records("Record"):
+        count += 1
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--records", type=int, default=1000000)
+    parser.add_argument("--page-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    service = SyntheticService(args.records, args.page_size)
+    for name, func in (("iter_records", stream), ("collect pages", collect_all)):
+        tracemalloc.start()
+        start = time.time()
+        count = func(service)
+        elapsed = time.time() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(
+            "{0:<15}{1:>9} records {2:>8.1f}s  peak {3:>8.1f} MiB".format(
+                name, count, elapsed, peak / 1024.0 / 1024.0
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+# Licensed to Anthony Shaw (anthonyshaw@apache.org) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Paging throughput of the zeep, dict and xml response modes against the synthetic server.
+
+    cd benchmarks && python bench_response_mode.py --records 20000 --page-size 500
+"""
+
+import argparse
+import time
+
+import workday
+from workday.auth import AnonymousAuthentication
+
+from synthetic import SyntheticServer
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--records", type=int, default=20000)
+    parser.add_argument("--page-size", type=int, default=500)
+    parser.add_argument("--fields", type=int, default=30)
+    args = parser.parse_args()
+
+    with SyntheticServer(
+        operations=5, fields=args.fields, records=args.records, page_size=args.page_size
+    ) as server:
+        # Generate the pages up front so only the client is measured
+        warmup = workday.WorkdayClient(
+            wsdls={"synthetic": server.url},
+            authentication=AnonymousAuthentication(),
+            response_mode="xml",
+        )
+        for _ in warmup.synthetic.Get_Object_0s.iter_records("Object_0"):
+            pass
+        for mode in ("zeep", "dict", "xml"):
+            client = workday.WorkdayClient(
+                wsdls={"synthetic": server.url},
+                authentication=AnonymousAuthentication(),
+                response_mode=mode,
+            )
+            client.synthetic
+            start = time.time()
+            count = sum(
+                1 for _ in client.synthetic.Get_Object_0s.iter_records("Object_0")
+            )
+            elapsed = time.time() - start
+            print(
+                "{0:<6}{1:>9} records {2:>8.2f}s {3:>10.0f} records/s".format(
+                    mode, count, elapsed, count / elapsed
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
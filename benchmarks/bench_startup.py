@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+# Licensed to Anthony Shaw (anthonyshaw@apache.org) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Client startup time for a large synthetic WSDL: cold parse, parse from the
+WSDL cache, loading a precompiled snapshot and lazy compilation. Also shows the time
+to the first call and the memory held by the client after it.
+
+    cd benchmarks && python bench_startup.py --operations 400 --fields 30
+"""
+
+import argparse
+import shutil
+import tempfile
+import time
+import tracemalloc
+
+import workday
+from workday.auth import AnonymousAuthentication
+from workday.cache import WsdlCache
+
+from synthetic import SyntheticServer
+
+
+def _startup(url, **kwargs):
+    tracemalloc.start()
+    start = time.time()
+    client = workday.WorkdayClient(
+        wsdls={"synthetic": url}, authentication=AnonymousAuthentication(), **kwargs
+    )
+    client.synthetic._client.service
+    loaded = time.time() - start
+    client.synthetic.Get_Object_0s()
+    first_call = time.time() - start
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return loaded, first_call, memory
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--operations", type=int, default=200)
+    parser.add_argument("--fields", type=int, default=30)
+    parser.add_argument("--latency", type=float, default=0.1, help="Server latency in seconds")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    try:
+        with SyntheticServer(args.operations, args.fields, args.latency) as server:
+            print(
+                "WSDL: {0} operations, {1} bytes".format(args.operations, len(server.wsdl))
+            )
+            cache = WsdlCache(path=workdir + "/cache")
+            snapshot_dir = workdir + "/snapshots"
+            # Warm the cache and compile the snapshot
+            _startup(server.url, wsdl_cache=cache, snapshot_dir=snapshot_dir)
+
+            cases = (
+                ("cold parse", {}),
+                ("cached parse", {"wsdl_cache": cache}),
+                ("snapshot load", {"snapshot_dir": snapshot_dir}),
+                ("lazy compile", {"lazy_schema": True}),
+            )
+            print("{0:<16}{1:>11}{2:>12}{3:>12}".format("", "load", "first call", "memory"))
+            for name, kwargs in cases:
+                loaded, first_call, memory = min(
+                    _startup(server.url, **kwargs) for _ in range(args.repeat)
+                )
+                print(
+                    "{0:<16}{1:>10.3f}s{2:>11.3f}s{3:>10.1f}MB".format(
+                        name, loaded, first_call, memory / 1e6
+                    )
+                )
+    finally:
+        shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,323 @@
+# -*- coding: utf-8 -*-
+# Licensed to Anthony Shaw (anthonyshaw@apache.org) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Benchmark suite against the synthetic Workday server: client startup, single-call latency,
+paging throughput, memory per record and concurrent load.
+
+Results are written as JSON with the version, commit and parameters, so runs of different
+versions can be compared:
+
+    cd benchmarks
+    python suite.py --output baseline.json
+    git checkout my-branch
+    python suite.py --output branch.json --compare baseline.json
+
+With ``--compare`` the exit status is 1 when a result is worse than the baseline by more
+than ``--threshold`` percent. Use ``--quick`` for a smaller run.
+"""
+
+import argparse
+import gc
+import json
+import platform
+import subprocess
+import sys
+import threading
+import time
+import tracemalloc
+
+import workday
+from workday.auth import AnonymousAuthentication
+from workday.metrics import Metrics
+
+from bench_import import import_time
+from synthetic import SyntheticServer
+
+
+def _client(server, **kwargs):
+    client = workday.WorkdayClient(
+        wsdls={"synthetic": server.url}, authentication=AnonymousAuthentication(), **kwargs
+    )
+    # Parse the WSDL now so it isn't counted in the first call
+    client.synthetic._client.service
+    return client
+
+
+def _percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(q * (len(values) - 1))))]
+
+
+def _result(value, unit, better):
+    return {"value": value, "unit": unit, "better": better}
+
+
+def bench_startup(args):
+    with SyntheticServer(args.operations, args.fields, depth=args.depth) as server:
+        times = []
+        for _ in range(args.repeat):
+            start = time.time()
+            _client(server)
+            times.append(time.time() - start)
+        lazy = []
+        for _ in range(args.repeat):
+            start = time.time()
+            _client(server, lazy_schema=True).synthetic.Get_Object_0s()
+            lazy.append(time.time() - start)
+        return {
+            "startup.wsdl_bytes": _result(len(server.wsdl), "bytes", None),
+            "startup.cold_parse": _result(min(times), "s", "lower"),
+            "startup.lazy_first_call": _result(min(lazy), "s", "lower"),
+            "startup.import": _result(
+                import_time("import workday", args.repeat), "s", "lower"
+            ),
+        }
+
+
+def bench_latency(args):
+    with SyntheticServer(
+        5,
+        args.fields,
+        latency=args.latency,
+        records=args.page_size,
+        page_size=args.page_size,
+        depth=args.depth,
+    ) as server:
+        results = {}
+        for mode in ("zeep", "dict"):
+            method = _client(server, response_mode=mode).synthetic.Get_Object_0s
+            method()
+            timings = [method().timings for _ in range(args.calls)]
+            totals = [t.total for t in timings]
+            results["latency.{0}.p50".format(mode)] = _result(
+                _percentile(totals, 0.5), "s", "lower"
+            )
+            results["latency.{0}.p95".format(mode)] = _result(
+                _percentile(totals, 0.95), "s", "lower"
+            )
+            results["latency.{0}.parse_build".format(mode)] = _result(
+                sum(t.parse + t.build for t in timings) / len(timings), "s", "lower"
+            )
+        return results
+
+
+def bench_paging(args):
+    with SyntheticServer(
+        5,
+        args.fields,
+        latency=args.latency,
+        records=args.records,
+        page_size=args.page_size,
+        depth=args.depth,
+    ) as server:
+        results = {}
+        for mode in ("zeep", "dict"):
+            for workers in (1, args.threads):
+                client = _client(server, response_mode=mode, max_workers=workers)
+                method = client.synthetic.Get_Object_0s
+                # Let the server generate every page once
+                sum(1 for _ in method.iter_records("Object_0"))
+                start = time.time()
+                count = sum(1 for _ in method.iter_records("Object_0"))
+                elapsed = time.time() - start
+                results["paging.{0}.workers_{1}".format(mode, workers)] = _result(
+                    count / elapsed, "records/s", "higher"
+                )
+        return results
+
+
+def bench_memory(args):
+    records = min(args.records, 5000)
+    with SyntheticServer(
+        5, args.fields, records=records, page_size=args.page_size, depth=args.depth
+    ) as server:
+        results = {}
+        for mode in ("zeep", "dict", "slots"):
+            method = _client(server, response_mode=mode).synthetic.Get_Object_0s
+            sum(1 for _ in method.iter_records("Object_0"))
+            gc.collect()
+            tracemalloc.start()
+            before = tracemalloc.get_traced_memory()[0]
+            kept = list(method.iter_records("Object_0"))
+            gc.collect()
+            after = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+            results["memory.{0}".format(mode)] = _result(
+                (after - before) / float(len(kept)), "bytes/record", "lower"
+            )
+            del kept
+        return results
+
+
+def bench_concurrency(args):
+    with SyntheticServer(
+        5,
+        args.fields,
+        latency=args.latency,
+        records=args.page_size,
+        page_size=args.page_size,
+        depth=args.depth,
+    ) as server:
+        metrics = Metrics()
+        client = _client(
+            server, response_mode="dict", hooks=[metrics], pool_maxsize=args.threads
+        )
+        method = client.synthetic.Get_Object_0s
+        method()
+        metrics.reset()
+
+        def run():
+            for _ in range(args.calls):
+                method()
+
+        threads = [threading.Thread(target=run) for _ in range(args.threads)]
+        start = time.time()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.time() - start
+        stats = metrics.snapshot()[("synthetic", "Get_Object_0s")]
+        return {
+            "concurrency.calls_per_second": _result(
+                stats["calls"] / elapsed, "calls/s", "higher"
+            ),
+            "concurrency.p95": _result(stats["p95"], "s", "lower"),
+            "concurrency.connections": _result(
+                client.pool_stats.connections, "connections", None
+            ),
+        }
+
+
+BENCHMARKS = (
+    ("startup", bench_startup),
+    ("latency", bench_latency),
+    ("paging", bench_paging),
+    ("memory", bench_memory),
+    ("concurrency", bench_concurrency),
+)
+
+
+def _commit():
+    try:
+        return (
+            subprocess.check_output(
+                ["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.STDOUT
+            )
+            .decode("ascii")
+            .strip()
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline, threshold):
+    """
+    Print the change of each result against the baseline
+
+    :return: The names of the results that regressed by more than ``threshold`` percent
+    """
+    regressions = []
+    reference = baseline.get("commit") or baseline.get("version")
+    print(
+        "\n{0:<32}{1:>14}{2:>14}{3:>10}".format(
+            "compared to {0}".format(reference), "baseline", "current", "change"
+        )
+    )
+    for name, result in sorted(results["results"].items()):
+        old = baseline["results"].get(name)
+        if old is None or not old["value"]:
+            continue
+        change = (result["value"] - old["value"]) * 100.0 / old["value"]
+        worse = (result["better"] == "lower" and change > threshold) or (
+            result["better"] == "higher" and change < -threshold
+        )
+        if worse:
+            regressions.append(name)
+        print(
+            "{0:<32}{1:>14.4g}{2:>14.4g}{3:>+9.1f}%{4}".format(
+                name, old["value"], result["value"], change, "  REGRESSION" if worse else ""
+            )
+        )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--operations", type=int, default=200, help="operations in the WSDL")
+    parser.add_argument("--fields", type=int, default=30, help="fields per record")
+    parser.add_argument("--depth", type=int, default=3, help="nesting levels of records")
+    parser.add_argument("--records", type=int, default=20000, help="records to page through")
+    parser.add_argument("--page-size", type=int, default=500)
+    parser.add_argument(
+        "--latency", type=float, default=0.01, help="server latency per request in seconds"
+    )
+    parser.add_argument("--calls", type=int, default=50, help="calls per latency run and thread")
+    parser.add_argument("--threads", type=int, default=8, help="concurrent callers")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--quick", action="store_true", help="small sizes for a fast run")
+    parser.add_argument(
+        "--only", nargs="+", choices=[name for name, _ in BENCHMARKS], help="benchmarks to run"
+    )
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="JSON results of a previous run to compare with")
+    parser.add_argument(
+        "--threshold", type=float, default=20.0, help="percent change that counts as a regression"
+    )
+    args = parser.parse_args()
+    if args.quick:
+        args.operations, args.records, args.calls, args.repeat = 20, 2000, 10, 1
+
+    results = {
+        "version": workday.__version__,
+        "commit": _commit(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "parameters": dict(
+            (name, value)
+            for name, value in vars(args).items()
+            if name not in ("output", "compare", "threshold", "only")
+        ),
+        "results": {},
+    }
+    for name, bench in BENCHMARKS:
+        if args.only and name not in args.only:
+            continue
+        start = time.time()
+        for key, result in sorted(bench(args).items()):
+            results["results"][key] = result
+            print("{0:<32}{1:>14.4g} {2}".format(key, result["value"], result["unit"]))
+        print("  ({0} took {1:.1f}s)".format(name, time.time() - start))
+
+    if args.output:
+        with open(args.output, "w") as fo:
+            json.dump(results, fo, indent=2, sort_keys=True)
+
+    if args.compare:
+        with open(args.compare) as fo:
+            baseline = json.load(fo)
+        if baseline["parameters"] != results["parameters"]:
+            print("\nWarning: the baseline was run with different parameters")
+        if compare(results, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,365 @@
+# -*- coding: utf-8 -*-
+# Licensed to Anthony Shaw (anthonyshaw@apache.org) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Synthetic Workday-style WSDLs and a local HTTP server to serve them, for benchmarks.
+"""
+
+import gzip
+import io
+import threading
+import time
+
+from lxml import etree
+from six.moves import BaseHTTPServer, socketserver
+
+NAMESPACE = "urn:com.workday/bsvc"
+SOAP_ENV = "http://schemas.xmlsoap.org/soap/envelope/"
+
+
+#: Fields of each nested Detail level
+DETAIL_FIELDS = 5
+
+
+def _complex_type(name, fields, nested, detail=None):
+    elements = "".join(
+        '<xsd:element name="Field_{0}" type="xsd:string" minOccurs="0"/>'.format(i)
+        for i in range(fields)
+    )
+    if nested:
+        elements += (
+            '<xsd:element name="Reference" type="wd:{0}" minOccurs="0" '
+            'maxOccurs="unbounded"/>'.format(nested)
+        )
+    if detail:
+        elements += '<xsd:element name="Detail" type="wd:{0}" minOccurs="0"/>'.format(detail)
+    return '<xsd:complexType name="{0}"><xsd:sequence>{1}</xsd:sequence></xsd:complexType>'.format(
+        name, elements
+    )
+
+
+def _detail_type(obj, level):
+    return "{0}_Detail_{1}_Type".format(obj, level)
+
+
+def generate_wsdl(operations=50, fields=20, location="http://localhost/service", depth=1):
+    """
+    Generate a document/literal WSDL with ``operations`` paged Get_* operations,
+    each returning records of their own type with ``fields`` fields. With a ``depth``
+    above 1 the records contain ``depth - 1`` levels of nested ``Detail`` elements.
+
+    :rtype: ``bytes``
+    """
+    types = [
+        _complex_type("ID_Type", 2, None),
+        '<xsd:complexType name="Response_Filter_Type"><xsd:sequence>'
+        '<xsd:element name="As_Of_Effective_Date" type="xsd:date" minOccurs="0"/>'
+        '<xsd:element name="As_Of_Entry_DateTime" type="xsd:dateTime" minOccurs="0"/>'
+        '<xsd:element name="Page" type="xsd:decimal" minOccurs="0"/>'
+        '<xsd:element name="Count" type="xsd:decimal" minOccurs="0"/>'
+        "</xsd:sequence></xsd:complexType>",
+        '<xsd:complexType name="Response_Results_Type"><xsd:sequence>'
+        '<xsd:element name="Total_Results" type="xsd:decimal" minOccurs="0"/>'
+        '<xsd:element name="Total_Pages" type="xsd:decimal" minOccurs="0"/>'
+        '<xsd:element name="Page_Results" type="xsd:decimal" minOccurs="0"/>'
+        '<xsd:element name="Page" type="xsd:decimal" minOccurs="0"/>'
+        "</xsd:sequence></xsd:complexType>",
+    ]
+    elements = []
+    messages = []
+    port_ops = []
+    binding_ops = []
+    for i in range(operations):
+        obj = "Object_{0}".format(i)
+        op = "Get_{0}s".format(obj)
+        for level in range(1, depth):
+            types.append(
+                _complex_type(
+                    _detail_type(obj, level),
+                    DETAIL_FIELDS,
+                    None,
+                    _detail_type(obj, level + 1) if level + 1 < depth else None,
+                )
+            )
+        types.append(
+            _complex_type(
+                obj + "_Data_Type",
+                fields,
+                "ID_Type",
+                _detail_type(obj, 1) if depth > 1 else None,
+            )
+        )
+        types.append(
+            '<xsd:complexType name="{0}_Type"><xsd:sequence>'
+            '<xsd:element name="{0}_Reference" type="wd:ID_Type" minOccurs="0"/>'
+            '<xsd:element name="{0}_Data" type="wd:{0}_Data_Type" minOccurs="0"/>'
+            "</xsd:sequence></xsd:complexType>".format(obj)
+        )
+        types.append(
+            '<xsd:complexType name="{0}_Response_Data_Type"><xsd:sequence>'
+            '<xsd:element name="{0}" type="wd:{0}_Type" minOccurs="0" maxOccurs="unbounded"/>'
+            "</xsd:sequence></xsd:complexType>".format(obj)
+        )
+        elements.append(
+            '<xsd:element name="{0}_Request"><xsd:complexType><xsd:sequence>'
+            '<xsd:element name="Response_Filter" type="wd:Response_Filter_Type" minOccurs="0"/>'
+            "</xsd:sequence></xsd:complexType></xsd:element>".format(op)
+        )
+        elements.append(
+            '<xsd:element name="{0}_Response"><xsd:complexType><xsd:sequence>'
+            '<xsd:element name="Response_Filter" type="wd:Response_Filter_Type" minOccurs="0"/>'
+            '<xsd:element name="Response_Results" type="wd:Response_Results_Type" minOccurs="0"/>'
+            '<xsd:element name="Response_Data" type="wd:{1}_Response_Data_Type" minOccurs="0"/>'
+            "</xsd:sequence></xsd:complexType></xsd:element>".format(op, obj)
+        )
+        messages.append(
+            '<wsdl:message name="{0}_Input"><wsdl:part name="body" element="wd:{0}_Request"/>'
+            "</wsdl:message>"
+            '<wsdl:message name="{0}_Output"><wsdl:part name="body" element="wd:{0}_Response"/>'
+            "</wsdl:message>".format(op)
+        )
+        port_ops.append(
+            '<wsdl:operation name="{0}"><wsdl:input message="wd-wsdl:{0}_Input"/>'
+            '<wsdl:output message="wd-wsdl:{0}_Output"/></wsdl:operation>'.format(op)
+        )
+        binding_ops.append(
+            '<wsdl:operation name="{0}"><soapbind:operation style="document"/>'
+            '<wsdl:input><soapbind:body use="literal"/></wsdl:input>'
+            '<wsdl:output><soapbind:body use="literal"/></wsdl:output>'
+            "</wsdl:operation>".format(op)
+        )
+
+    wsdl = (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<wsdl:definitions xmlns:wsdl="http://schemas.xmlsoap.org/wsdl/" '
+        'xmlns:wd-wsdl="urn:com.workday/bsvc/Synthetic" xmlns:wd="{ns}" '
+        'xmlns:xsd="http://www.w3.org/2001/XMLSchema" '
+        'xmlns:soapbind="http://schemas.xmlsoap.org/wsdl/soap/" '
+        'name="Synthetic" targetNamespace="urn:com.workday/bsvc/Synthetic">'
+        "<wsdl:types>"
+        '<xsd:schema elementFormDefault="qualified" attributeFormDefault="qualified" '
+        'targetNamespace="{ns}">{types}{elements}</xsd:schema>'
+        "</wsdl:types>"
+        "{messages}"
+        '<wsdl:portType name="SyntheticPort">{port_ops}</wsdl:portType>'
+        '<wsdl:binding name="SyntheticBinding" type="wd-wsdl:SyntheticPort">'
+        '<soapbind:binding style="document" transport="http://schemas.xmlsoap.org/soap/http"/>'
+        "{binding_ops}</wsdl:binding>"
+        '<wsdl:service name="SyntheticService">'
+        '<wsdl:port name="Synthetic" binding="wd-wsdl:SyntheticBinding">'
+        '<soapbind:address location="{location}"/></wsdl:port></wsdl:service>'
+        "</wsdl:definitions>"
+    ).format(
+        ns=NAMESPACE,
+        types="".join(types),
+        elements="".join(elements),
+        messages="".join(messages),
+        port_ops="".join(port_ops),
+        binding_ops="".join(binding_ops),
+        location=location,
+    )
+    return wsdl.encode("utf-8")
+
+
+def _detail(record, depth):
+    detail = ""
+    for level in range(depth - 1, 0, -1):
+        detail = "<wd:Detail>{0}{1}</wd:Detail>".format(
+            "".join(
+                "<wd:Field_{0}>Level {1} value {0} of record {2}</wd:Field_{0}>".format(
+                    f, level, record
+                )
+                for f in range(DETAIL_FIELDS)
+            ),
+            detail,
+        )
+    return detail
+
+
+def generate_page(operation, page, page_size, total_records, fields=20, depth=1):
+    """
+    Generate the reply to a Get_* operation of the synthetic WSDL
+
+    :rtype: ``bytes``
+    """
+    obj = operation[len("Get_") : -1]
+    total_pages = max(1, -(-total_records // page_size))
+    start = (page - 1) * page_size
+    end = min(start + page_size, total_records)
+    records = []
+    for i in range(start, end):
+        reference = "<wd:Field_0>{0}-{1}</wd:Field_0><wd:Field_1>{0}_ID</wd:Field_1>".format(obj, i)
+        data = "".join(
+            "<wd:Field_{0}>Value {0} of record {1}</wd:Field_{0}>".format(f, i)
+            for f in range(fields)
+        )
+        records.append(
+            "<wd:{obj}><wd:{obj}_Reference>{ref}</wd:{obj}_Reference>"
+            "<wd:{obj}_Data>{data}<wd:Reference>{ref}</wd:Reference>"
+            "<wd:Reference>{ref}</wd:Reference>{detail}</wd:{obj}_Data></wd:{obj}>".format(
+                obj=obj, ref=reference, data=data, detail=_detail(i, depth)
+            )
+        )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<env:Envelope xmlns:env="{env}"><env:Body>'
+        '<wd:{op}_Response xmlns:wd="{ns}">'
+        "<wd:Response_Results><wd:Total_Results>{total}</wd:Total_Results>"
+        "<wd:Total_Pages>{pages}</wd:Total_Pages><wd:Page_Results>{count}</wd:Page_Results>"
+        "<wd:Page>{page}</wd:Page></wd:Response_Results>"
+        "<wd:Response_Data>{records}</wd:Response_Data>"
+        "</wd:{op}_Response></env:Body></env:Envelope>"
+    ).format(
+        env=SOAP_ENV,
+        ns=NAMESPACE,
+        op=operation,
+        total=total_records,
+        pages=total_pages,
+        count=end - start,
+        page=page,
+        records="".join(records),
+    ).encode("utf-8")
+
+
+class _ThreadingServer(socketserver.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class SyntheticServer(object):
+    """
+    A local HTTP server for the synthetic WSDL, run on a background thread.
+    Supports conditional GET with an ETag, ``latency`` seconds are added to every request.
+    Every Get_* operation returns ``records`` results, ``page_size`` per page, nested
+    ``depth`` levels deep.
+
+    With ``compress`` replies are gzip compressed for clients that accept it, gzip request
+    bodies are always accepted. ``bandwidth`` (bytes per second) simulates a slow link.
+    ``bytes_received`` and ``bytes_sent`` count the SOAP bodies on the wire.
+    """
+
+    def __init__(
+        self,
+        operations=50,
+        fields=20,
+        latency=0,
+        records=1000,
+        page_size=100,
+        compress=False,
+        bandwidth=None,
+        depth=1,
+    ):
+        self.latency = latency
+        self.depth = depth
+        self.fields = fields
+        self.records = records
+        self.page_size = page_size
+        self.compress = compress
+        self.bandwidth = bandwidth
+        self._pages = {}
+        self._compressed = {}
+        self.requests = 0
+        self.downloads = 0
+        self.bytes_received = 0
+        self.bytes_sent = 0
+        server = self
+
+        class Handler(BaseHTTPServer.BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                server.requests += 1
+                time.sleep(server.latency)
+                if self.headers.get("If-None-Match") == server.etag:
+                    self.send_response(304)
+                    self.end_headers()
+                    return
+                server.downloads += 1
+                self.send_response(200)
+                self.send_header("Content-Type", "text/xml")
+                self.send_header("Content-Length", str(len(server.wsdl)))
+                self.send_header("ETag", server.etag)
+                self.end_headers()
+                self.wfile.write(server.wsdl)
+
+            def do_POST(self):
+                server.requests += 1
+                time.sleep(server.latency)
+                length = int(self.headers.get("Content-Length"))
+                request = self.rfile.read(length)
+                server.bytes_received += length
+                server.transfer(length)
+                if self.headers.get("Content-Encoding") == "gzip":
+                    request = gzip.GzipFile(fileobj=io.BytesIO(request)).read()
+                body = server.reply(request)
+                self.send_response(200)
+                self.send_header("Content-Type", "text/xml; charset=utf-8")
+                if server.compress and "gzip" in self.headers.get("Accept-Encoding", ""):
+                    body = server.gzip(body)
+                    self.send_header("Content-Encoding", "gzip")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                server.bytes_sent += len(body)
+                server.transfer(len(body))
+                self.wfile.write(body)
+
+        self._httpd = _ThreadingServer(("127.0.0.1", 0), Handler)
+        self.url = "http://127.0.0.1:{0}/Synthetic".format(self._httpd.server_address[1])
+        self.wsdl = generate_wsdl(operations, fields, location=self.url, depth=depth)
+        self.etag = '"synthetic-{0}-{1}-{2}"'.format(operations, fields, depth)
+        self._thread = threading.Thread(target=self._httpd.serve_forever)
+        self._thread.daemon = True
+
+    def transfer(self, size):
+        """
+        Wait as long as sending ``size`` bytes takes at the simulated bandwidth
+        """
+        if self.bandwidth:
+            time.sleep(size / float(self.bandwidth))
+
+    def gzip(self, body):
+        """
+        Compress a reply, compressed replies are cached like the pages
+        """
+        if body not in self._compressed:
+            buf = io.BytesIO()
+            with gzip.GzipFile(fileobj=buf, mode="wb", compresslevel=6) as fo:
+                fo.write(body)
+            self._compressed[body] = buf.getvalue()
+        return self._compressed[body]
+
+    def reply(self, request):
+        """
+        The reply to a SOAP request
+        """
+        body = etree.fromstring(request).find("{%s}Body" % SOAP_ENV)
+        operation = etree.QName(body[0]).localname[: -len("_Request")]
+        page = body[0].findtext("{%s}Response_Filter/{%s}Page" % (NAMESPACE, NAMESPACE))
+        key = (operation, int(float(page or 1)))
+        if key not in self._pages:
+            self._pages[key] = generate_page(
+                operation, key[1], self.page_size, self.records, self.fields, self.depth
+            )
+        return self._pages[key]
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._httpd.shutdown()
+        self._httpd.server_close()
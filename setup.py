@@ -17,7 +17,8 @@ with open('HISTORY.rst') as history_file:
 requirements = [
     'zeep>=3.0.0,<4.0.0',
     'requests',
-    'six'
+    'six',
+    'futures; python_version < "3"'
 ]
 
 test_requirements = [
@@ -37,6 +38,10 @@ setup(
     package_dir={"": "src"},
     include_package_data=True,
     install_requires=requirements,
+    extras_require={
+        'async': ['aiohttp>=3.3'],
+        'parquet': ['pyarrow>=7'],
+    },
     license="Apache License (2.0)",
     zip_safe=False,
     keywords='workday',
@@ -14,9 +14,67 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+"""
+Python client for Workday tenants.
 
-from .client import WorkdayClient  # NOQA
+Importing the package is cheap: :class:`workday.WorkdayClient` and the submodules, with
+requests, zeep and lxml behind them, are imported when they are first used.
+"""
+
+import importlib
+import sys
 
 __author__ = "Anthony Shaw"
 __email__ = "anthonyshaw@apache.org"
 __version__ = "0.4.0"
+
+__all__ = ["WorkdayClient"]
+
+# Submodules available as attributes of the package, e.g. ``workday.auth``
+_SUBMODULES = frozenset(
+    (
+        "aio",
+        "auth",
+        "bulk",
+        "cache",
+        "checkpoint",
+        "client",
+        "concurrency",
+        "exceptions",
+        "export",
+        "lazy",
+        "metrics",
+        "pool",
+        "profiling",
+        "raw",
+        "records",
+        "retry",
+        "serialization",
+        "snapshot",
+        "soap",
+        "streaming",
+        "sync",
+        "throttle",
+        "timing",
+        "transport",
+    )
+)
+
+if sys.version_info >= (3, 7):
+
+    def __getattr__(name):
+        if name == "WorkdayClient":
+            from .client import WorkdayClient
+
+            return WorkdayClient
+        if name in _SUBMODULES:
+            return importlib.import_module("." + name, __name__)
+        raise AttributeError("module {0!r} has no attribute {1!r}".format(__name__, name))
+
+    def __dir__():
+        return sorted(set(globals()) | _SUBMODULES | set(__all__))
+
+
+else:
+    # No module __getattr__ (PEP 562), import everything up front
+    from .client import WorkdayClient  # NOQA
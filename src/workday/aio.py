@@ -0,0 +1,415 @@
+# -*- coding: utf-8 -*-
+# Licensed to Anthony Shaw (anthonyshaw@apache.org) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+asyncio support, requires Python 3.6+ and aiohttp (``pip install workday[async]``).
+"""
+
+import asyncio
+import collections
+import copy
+import functools
+import itertools
+import os
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+import zeep.exceptions
+from zeep.wsdl.utils import etree_to_string
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+from .auth import BaseAuthentication
+from .exceptions import WorkdaySoapApiError, WsdlNotProvidedError
+from .soap import BaseSoapApiClient, WorkdayResponse, _page_records
+
+
+async def async_bounded_map(func, items, max_concurrency, ordered=True):
+    """
+    Await ``func`` for each of ``items`` with at most ``max_concurrency`` calls
+    in flight and yield the results.
+
+    When ``ordered``, results that finish ahead of a slower earlier call are held back,
+    up to ``max_concurrency`` of them, while the other calls carry on with the following
+    items, like :func:`workday.concurrency.bounded_map`.
+
+    :param func: Coroutine function to call with each item
+    :type  func: ``callable``
+
+    :param items: The items to process
+    :type  items: ``iterable``
+
+    :param max_concurrency: Maximum number of concurrent calls
+    :type  max_concurrency: ``int``
+
+    :param ordered: Yield results in the order of ``items``, otherwise as they complete
+    :type  ordered: ``bool``
+    """
+    if max_concurrency < 1:
+        raise ValueError("max_concurrency must be at least 1")
+    items = iter(items)
+    positions = itertools.count()
+    # Calls whose results have not been yielded yet, by position
+    pending = collections.OrderedDict()
+    # In flight plus finished and waiting for their turn
+    limit = max_concurrency * 2 if ordered else max_concurrency
+
+    def running():
+        return [t for t in pending.values() if not t.done()]
+
+    def fill():
+        while len(pending) < limit and len(running()) < max_concurrency:
+            for item in items:
+                pending[next(positions)] = asyncio.ensure_future(func(item))
+                break
+            else:
+                return
+
+    try:
+        fill()
+        while pending:
+            if ordered:
+                position, task = next(iter(pending.items()))
+                if not task.done():
+                    await asyncio.wait(running(), return_when=asyncio.FIRST_COMPLETED)
+                    fill()
+                    continue
+            else:
+                done, _ = await asyncio.wait(
+                    list(pending.values()), return_when=asyncio.FIRST_COMPLETED
+                )
+                position = next(p for p, t in pending.items() if t in done)
+            task = pending.pop(position)
+            fill()
+            yield task.result()
+    finally:
+        for task in pending.values():
+            task.cancel()
+
+
+class AsyncWorkdayResponse(WorkdayResponse):
+    """
+    Response from the Workday API made with :class:`AsyncWorkdayClient`.
+    The following pages are iterated with ``async for``.
+    """
+
+    def __iter__(self):
+        raise TypeError("Use 'async for' to iterate the pages of an AsyncWorkdayResponse")
+
+    def __aiter__(self):
+        return self.iter_pages()
+
+    async def fetch_page(self, page):
+        """
+        Fetch a single page of this result set
+
+        :param page: The page number to fetch
+        :type  page: ``int``
+
+        :rtype: :class:`AsyncWorkdayResponse`
+        """
+        called_kwargs = copy.deepcopy(self.called_kwargs)
+        called_kwargs.setdefault("Response_Filter", {})["Page"] = page
+        return await getattr(self.service, self.method)(
+            *self.called_args, **called_kwargs
+        )
+
+    async def iter_pages(self, max_concurrency=None, ordered=True):
+        """
+        Iterate the pages after this one, fetching up to ``max_concurrency`` at once
+
+        :param max_concurrency: (Optional) Number of pages to fetch at once, defaults to
+            the client setting or fetching one page at a time
+        :type  max_concurrency: ``int``
+
+        :param ordered: Yield pages in page order, otherwise as soon as they arrive
+        :type  ordered: ``bool``
+        """
+        max_concurrency = max_concurrency or self.max_workers or 1
+        pages = range(self.page + 1, self.total_pages + 1)
+        fetch_page = self._without_data().fetch_page
+        async for page in async_bounded_map(
+            fetch_page, pages, max_concurrency, ordered=ordered
+        ):
+            yield page
+
+    async def iter_records(self, record_name, max_concurrency=None):
+        """
+        Iterate the records in ``Response_Data`` of this page and all the following pages
+
+        :param record_name: The name of the record list in ``Response_Data``
+        :type  record_name: ``str``
+
+        :param max_concurrency: (Optional) Number of pages to fetch at once
+        :type  max_concurrency: ``int``
+        """
+        for record in _page_records(self.data, record_name):
+            yield record
+        async for page in self.iter_pages(max_concurrency=max_concurrency):
+            records = _page_records(page.data, record_name)
+            del page
+            for record in records:
+                yield record
+
+
+class AsyncSoapApiClient(object):
+    """
+    An API of :class:`AsyncWorkdayClient`, methods are coroutines returning
+    :class:`AsyncWorkdayResponse`
+    """
+
+    def __init__(self, name, workday_client, wsdl_url, snapshot_path=None):
+        """
+        :param name: Name of this API
+        :type  name: ``str``
+
+        :param workday_client: The client this API belongs to
+        :type  workday_client: :class:`AsyncWorkdayClient`
+
+        :param wsdl_url: Path to the WSDL
+        :type  wsdl_url: ``str``
+
+        :param snapshot_path: (Optional) Precompiled snapshot of the WSDL
+        :type  snapshot_path: ``str``
+        """
+        self.name = name
+        self.wsdl_url = wsdl_url
+        self.snapshot_path = snapshot_path
+        self._workday = workday_client
+        self._soap = None
+        self._load_lock = None
+
+    async def load(self):
+        """
+        Load the WSDL, this happens on a worker thread so the event loop is not blocked.
+        Called automatically by the first method call.
+
+        :rtype: :class:`workday.soap.BaseSoapApiClient`
+        """
+        if self._soap is not None:
+            return self._soap
+        if self._load_lock is None:
+            self._load_lock = asyncio.Lock()
+        async with self._load_lock:
+            if self._soap is None:
+                loop = asyncio.get_event_loop()
+                self._soap = await loop.run_in_executor(
+                    None,
+                    functools.partial(
+                        BaseSoapApiClient,
+                        name=self.name,
+                        session=self._workday._session,
+                        wsdl_url=self.wsdl_url,
+                        authentication=self._workday._authentication,
+                        wsdl_cache=self._workday._wsdl_cache,
+                        snapshot_path=self.snapshot_path,
+                    ),
+                )
+        return self._soap
+
+    def __getattr__(self, attr):
+        """
+        Wrapper around the SOAP client service methods.
+
+        :rtype: coroutine returning :class:`AsyncWorkdayResponse`
+        """
+        if attr.startswith("_"):
+            raise AttributeError(attr)
+
+        async def call_soap_method(*args, **kwargs):
+            soap = await self.load()
+            client = soap._client
+            service = client.service
+            binding = service._binding
+            envelope, http_headers = binding._create(
+                attr, args, kwargs, client=client, options=service._binding_options
+            )
+            response = await self._workday._post(
+                service._binding_options["address"],
+                etree_to_string(envelope),
+                http_headers,
+            )
+            try:
+                result = binding.process_reply(client, binding.get(attr), response)
+            except zeep.exceptions.Fault as fault:
+                raise WorkdaySoapApiError(fault)
+            return AsyncWorkdayResponse(
+                result,
+                service=self,
+                method=attr,
+                called_args=args,
+                called_kwargs=kwargs,
+                max_workers=self._workday._page_concurrency,
+            )
+
+        return call_soap_method
+
+
+class AsyncWorkdayClient(object):
+    """
+    asyncio entry point for the workday APIs.
+
+    WSDLs are still downloaded with :mod:`requests` on a worker thread, SOAP calls are
+    made over a shared :class:`aiohttp.ClientSession` so connections are reused.
+    """
+
+    def __init__(
+        self,
+        wsdls,
+        authentication,
+        proxy_url=None,
+        disable_ssl_verification=False,
+        wsdl_cache=None,
+        snapshot_dir=None,
+        max_concurrency=100,
+        page_concurrency=None,
+        timeout=None,
+    ):
+        """
+        Instantiate an asyncio Workday API client
+
+        :param wsdls: Dictionary of WSDL endpoints to use
+        :type  wsdls: ``dict``
+
+        :param authentication: Authentication configuration
+        :type  authentication: :class:`workday.auth.BaseAuthentication`
+
+        :param proxy_url: Optional URL to proxy requests through
+        :type  proxy_url: ``str``
+
+        :param wsdl_cache: (Optional) Persistent cache for the WSDL and XSD documents
+        :type  wsdl_cache: :class:`workday.cache.WsdlCache`
+
+        :param snapshot_dir: (Optional) Directory of precompiled WSDL snapshots, one per API
+        :type  snapshot_dir: ``str``
+
+        :param max_concurrency: Maximum number of SOAP requests in flight across all APIs
+        :type  max_concurrency: ``int``
+
+        :param page_concurrency: (Optional) Number of pages to fetch concurrently
+            when iterating paged responses
+        :type  page_concurrency: ``int``
+
+        :param timeout: (Optional) Total timeout for each SOAP request in seconds
+        :type  timeout: ``float``
+        """
+        if aiohttp is None:
+            raise ImportError(
+                "aiohttp is required for AsyncWorkdayClient, install workday[async]"
+            )
+
+        if not isinstance(authentication, BaseAuthentication):
+            raise ValueError(
+                "authentication argument must be of type BaseAuthentication"
+            )
+
+        if not isinstance(wsdls, dict):
+            raise TypeError("WSDLs argument must be a dictionary")
+
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+
+        self.proxy_url = proxy_url
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self._verify_ssl = not disable_ssl_verification
+
+        # Only used to download the WSDLs
+        self._session = requests.Session()
+        if proxy_url:
+            self._session.proxies = {"https": proxy_url}
+        if disable_ssl_verification:
+            self._session.verify = False
+
+        self._http = None
+        self._semaphore = None
+        self._authentication = authentication
+        self._wsdl_cache = wsdl_cache
+        self._snapshot_dir = snapshot_dir
+        self._page_concurrency = page_concurrency
+        self._apis = {}
+
+        for name, value in wsdls.items():
+            if not isinstance(value, str):
+                raise ValueError(
+                    "WSDL value must be a string with the URL of the Workday Web Service."
+                )
+            self._apis[name] = value
+
+    def __getattr__(self, api):
+        if api.startswith("_") or api not in self._apis:
+            raise WsdlNotProvidedError("API '{0}' was not loaded".format(api))
+        if isinstance(self._apis[api], str):
+            snapshot_path = None
+            if self._snapshot_dir:
+                snapshot_path = os.path.join(self._snapshot_dir, api + ".snapshot")
+            self._apis[api] = AsyncSoapApiClient(
+                name=api,
+                workday_client=self,
+                wsdl_url=self._apis[api] + "?wsdl",
+                snapshot_path=snapshot_path,
+            )
+        return self._apis[api]
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def close(self):
+        """
+        Close the pooled connections
+        """
+        if self._http is not None:
+            await self._http.close()
+            self._http = None
+        self._session.close()
+
+    def _get_http(self):
+        if self._http is None:
+            connector = aiohttp.TCPConnector(limit=self.max_concurrency)
+            timeout = aiohttp.ClientTimeout(total=self.timeout)
+            self._http = aiohttp.ClientSession(connector=connector, timeout=timeout)
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._http
+
+    async def _post(self, address, message, headers):
+        """
+        POST a SOAP envelope and return the reply as a :class:`requests.Response`
+        for zeep to process
+        """
+        http = self._get_http()
+        async with self._semaphore:
+            async with http.post(
+                address,
+                data=message,
+                headers=headers,
+                proxy=self.proxy_url,
+                ssl=None if self._verify_ssl else False,
+            ) as reply:
+                content = await reply.read()
+                response = requests.Response()
+                response._content = content
+                response.status_code = reply.status
+                response.headers = CaseInsensitiveDict(reply.headers)
+                response.encoding = reply.charset
+                response.url = address
+        return response
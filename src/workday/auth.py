@@ -14,8 +14,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from zeep.wsse.signature import Signature
-from zeep.wsse.username import UsernameToken
+# zeep.wsse is imported when a WS-Security class is created, the signature support
+# loads xmlsec which is slow to import
 
 
 class BaseAuthentication(object):
@@ -47,6 +47,8 @@ class WsSecurityCredentialAuthentication(BaseAuthentication):
         :param password: Password for the integration user
         :type  password: ``str``
         """
+        from zeep.wsse.username import UsernameToken
+
         self._kwargs = {"wsse": UsernameToken(username, password)}
 
 
@@ -66,6 +68,8 @@ class WsSecurityCertificateAuthentication(BaseAuthentication):
         :param optional_password: (Optional) password for the x509 private cert
         :type  optional_password: ``str``
         """
+        from zeep.wsse.signature import Signature
+
         self._kwargs = {
             "wsse": Signature(
                 private_certificate_path, public_certificate_path, optional_password
@@ -100,6 +104,9 @@ class WsSecurityCertificateCredentialAuthentication(BaseAuthentication):
         :param optional_password: (Optional) password for the x509 private cert
         :type  optional_password: ``str``
         """
+        from zeep.wsse.signature import Signature
+        from zeep.wsse.username import UsernameToken
+
         self._kwargs = {
             "wsse": [
                 UsernameToken(username, password),
@@ -0,0 +1,263 @@
+# -*- coding: utf-8 -*-
+# Licensed to Anthony Shaw (anthonyshaw@apache.org) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Bulk submission of ``Put_*`` (and other write) operations.
+
+A :class:`BulkSubmitter` sends each payload of an iterable as its own request, several at a
+time, and retries requests that fail in transit. A payload that Workday rejects doesn't stop
+the others: every payload gets a :class:`BulkResult`, yielded in input order, and the
+failures are collected with their fault details in a :class:`BulkSummary`.
+"""
+
+import collections
+import logging
+
+import zeep.exceptions
+
+from .concurrency import bounded_map
+from .exceptions import WorkdaySoapApiError
+from .retry import TRANSIENT_ERRORS, call_with_retries
+
+logger = logging.getLogger(__name__)
+
+
+def fault_details(error):
+    """
+    The details of a SOAP fault raised by a web method
+
+    :param error: The error raised
+    :type  error: :class:`workday.exceptions.WorkdaySoapApiError`
+
+    :return: ``message``, ``code`` and the ``validation_errors`` reported by Workday,
+        each with its ``message``, ``detail_message`` and ``xpath``
+    :rtype: ``dict``
+    """
+    fault = getattr(error, "_fault", None)
+    details = {
+        "message": getattr(error, "message", str(error)),
+        "code": getattr(fault, "code", None),
+        "validation_errors": [],
+    }
+    detail = getattr(fault, "detail", None)
+    if detail is not None:
+        for validation_error in detail.iter("{*}Validation_Error"):
+            details["validation_errors"].append(
+                {
+                    "message": validation_error.findtext("{*}Message"),
+                    "detail_message": validation_error.findtext("{*}Detail_Message"),
+                    "xpath": validation_error.findtext("{*}Xpath"),
+                }
+            )
+    return details
+
+
+class BulkResult(object):
+    """
+    The outcome of one payload
+    """
+
+    __slots__ = ("index", "payload", "response", "error", "attempts")
+
+    def __init__(self, index, payload, response=None, error=None, attempts=1):
+        #: Position of the payload in the input
+        self.index = index
+        self.payload = payload
+        #: The :class:`workday.soap.WorkdayResponse`, when the call succeeded
+        self.response = response
+        #: The exception raised by the last attempt, when the call failed
+        self.error = error
+        #: Number of requests sent
+        self.attempts = attempts
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    @property
+    def fault(self):
+        """
+        The fault details when Workday rejected the payload, see :func:`fault_details`
+
+        :rtype: ``dict`` or ``None``
+        """
+        if isinstance(self.error, WorkdaySoapApiError):
+            return fault_details(self.error)
+        return None
+
+    def __repr__(self):
+        if self.ok:
+            return "<BulkResult {0} ok>".format(self.index)
+        return "<BulkResult {0} failed: {1}>".format(
+            self.index, getattr(self.error, "message", self.error)
+        )
+
+
+class BulkSummary(object):
+    """
+    Counts and failures of a bulk submission
+    """
+
+    def __init__(self):
+        #: Payloads processed
+        self.total = 0
+        #: Payloads accepted
+        self.succeeded = 0
+        #: Payloads that were retried at least once
+        self.retried = 0
+        #: The :class:`BulkResult` of every failed payload, in input order
+        self.failures = []
+
+    @property
+    def failed(self):
+        return len(self.failures)
+
+    @property
+    def failures_by_message(self):
+        """
+        Number of failures for each fault or error message, most frequent first
+
+        :rtype: ``list`` of ``(message, count)``
+        """
+        counts = collections.Counter(
+            getattr(result.error, "message", str(result.error))
+            for result in self.failures
+        )
+        return counts.most_common()
+
+    def _add(self, result):
+        self.total += 1
+        if result.attempts > 1:
+            self.retried += 1
+        if result.ok:
+            self.succeeded += 1
+        else:
+            self.failures.append(result)
+
+    def __repr__(self):
+        return "<BulkSummary total={0} succeeded={1} failed={2} retried={3}>".format(
+            self.total, self.succeeded, self.failed, self.retried
+        )
+
+
+class BulkSubmitter(object):
+    """
+    Calls a web method once per payload with bounded concurrency.
+    Create it with :meth:`workday.soap.SoapMethod.bulk`.
+
+    Each payload is a ``dict`` of the keyword arguments of the web method.
+    Requests that fail in transit are sent again, so use operations that can
+    safely be repeated, e.g. ``Put_*`` operations that identify the record
+    they update by its ID.
+    """
+
+    def __init__(
+        self,
+        method,
+        max_workers=4,
+        max_retries=3,
+        backoff=1.0,
+        max_backoff=30.0,
+        retry_faults=False,
+    ):
+        """
+        :param method: The web method to call
+        :type  method: :class:`workday.soap.SoapMethod`
+
+        :param max_workers: Number of requests in flight at once
+        :type  max_workers: ``int``
+
+        :param max_retries: Times to resend a request before the payload counts as failed
+        :type  max_retries: ``int``
+
+        :param backoff: Seconds to wait before the first retry, doubled for each further retry
+        :type  backoff: ``float``
+
+        :param max_backoff: Longest wait between retries in seconds
+        :type  max_backoff: ``float``
+
+        :param retry_faults: Also retry payloads Workday rejected with a SOAP fault,
+            by default only errors in transit are retried since validation faults
+            fail again
+        :type  retry_faults: ``bool``
+        """
+        self.method = method
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.retry_errors = TRANSIENT_ERRORS + (
+            (WorkdaySoapApiError, zeep.exceptions.Fault) if retry_faults else ()
+        )
+        #: The :class:`BulkSummary` of the last :meth:`submit`
+        self.summary = BulkSummary()
+
+    def _call(self, item):
+        index, payload = item
+        attempts = [1]
+
+        def retrying(exc, delay):
+            logger.warning(
+                "Item %d of %s failed (%s), retrying in %.1fs",
+                index,
+                self.method.name,
+                getattr(exc, "message", exc),
+                delay,
+            )
+            attempts[0] += 1
+
+        try:
+            response = call_with_retries(
+                lambda: self.method(**payload),
+                lambda exc: isinstance(exc, self.retry_errors),
+                max_retries=self.max_retries,
+                backoff=self.backoff,
+                max_backoff=self.max_backoff,
+                on_retry=retrying,
+            )
+        except Exception as exc:
+            # Rejected by Workday, failed in transit on every attempt, or a bad payload,
+            # e.g. a zeep ValidationError or a TypeError, only this item fails
+            return BulkResult(index, payload, error=exc, attempts=attempts[0])
+        return BulkResult(index, payload, response=response, attempts=attempts[0])
+
+    def submit(self, payloads):
+        """
+        Call the web method for each payload and iterate the results in input order.
+        Payloads are read from ``payloads`` as slots free up, so a generator of
+        any length can be submitted.
+
+        :param payloads: The keyword arguments of each call
+        :type  payloads: ``iterable`` of ``dict``
+
+        :rtype: ``generator`` of :class:`BulkResult`
+        """
+        self.summary = summary = BulkSummary()
+        for result in bounded_map(
+            self._call, enumerate(payloads), self.max_workers, ordered=True
+        ):
+            summary._add(result)
+            yield result
+
+    def run(self, payloads):
+        """
+        Submit every payload and return the summary, discarding the responses
+
+        :rtype: :class:`BulkSummary`
+        """
+        for result in self.submit(payloads):
+            result.response = None
+        return self.summary
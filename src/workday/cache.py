@@ -0,0 +1,483 @@
+# -*- coding: utf-8 -*-
+# Licensed to Anthony Shaw (anthonyshaw@apache.org) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import collections
+import hashlib
+import io
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+
+import six
+
+import zeep.cache
+import zeep.helpers
+
+logger = logging.getLogger(__name__)
+
+_replace = getattr(os, "replace", os.rename)
+
+
+def _default_cache_path():
+    import appdirs
+
+    return appdirs.user_cache_dir("workday", False)
+
+
+def _atomic_write(path, data):
+    """
+    Write ``data`` to ``path`` so that concurrent readers never see a
+    partially written file.
+    """
+    directory = os.path.dirname(path)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as fo:
+            fo.write(data)
+        _replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class WsdlCacheEntry(object):
+    """
+    A single cached WSDL or XSD document
+    """
+
+    def __init__(self, content, created, etag=None, last_modified=None):
+        """
+        :param content: The raw document
+        :type  content: ``bytes``
+
+        :param created: Epoch timestamp the document was last (re)validated
+        :type  created: ``float``
+
+        :param etag: (Optional) ETag header the server sent with the document
+        :type  etag: ``str``
+
+        :param last_modified: (Optional) Last-Modified header the server sent
+        :type  last_modified: ``str``
+        """
+        self.content = content
+        self.created = created
+        self.etag = etag
+        self.last_modified = last_modified
+
+    def is_expired(self, timeout):
+        if timeout is None:
+            return False
+        return time.time() > self.created + timeout
+
+    @property
+    def validators(self):
+        """
+        HTTP headers for a conditional GET of this entry
+        """
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class WsdlCache(zeep.cache.Base):
+    """
+    Persistent on-disk cache of WSDL and XSD documents, shared between processes.
+
+    Entries are keyed by tenant, document URL and API version. Expired entries
+    are kept on disk so that :class:`workday.transport.WorkdayTransport` can
+    revalidate them against the server's ETag/Last-Modified headers instead of
+    downloading the document again.
+    """
+
+    def __init__(self, path=None, tenant=None, version=None, timeout=86400, max_size=None):
+        """
+        :param path: (Optional) Directory to store the cache in, defaults to the user cache directory
+        :type  path: ``str``
+
+        :param tenant: (Optional) Workday tenant name, used to partition the cache
+        :type  tenant: ``str``
+
+        :param version: (Optional) Workday API version, e.g. ``v30.1``
+        :type  version: ``str``
+
+        :param timeout: Seconds before an entry must be revalidated, ``None`` to never expire
+        :type  timeout: ``int``
+
+        :param max_size: (Optional) Maximum size of the cache in bytes, least recently
+            used entries are evicted first
+        :type  max_size: ``int``
+        """
+        self.path = path or _default_cache_path()
+        self.tenant = tenant
+        self.version = version
+        self.timeout = timeout
+        self.max_size = max_size
+        self._lock = threading.RLock()
+        if not os.path.isdir(self.path):
+            os.makedirs(self.path)
+
+    def key(self, url):
+        """
+        Cache key for a document URL
+        """
+        raw = u"{0}|{1}|{2}".format(self.tenant or "", self.version or "", url)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _paths(self, url):
+        key = self.key(url)
+        return (
+            os.path.join(self.path, key + ".xml"),
+            os.path.join(self.path, key + ".json"),
+        )
+
+    def get_entry(self, url):
+        """
+        Get the cached entry for ``url``, expired or not
+
+        :rtype: :class:`WsdlCacheEntry` or ``None``
+        """
+        content_path, meta_path = self._paths(url)
+        try:
+            with io.open(meta_path, "r", encoding="utf-8") as fo:
+                meta = json.load(fo)
+            with io.open(content_path, "rb") as fo:
+                content = fo.read()
+        except (IOError, OSError, ValueError):
+            return None
+        # Track recency of use for LRU eviction
+        try:
+            os.utime(content_path, None)
+        except OSError:
+            pass
+        return WsdlCacheEntry(
+            content,
+            created=meta["created"],
+            etag=meta.get("etag"),
+            last_modified=meta.get("last_modified"),
+        )
+
+    def get(self, url):
+        entry = self.get_entry(url)
+        if entry is None or entry.is_expired(self.timeout):
+            logger.debug("Cache MISS for %s", url)
+            return None
+        logger.debug("Cache HIT for %s", url)
+        return entry.content
+
+    def add(self, url, content, etag=None, last_modified=None):
+        if not isinstance(content, bytes):
+            raise TypeError(
+                "a bytes-like object is required, not {0}".format(type(content).__name__)
+            )
+        logger.debug("Caching contents of %s", url)
+        content_path, meta_path = self._paths(url)
+        meta = {
+            "url": url,
+            "tenant": self.tenant,
+            "version": self.version,
+            "created": time.time(),
+            "etag": etag,
+            "last_modified": last_modified,
+        }
+        with self._lock:
+            _atomic_write(content_path, content)
+            _atomic_write(meta_path, json.dumps(meta).encode("utf-8"))
+            self._evict()
+
+    def touch(self, url):
+        """
+        Mark the entry for ``url`` as fresh, e.g. after the server replied 304 Not Modified
+        """
+        entry = self.get_entry(url)
+        if entry is not None:
+            self.add(url, entry.content, etag=entry.etag, last_modified=entry.last_modified)
+
+    def clear(self):
+        """
+        Remove every entry from the cache
+        """
+        with self._lock:
+            for name in os.listdir(self.path):
+                if name.endswith((".xml", ".json")):
+                    os.remove(os.path.join(self.path, name))
+
+    @property
+    def size(self):
+        """
+        Total size of the cached documents in bytes
+        """
+        return sum(size for _, size, _ in self._content_files())
+
+    def _content_files(self):
+        files = []
+        for name in os.listdir(self.path):
+            if not name.endswith(".xml"):
+                continue
+            path = os.path.join(self.path, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            files.append((path, stat.st_size, stat.st_mtime))
+        return files
+
+    def _evict(self):
+        if self.max_size is None:
+            return
+        files = sorted(self._content_files(), key=lambda f: f[2])
+        total = sum(size for _, size, _ in files)
+        while files and total > self.max_size:
+            path, size, _ = files.pop(0)
+            logger.debug("Evicting %s from the WSDL cache", path)
+            for victim in (path, path[: -len(".xml")] + ".json"):
+                try:
+                    os.remove(victim)
+                except OSError:
+                    pass
+            total -= size
+
+
+def _normalize(value):
+    # Dates, decimals and the like, the remaining values json can't encode
+    return six.text_type(value)
+
+
+class ResponseCacheStats(object):
+    """
+    Hit and miss counters of a :class:`ResponseCache`
+    """
+
+    def __init__(self):
+        #: Calls answered from the cache
+        self.hits = 0
+        #: Calls that went to Workday
+        self.misses = 0
+        #: Entries dropped to stay within ``max_entries``
+        self.evictions = 0
+
+    @property
+    def hit_rate(self):
+        calls = self.hits + self.misses
+        return float(self.hits) / calls if calls else 0.0
+
+    def __repr__(self):
+        return "<ResponseCacheStats hits={0} misses={1} evictions={2}>".format(
+            self.hits, self.misses, self.evictions
+        )
+
+
+class ResponseCache(object):
+    """
+    Base class of the caches for replies of read operations, see :class:`MemoryResponseCache`
+    and :class:`DiskResponseCache`.
+
+    Only ``Get_*`` operations are cached. The raw reply is stored and parsed again
+    on every hit, so callers never share response objects.
+    """
+
+    def __init__(self, ttl=300, method_ttls=None, max_entries=1024):
+        """
+        :param ttl: Seconds a reply stays fresh
+        :type  ttl: ``int``
+
+        :param method_ttls: (Optional) TTLs for specific web methods, e.g.
+            ``{'Get_Languages': 86400}``. A TTL of 0 disables caching for that method
+        :type  method_ttls: ``dict``
+
+        :param max_entries: Maximum number of replies to keep, least recently
+            used replies are evicted first
+        :type  max_entries: ``int``
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.ttl = ttl
+        self.method_ttls = dict(method_ttls or {})
+        self.max_entries = max_entries
+        self.stats = ResponseCacheStats()
+        self._lock = threading.RLock()
+
+    def ttl_for(self, method):
+        """
+        The TTL of ``method`` in seconds
+        """
+        return self.method_ttls.get(method, self.ttl)
+
+    def cacheable(self, method):
+        """
+        Whether replies to ``method`` are cached, only ``Get_*`` operations ever are
+        """
+        return method.startswith("Get_") and bool(self.ttl_for(method))
+
+    def key(self, api, address, method, args, kwargs):
+        """
+        Cache key for a call, arguments are compared by value
+
+        :rtype: ``str``
+        """
+        call = [
+            api,
+            address,
+            method,
+            zeep.helpers.serialize_object(list(args)),
+            zeep.helpers.serialize_object(dict(kwargs)),
+        ]
+        raw = json.dumps(call, sort_keys=True, default=_normalize)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key, method):
+        """
+        Get the fresh reply stored under ``key``, counting a hit or a miss
+
+        :rtype: ``bytes`` or ``None``
+        """
+        content = self._get(key, self.ttl_for(method))
+        with self._lock:
+            if content is None:
+                self.stats.misses += 1
+            else:
+                self.stats.hits += 1
+        return content
+
+    def add(self, key, content):
+        """
+        Store a reply under ``key``
+        """
+        raise NotImplementedError()
+
+    def clear(self):
+        """
+        Remove every entry from the cache
+        """
+        raise NotImplementedError()
+
+    def _get(self, key, ttl):
+        raise NotImplementedError()
+
+
+class MemoryResponseCache(ResponseCache):
+    """
+    Response cache held in memory by this process
+    """
+
+    def __init__(self, ttl=300, method_ttls=None, max_entries=1024):
+        super(MemoryResponseCache, self).__init__(
+            ttl=ttl, method_ttls=method_ttls, max_entries=max_entries
+        )
+        self._entries = collections.OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _get(self, key, ttl):
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                return None
+            created, content = entry
+            if time.time() > created + ttl:
+                return None
+            # Most recently used entries are at the end
+            self._entries[key] = entry
+            return content
+
+    def add(self, key, content):
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (time.time(), content)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class DiskResponseCache(ResponseCache):
+    """
+    Response cache stored in a directory, shared between processes
+    """
+
+    def __init__(self, path=None, ttl=300, method_ttls=None, max_entries=1024):
+        """
+        :param path: (Optional) Directory to store the cache in, defaults to
+            ``responses`` in the user cache directory
+        :type  path: ``str``
+        """
+        super(DiskResponseCache, self).__init__(
+            ttl=ttl, method_ttls=method_ttls, max_entries=max_entries
+        )
+        self.path = path or os.path.join(_default_cache_path(), "responses")
+        if not os.path.isdir(self.path):
+            os.makedirs(self.path)
+
+    def __len__(self):
+        return len([name for name in os.listdir(self.path) if name.endswith(".xml")])
+
+    def _get(self, key, ttl):
+        path = os.path.join(self.path, key + ".xml")
+        try:
+            with io.open(path, "rb") as fo:
+                created = float(fo.readline())
+                content = fo.read()
+        except (IOError, OSError, ValueError):
+            return None
+        if time.time() > created + ttl:
+            return None
+        # Track recency of use for LRU eviction
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+        return content
+
+    def add(self, key, content):
+        with self._lock:
+            # The first line holds the time the reply was stored
+            header = "{0!r}\n".format(time.time()).encode("ascii")
+            _atomic_write(os.path.join(self.path, key + ".xml"), header + content)
+            self._evict()
+
+    def clear(self):
+        with self._lock:
+            for name in os.listdir(self.path):
+                if name.endswith(".xml"):
+                    os.remove(os.path.join(self.path, name))
+
+    def _evict(self):
+        files = []
+        for name in os.listdir(self.path):
+            if not name.endswith(".xml"):
+                continue
+            path = os.path.join(self.path, name)
+            try:
+                files.append((os.stat(path).st_mtime, path))
+            except OSError:
+                continue
+        files.sort()
+        for _, path in files[: max(0, len(files) - self.max_entries)]:
+            try:
+                os.remove(path)
+                self.stats.evictions += 1
+            except OSError:
+                pass
@@ -0,0 +1,299 @@
+# -*- coding: utf-8 -*-
+# Licensed to Anthony Shaw (anthonyshaw@apache.org) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Resumable paging for long exports.
+
+After each page has been processed, a :class:`CheckpointedCall` records the call, the
+``As_Of`` dates the first page was answered for and the last completed page in a
+:class:`CheckpointStore`. If the run dies, :meth:`CheckpointedCall.resume` (or calling
+:meth:`CheckpointedCall.pages` again with the same arguments) continues with the next page
+against the same snapshot of the data. Pages that fail are retried with backoff first.
+"""
+
+import copy
+import hashlib
+import io
+import json
+import logging
+import os
+import time
+
+import zeep.exceptions
+import zeep.helpers
+
+from .cache import _atomic_write
+from .exceptions import WorkdaySoapApiError
+from .retry import TRANSIENT_ERRORS, call_with_retries
+from .serialization import json_default
+from .throttle import THROTTLE_FAULT_PATTERNS
+
+logger = logging.getLogger(__name__)
+
+#: ``Response_Filter`` fields that pin the snapshot of the data being paged
+AS_OF_FIELDS = ("As_Of_Effective_Date", "As_Of_Entry_DateTime")
+
+#: Phrases in a SOAP fault that mean it is transient and the page is retried,
+#: matched case-insensitively. Other faults, e.g. validation errors, are raised at once
+TRANSIENT_FAULT_PATTERNS = THROTTLE_FAULT_PATTERNS + (
+    "timed out",
+    "timeout",
+    "temporarily unavailable",
+    "try again",
+)
+
+_FAULTS = (zeep.exceptions.Fault, WorkdaySoapApiError)
+
+
+def _to_json(value):
+    return json.loads(
+        json.dumps(zeep.helpers.serialize_object(value), default=json_default)
+    )
+
+
+class CheckpointStore(object):
+    """
+    Directory of checkpoints, one JSON file each
+    """
+
+    def __init__(self, path):
+        """
+        :param path: Directory to keep the checkpoints in
+        :type  path: ``str``
+        """
+        self.path = path
+        if not os.path.isdir(path):
+            os.makedirs(path)
+
+    def _path(self, key):
+        return os.path.join(self.path, key + ".json")
+
+    def get(self, key):
+        """
+        Get the checkpoint stored under ``key``
+
+        :rtype: ``dict`` or ``None``
+        """
+        try:
+            with io.open(self._path(key), "r", encoding="utf-8") as fo:
+                return json.load(fo)
+        except (IOError, OSError, ValueError):
+            return None
+
+    def save(self, key, checkpoint):
+        """
+        Store ``checkpoint`` under ``key``, replacing the previous one atomically
+        """
+        _atomic_write(self._path(key), json.dumps(checkpoint).encode("utf-8"))
+
+    def delete(self, key):
+        """
+        Remove the checkpoint stored under ``key``
+        """
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+
+class CheckpointedCall(object):
+    """
+    Pages through a web method, saving a checkpoint after each page.
+    Create it with :meth:`workday.soap.SoapMethod.checkpointed`.
+    """
+
+    def __init__(
+        self,
+        method,
+        store,
+        key=None,
+        max_retries=5,
+        backoff=1.0,
+        max_backoff=60.0,
+        fault_patterns=TRANSIENT_FAULT_PATTERNS,
+    ):
+        """
+        :param method: The web method to call
+        :type  method: :class:`workday.soap.SoapMethod`
+
+        :param store: Where to keep the checkpoint
+        :type  store: :class:`CheckpointStore`
+
+        :param key: (Optional) Name of the job, required for :meth:`resume`.
+            Defaults to a hash of the API, method and arguments
+        :type  key: ``str``
+
+        :param max_retries: Times to retry a page before giving up, the checkpoint is kept
+            so the run can be resumed later
+        :type  max_retries: ``int``
+
+        :param backoff: Seconds to wait before the first retry, doubled for each further retry
+        :type  backoff: ``float``
+
+        :param max_backoff: Longest wait between retries in seconds
+        :type  max_backoff: ``float``
+
+        :param fault_patterns: Phrases in SOAP faults that mean the fault is transient
+            and the page is retried
+        :type  fault_patterns: ``tuple`` of ``str``
+        """
+        self.method = method
+        self.store = store
+        self.key = key
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.fault_patterns = tuple(p.lower() for p in fault_patterns)
+
+    def _retryable(self, exc):
+        if isinstance(exc, TRANSIENT_ERRORS):
+            return True
+        if not isinstance(exc, _FAULTS):
+            return False
+        message = (getattr(exc, "message", None) or str(exc)).lower()
+        return any(p in message for p in self.fault_patterns)
+
+    def _key(self, args, kwargs):
+        if self.key:
+            return self.key
+        raw = json.dumps(
+            [self.method.api.name, self.method.name, args, kwargs], sort_keys=True
+        )
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def pages(self, *args, **kwargs):
+        """
+        Call the web method and iterate every page. If a checkpoint of the same call
+        exists, continue after its last completed page instead.
+
+        A page is completed when the caller asks for the next one, so process each page
+        fully inside the loop. The checkpoint is removed once the last page is completed.
+
+        :rtype: ``generator`` of :class:`workday.soap.WorkdayResponse`
+        """
+        args = _to_json(list(args))
+        kwargs = _to_json(dict(kwargs))
+        key = self._key(args, kwargs)
+        checkpoint = self.store.get(key)
+        if checkpoint is None or (checkpoint["args"], checkpoint["kwargs"]) != (
+            args,
+            kwargs,
+        ):
+            checkpoint = {
+                "api": self.method.api.name,
+                "method": self.method.name,
+                "args": args,
+                "kwargs": kwargs,
+                "as_of": None,
+                "last_page": 0,
+                "total_pages": None,
+            }
+        return self._pages(key, checkpoint)
+
+    def resume(self):
+        """
+        Continue the run saved under ``key``
+
+        :raises ValueError: No ``key`` was given, or there is no checkpoint to resume
+
+        :rtype: ``generator`` of :class:`workday.soap.WorkdayResponse`
+        """
+        if not self.key:
+            raise ValueError("resume() needs the key the run was started with")
+        checkpoint = self.store.get(self.key)
+        if checkpoint is None:
+            raise ValueError("There is no checkpoint for '{0}'".format(self.key))
+        if checkpoint["method"] != self.method.name:
+            raise ValueError(
+                "The checkpoint '{0}' is for {1}".format(self.key, checkpoint["method"])
+            )
+        return self._pages(self.key, checkpoint)
+
+    def records(self, record_name, *args, **kwargs):
+        """
+        Like :meth:`pages`, but iterate the records in ``Response_Data``.
+        A page is completed once all its records have been iterated.
+
+        :param record_name: The name of the record list in ``Response_Data``
+        :type  record_name: ``str``
+
+        :rtype: ``generator``
+        """
+        from .soap import _page_records
+
+        for page in self.pages(*args, **kwargs):
+            for record in _page_records(page.data, record_name):
+                yield record
+
+    def _pages(self, key, checkpoint):
+        page = checkpoint["last_page"] + 1
+        if checkpoint["last_page"]:
+            logger.info(
+                "Resuming %s.%s at page %d of %s",
+                checkpoint["api"],
+                checkpoint["method"],
+                page,
+                checkpoint["total_pages"],
+            )
+        while checkpoint["total_pages"] is None or page <= checkpoint["total_pages"]:
+            response = self._fetch(checkpoint, page)
+            if checkpoint["as_of"] is None:
+                checkpoint["as_of"] = self._as_of(response, checkpoint)
+            checkpoint["total_pages"] = response.total_pages
+            yield response
+            checkpoint["last_page"] = page
+            checkpoint["updated"] = time.time()
+            self.store.save(key, checkpoint)
+            page += 1
+        self.store.delete(key)
+
+    def _as_of(self, response, checkpoint):
+        # Later pages must see the same snapshot as the first, so pin the dates the
+        # first page was answered for
+        as_of = {}
+        requested = checkpoint["kwargs"].get("Response_Filter") or {}
+        replied = response.filter or {}
+        for field in AS_OF_FIELDS:
+            value = requested.get(field)
+            if value is None and field in replied:
+                value = replied[field]
+            if value is not None:
+                as_of[field] = _to_json(value)
+        return as_of
+
+    def _fetch(self, checkpoint, page):
+        kwargs = copy.deepcopy(checkpoint["kwargs"])
+        response_filter = kwargs.setdefault("Response_Filter", {})
+        response_filter.update(checkpoint["as_of"] or {})
+        response_filter["Page"] = page
+
+        def retrying(exc, delay):
+            logger.warning(
+                "Page %d of %s failed (%s), retrying in %.1fs",
+                page,
+                checkpoint["method"],
+                getattr(exc, "message", exc),
+                delay,
+            )
+
+        return call_with_retries(
+            lambda: self.method(*checkpoint["args"], **kwargs),
+            self._retryable,
+            max_retries=self.max_retries,
+            backoff=self.backoff,
+            max_backoff=self.max_backoff,
+            on_retry=retrying,
+        )
@@ -14,14 +14,21 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import contextlib
+import logging
+import os
+
 import six
+from six.moves.urllib.parse import urlparse
 
 import requests
 from requests.auth import HTTPBasicAuth
 
 from .auth import BaseAuthentication
 from .exceptions import WsdlNotProvidedError
-from .soap import BaseSoapApiClient
+from .pool import WorkdayHTTPAdapter
+
+logger = logging.getLogger(__name__)
 
 
 class WorkdayClient(object):
@@ -34,7 +41,29 @@ class WorkdayClient(object):
     _authentication = None
 
     def __init__(
-        self, wsdls, authentication, proxy_url=None, disable_ssl_verification=False
+        self,
+        wsdls,
+        authentication,
+        proxy_url=None,
+        disable_ssl_verification=False,
+        wsdl_cache=None,
+        snapshot_dir=None,
+        max_workers=None,
+        prefetch=None,
+        response_mode="zeep",
+        response_cache=None,
+        pool_connections=10,
+        pool_maxsize=10,
+        pool_block=False,
+        keep_alive=True,
+        timeout=None,
+        warm_connections=0,
+        compress_requests=None,
+        throttle=None,
+        parse_processes=None,
+        hooks=None,
+        profiler=None,
+        lazy_schema=False,
     ):
         """
         Instantiate a Workday API client
@@ -50,6 +79,79 @@ class WorkdayClient(object):
 
         :param proxy_url: Optional URL to proxy requests through
         :type  proxy_url: ``str``
+
+        :param wsdl_cache: (Optional) Persistent cache for the WSDL and XSD documents
+        :type  wsdl_cache: :class:`workday.cache.WsdlCache`
+
+        :param snapshot_dir: (Optional) Directory of precompiled WSDL snapshots, one per API.
+            Snapshots are compiled the first time each API is used
+        :type  snapshot_dir: ``str``
+
+        :param max_workers: (Optional) Number of pages to fetch concurrently when iterating
+            paged responses, see :meth:`workday.soap.WorkdayResponse.iter_pages`
+        :type  max_workers: ``int``
+
+        :param prefetch: (Optional) Number of pages to fetch ahead on a background thread
+            while the caller processes the current page
+        :type  prefetch: ``int``
+
+        :param response_mode: ``zeep`` (default) for zeep objects, ``dict`` for plain dicts
+            and lists, ``xml`` for lxml elements, see :mod:`workday.raw`, or ``slots`` for
+            compact records, see :mod:`workday.records`
+        :type  response_mode: ``str``
+
+        :param response_cache: (Optional) Cache for the replies to ``Get_*`` operations,
+            shared by all the APIs
+        :type  response_cache: :class:`workday.cache.ResponseCache`
+
+        :param pool_connections: Number of hosts to keep a connection pool for
+        :type  pool_connections: ``int``
+
+        :param pool_maxsize: Maximum number of connections kept open per host, set it to at
+            least the number of concurrent requests so connections are not discarded
+        :type  pool_maxsize: ``int``
+
+        :param pool_block: Wait for a free connection when all ``pool_maxsize`` connections
+            are busy instead of opening an extra one
+        :type  pool_block: ``bool``
+
+        :param keep_alive: Keep connections open between requests
+        :type  keep_alive: ``bool``
+
+        :param timeout: (Optional) Timeout for every HTTP request in seconds, or a
+            ``(connect, read)`` tuple
+        :type  timeout: ``float`` or ``tuple``
+
+        :param warm_connections: (Optional) Number of connections to open to each
+            Workday host up front, see :meth:`warm`
+        :type  warm_connections: ``int``
+
+        :param compress_requests: (Optional) Gzip compress request bodies of at least this
+            many bytes, e.g. for large Put_* payloads. Replies are always compressed
+            when the server supports it
+        :type  compress_requests: ``int``
+
+        :param throttle: (Optional) Rate cap and adaptive concurrency limit for the tenant,
+            throttled requests are queued and retried instead of failing
+        :type  throttle: :class:`workday.throttle.Throttle`
+
+        :param parse_processes: (Optional) Parse replies in this many worker processes, so
+            parsing large pages fetched concurrently is not limited by the GIL. Requires the
+            ``dict`` response mode. Call :meth:`close` to stop the processes
+        :type  parse_processes: ``int``
+
+        :param hooks: (Optional) Called with the :class:`workday.timing.CallTimings` of every
+            call, e.g. to log slow calls or record metrics, see :mod:`workday.timing`
+        :type  hooks: ``list`` of ``callable``
+
+        :param profiler: (Optional) Profile selected calls with cProfile and tracemalloc,
+            see :meth:`profile` to profile for a while only
+        :type  profiler: :class:`workday.profiling.Profiler`
+
+        :param lazy_schema: Compile each operation and the types it needs on first use
+            instead of the whole WSDL up front, see :mod:`workday.lazy`. Cannot be combined
+            with ``snapshot_dir``
+        :type  lazy_schema: ``bool``
         """
         if not isinstance(authentication, BaseAuthentication):
             raise ValueError(
@@ -59,8 +161,24 @@ class WorkdayClient(object):
         if not isinstance(wsdls, dict):
             raise TypeError("WSDLs argument must be a dictionary")
 
+        if parse_processes and response_mode != "dict":
+            raise ValueError("parse_processes requires response_mode='dict'")
+
+        if lazy_schema and snapshot_dir:
+            raise ValueError("lazy_schema cannot be combined with snapshot_dir")
+
         self.proxy_url = proxy_url
         self._session = requests.Session()
+        self._adapter = WorkdayHTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+            timeout=timeout,
+        )
+        self._session.mount("https://", self._adapter)
+        self._session.mount("http://", self._adapter)
+        if not keep_alive:
+            self._session.headers["Connection"] = "close"
 
         if proxy_url:
             self._session.proxies = {"https": proxy_url}
@@ -69,6 +187,22 @@ class WorkdayClient(object):
             self._session.verify = False
 
         self._authentication = authentication
+        self._wsdl_cache = wsdl_cache
+        self._snapshot_dir = snapshot_dir
+        self._max_workers = max_workers
+        self._prefetch = prefetch
+        self._response_mode = response_mode
+        self._response_cache = response_cache
+        self._compress_requests = compress_requests
+        self._throttle = throttle
+        self._parse_executor = None
+        if parse_processes:
+            from concurrent.futures import ProcessPoolExecutor
+
+            self._parse_executor = ProcessPoolExecutor(max_workers=parse_processes)
+        self._hooks = hooks if hooks is not None else []
+        self._profiler = profiler
+        self._lazy_schema = lazy_schema
         self._apis = {}
 
         for name, value in wsdls.items():
@@ -78,15 +212,115 @@ class WorkdayClient(object):
                 )
             self._apis[name] = value
 
+        if warm_connections:
+            self.warm(warm_connections)
+
+    @property
+    def pool_stats(self):
+        """
+        Connection pool statistics of the HTTP session
+
+        :rtype: :class:`workday.pool.PoolStats`
+        """
+        return self._adapter.stats
+
+    def warm(self, connections=1):
+        """
+        Open connections to each Workday host ahead of the first calls.
+        Hosts that can't be reached are logged and skipped.
+
+        :param connections: Number of connections to open per host
+        :type  connections: ``int``
+        """
+        hosts = set()
+        for url in self._apis.values():
+            if not isinstance(url, six.string_types):
+                url = url.wsdl_url
+            parsed = urlparse(url)
+            hosts.add("{0}://{1}/".format(parsed.scheme, parsed.netloc))
+        for host in sorted(hosts):
+            # Resolve proxies and CA bundles like a request would, so the same pool is used
+            settings = self._session.merge_environment_settings(host, {}, None, None, None)
+            try:
+                self._adapter.warm(
+                    host,
+                    connections,
+                    proxies=settings["proxies"],
+                    verify=settings["verify"],
+                )
+            except Exception as exc:
+                logger.warning("Could not warm connections to %s: %s", host, exc)
+
+    def _set_profiler(self, profiler):
+        self._profiler = profiler
+        for api in self._apis.values():
+            if not isinstance(api, six.string_types):
+                api.profiler = profiler
+
+    @contextlib.contextmanager
+    def profile(self, directory, operations=None, **options):
+        """
+        Profile the calls made inside the ``with`` block, see :class:`workday.profiling.Profiler`
+
+        .. code-block:: python
+
+            with client.profile('/tmp/profiles', operations=['Get_Workers']) as profiler:
+                client.hcm.Get_Workers()
+            print(profiler.reports)
+
+        :param directory: Where to write the profiles
+        :type  directory: ``str``
+
+        :param operations: (Optional) Names of the web methods to profile, defaults to all
+        :type  operations: ``list`` of ``str``
+
+        :rtype: :class:`workday.profiling.Profiler`
+        """
+        from .profiling import Profiler
+
+        previous = self._profiler
+        profiler = Profiler(directory, operations=operations, **options)
+        self._set_profiler(profiler)
+        try:
+            yield profiler
+        finally:
+            self._set_profiler(previous)
+
+    def close(self):
+        """
+        Stop the parsing processes and close the connections of the HTTP session
+        """
+        if self._parse_executor is not None:
+            self._parse_executor.shutdown(wait=True)
+            self._parse_executor = None
+        self._session.close()
+
     def __getattr__(self, api):
         if api not in self._apis:
             raise WsdlNotProvidedError("API '{0}' was not loaded".format(api))
         else:
             if isinstance(self._apis[api], six.string_types):
+                from .soap import BaseSoapApiClient
+
+                snapshot_path = None
+                if self._snapshot_dir:
+                    snapshot_path = os.path.join(self._snapshot_dir, api + ".snapshot")
                 self._apis[api] = BaseSoapApiClient(
                     name=api,
                     session=self._session,
                     wsdl_url=self._apis[api] + "?wsdl",
                     authentication=self._authentication,
+                    wsdl_cache=self._wsdl_cache,
+                    snapshot_path=snapshot_path,
+                    max_workers=self._max_workers,
+                    prefetch=self._prefetch,
+                    response_mode=self._response_mode,
+                    response_cache=self._response_cache,
+                    compress_requests=self._compress_requests,
+                    throttle=self._throttle,
+                    parse_executor=self._parse_executor,
+                    hooks=self._hooks,
+                    profiler=self._profiler,
+                    lazy_schema=self._lazy_schema,
                 )
             return self._apis[api]
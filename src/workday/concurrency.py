@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+# Licensed to Anthony Shaw (anthonyshaw@apache.org) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import collections
+import itertools
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from six.moves import queue
+
+
+def bounded_map(func, items, max_workers, ordered=True):
+    """
+    Call ``func`` for each of ``items`` on a pool of ``max_workers`` threads
+    and yield the results.
+
+    At most ``max_workers`` calls are in flight at any time so a slow consumer
+    does not cause results to pile up in memory. When ``ordered``, results that
+    finish ahead of a slower earlier call are held back, up to ``max_workers`` of
+    them, while the other threads carry on with the following items. Exceptions
+    raised by ``func`` are raised to the consumer when their result is reached.
+
+    :param func: Function to call with each item
+    :type  func: ``callable``
+
+    :param items: The items to process
+    :type  items: ``iterable``
+
+    :param max_workers: Maximum number of concurrent calls
+    :type  max_workers: ``int``
+
+    :param ordered: Yield results in the order of ``items``, otherwise as they complete
+    :type  ordered: ``bool``
+    """
+    if max_workers < 1:
+        raise ValueError("max_workers must be at least 1")
+    items = iter(items)
+    positions = itertools.count()
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    # Calls whose results have not been yielded yet, by position
+    pending = collections.OrderedDict()
+    # In flight plus finished and waiting for their turn
+    limit = max_workers * 2 if ordered else max_workers
+    try:
+
+        def running():
+            return [f for f in pending.values() if not f.done()]
+
+        def fill():
+            while len(pending) < limit and len(running()) < max_workers:
+                for item in items:
+                    pending[next(positions)] = executor.submit(func, item)
+                    break
+                else:
+                    return
+
+        fill()
+        while pending:
+            if ordered:
+                position, future = next(iter(pending.items()))
+                if not future.done():
+                    wait(running(), return_when=FIRST_COMPLETED)
+                    fill()
+                    continue
+            else:
+                done, _ = wait(list(pending.values()), return_when=FIRST_COMPLETED)
+                position = next(p for p, f in pending.items() if f in done)
+            future = pending.pop(position)
+            fill()
+            yield future.result()
+    finally:
+        for future in pending.values():
+            future.cancel()
+        executor.shutdown(wait=True)
+
+
+class PrefetchStats(object):
+    """
+    Timings of a :class:`PrefetchIterator`. If the consumer waited much longer than
+    the producer, fetching is the bottleneck; the other way round, processing is.
+    """
+
+    def __init__(self):
+        #: Items handed to the consumer
+        self.items = 0
+        #: Seconds the consumer spent waiting for the next item
+        self.consumer_wait = 0.0
+        #: Seconds the producer spent waiting for space in the buffer
+        self.producer_wait = 0.0
+
+    def __repr__(self):
+        return "<PrefetchStats items={0} consumer_wait={1:.3f}s producer_wait={2:.3f}s>".format(
+            self.items, self.consumer_wait, self.producer_wait
+        )
+
+
+# Marks the end of the items on the queue
+_DONE = object()
+
+
+def _put(queue_, closed, stats, item):
+    start = time.time()
+    try:
+        while not closed.is_set():
+            try:
+                queue_.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+    finally:
+        stats.producer_wait += time.time() - start
+
+
+def _produce(iterable, queue_, closed, stats):
+    # Runs on the background thread. It must not reference the PrefetchIterator,
+    # so an abandoned iterator can be garbage collected and stop the thread
+    try:
+        for item in iterable:
+            if not _put(queue_, closed, stats, (item, None)):
+                return
+    except Exception as e:
+        _put(queue_, closed, stats, (_DONE, e))
+        return
+    finally:
+        close = getattr(iterable, "close", None)
+        if closed.is_set() and close is not None:
+            close()
+    _put(queue_, closed, stats, (_DONE, None))
+
+
+class PrefetchIterator(object):
+    """
+    Iterate ``iterable`` on a background thread, keeping up to ``size`` items
+    ready so producing the next item overlaps with processing the current one.
+    Call :meth:`close` (or use it as a context manager) when abandoning the
+    iteration early to stop the background thread, an iterator that is garbage
+    collected stops it as well.
+    """
+
+    def __init__(self, iterable, size=1):
+        """
+        :param iterable: The items to prefetch
+        :type  iterable: ``iterable``
+
+        :param size: Maximum number of items to buffer
+        :type  size: ``int``
+        """
+        if size < 1:
+            raise ValueError("size must be at least 1")
+        self.stats = PrefetchStats()
+        self._queue = queue.Queue(maxsize=size)
+        self._closed = threading.Event()
+        self._finished = False
+        self._thread = threading.Thread(
+            target=_produce, args=(iterable, self._queue, self._closed, self.stats)
+        )
+        self._thread.daemon = True
+        self._thread.start()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self._finished:
+            raise StopIteration
+        start = time.time()
+        item, error = self._queue.get()
+        self.stats.consumer_wait += time.time() - start
+        if item is _DONE:
+            self._finished = True
+            if error is not None:
+                raise error
+            raise StopIteration
+        self.stats.items += 1
+        return item
+
+    def next(self):
+        return self.__next__()
+
+    def close(self):
+        """
+        Stop prefetching, items still in the buffer are discarded
+        """
+        self._finished = True
+        self._closed.set()
+        self._thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __del__(self):
+        # Abandoned without close(), the thread stops by itself
+        closed = getattr(self, "_closed", None)
+        if closed is not None:
+            closed.set()
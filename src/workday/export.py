@@ -0,0 +1,576 @@
+# -*- coding: utf-8 -*-
+# Licensed to Anthony Shaw (anthonyshaw@apache.org) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Export every page of a web method to a file, one page in memory at a time.
+
+:class:`JSONLinesSink`, :class:`JSONSink` and :class:`CSVSink` write records as they are
+iterated, see :meth:`workday.soap.WorkdayResponse.export`. JSON is encoded with orjson when
+it is installed. :class:`ParquetExporter` requires pyarrow (``pip install workday[parquet]``).
+"""
+
+import csv
+import datetime
+import gzip
+import io
+import itertools
+import json
+import re
+
+from lxml import etree
+
+import zeep.helpers
+import zeep.xsd
+from zeep.xsd.types import builtins
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+from .raw import element_to_dict
+from .records import Record
+from .serialization import json_default
+from .soap import SoapMethod, _page_records
+
+#: Formats of :func:`open_sink`, by file extension
+SINK_FORMATS = {".jsonl": "jsonl", ".ndjson": "jsonl", ".json": "json", ".csv": "csv"}
+
+#: Bytes buffered before each write to the file
+BUFFER_SIZE = 1024 * 1024
+
+
+def _localname(tag):
+    return tag.rsplit("}", 1)[-1]
+
+
+def _record_element(api, method, record_name):
+    output = api._client.service._binding.get(method).output.body
+    response_data = dict(output.type.elements)["Response_Data"]
+    return dict(response_data.type.elements)[record_name]
+
+
+def _xml_pages(api, method, args, kwargs):
+    """
+    The first page and an iterator of the following pages of a call, with ``Response_Data``
+    as lxml elements
+    """
+    first = SoapMethod(api, method, response_mode="xml")(*args, **kwargs)
+    return first, first.iter_pages()
+
+
+# (xsd type, arrow type factory, convert the python value)
+_SIMPLE_TYPES = (
+    (builtins.Boolean, lambda: pyarrow.bool_(), None),
+    (builtins.Integer, lambda: pyarrow.int64(), None),
+    (builtins.Decimal, lambda: pyarrow.float64(), float),
+    (builtins.Double, lambda: pyarrow.float64(), float),
+    (builtins.Float, lambda: pyarrow.float64(), float),
+    (builtins.DateTime, lambda: pyarrow.timestamp("us", tz="UTC"), None),
+    (builtins.Date, lambda: pyarrow.date32(), None),
+    (builtins.Time, lambda: pyarrow.time64("us"), None),
+)
+
+
+class _Node(object):
+    """
+    How one element or attribute maps to Arrow
+    """
+
+    __slots__ = ("name", "xsd_type", "repeated", "arrow_type", "convert", "children", "attributes")
+
+    def __init__(self, name, xsd_type, repeated):
+        self.name = name
+        self.xsd_type = xsd_type
+        self.repeated = repeated
+        self.arrow_type = None
+        self.convert = None
+        # Complex types: {element name: node} and {attribute name: node}
+        self.children = None
+        self.attributes = None
+
+
+class ArrowSchemaBuilder(object):
+    """
+    Maps a WSDL record type to an Arrow schema and converts record elements to rows.
+
+    Complex elements become structs, which the exporter flattens into ``parent.child``
+    columns, repeated elements become lists. Types nested deeper than ``max_depth``, or
+    that contain themselves, are stored as JSON strings.
+    """
+
+    def __init__(self, xsd_element, max_depth=8):
+        """
+        :param xsd_element: The schema element of the record
+        :type  xsd_element: :class:`zeep.xsd.Element`
+
+        :param max_depth: Deepest level of nested types to map to columns
+        :type  max_depth: ``int``
+        """
+        self.max_depth = max_depth
+        self.root = self._node(xsd_element.name, xsd_element.type, False, 0, ())
+        self.schema = pyarrow.schema(list(self.root.arrow_type))
+
+    def _node(self, name, xsd_type, repeated, depth, parents):
+        node = _Node(name, xsd_type, repeated)
+        if isinstance(xsd_type, zeep.xsd.ComplexType):
+            if depth >= self.max_depth or xsd_type in parents:
+                node.arrow_type = pyarrow.string()
+                node.convert = _to_json
+            else:
+                parents = parents + (xsd_type,)
+                node.children = {}
+                node.attributes = {}
+                fields = []
+                for child_name, element in xsd_type.elements:
+                    child = self._node(
+                        child_name,
+                        element.type,
+                        getattr(element, "max_occurs", 1) != 1,
+                        depth + 1,
+                        parents,
+                    )
+                    node.children[child_name] = child
+                    fields.append(pyarrow.field(child_name, child.arrow_type))
+                for attribute_name, attribute in xsd_type.attributes:
+                    if not attribute_name or attribute_name in node.children:
+                        continue
+                    child = self._node(attribute_name, attribute.type, False, depth + 1, ())
+                    node.attributes[attribute_name] = child
+                    fields.append(pyarrow.field(attribute_name, child.arrow_type))
+                node.arrow_type = pyarrow.struct(fields)
+        else:
+            node.arrow_type = pyarrow.string()
+            for base, arrow_type, convert in _SIMPLE_TYPES:
+                if isinstance(xsd_type, base):
+                    node.arrow_type = arrow_type()
+                    node.convert = _python_value(xsd_type, convert)
+                    break
+        if repeated:
+            node.arrow_type = pyarrow.list_(node.arrow_type)
+        return node
+
+    def row(self, element):
+        """
+        Convert a record element to a ``dict`` matching :attr:`schema`
+        """
+        return self._value(self.root, element)
+
+    def _value(self, node, element):
+        if node.children is None:
+            if node.convert is _to_json:
+                return _to_json(element)
+            text = element.text
+            if text is None or node.convert is None:
+                return text
+            return node.convert(text)
+
+        row = {}
+        for key, value in element.attrib.items():
+            attribute = node.attributes.get(_localname(key))
+            if attribute is not None:
+                row[attribute.name] = (
+                    attribute.convert(value) if attribute.convert else value
+                )
+        if not len(element):
+            # Simple content with attributes, zeep calls the value _value_1
+            child = node.children.get("_value_1")
+            if child is not None:
+                row["_value_1"] = self._value(child, element)
+            return row
+        for child_element in element:
+            if not isinstance(child_element.tag, str):
+                continue
+            child = node.children.get(_localname(child_element.tag))
+            if child is None:
+                continue
+            value = self._value(child, child_element)
+            if child.repeated:
+                row.setdefault(child.name, []).append(value)
+            else:
+                row[child.name] = value
+        return row
+
+
+def _to_json(element):
+    return json.dumps(element_to_dict(element))
+
+
+# Workday sends dates with a UTC offset, e.g. 2018-06-25-07:00, which isodate rejects
+_DATE_OFFSET = re.compile(r"(Z|[+-]\d{2}:\d{2})$")
+
+
+def _python_value(xsd_type, convert):
+    is_date = isinstance(xsd_type, builtins.Date)
+
+    def python_value(text):
+        if is_date:
+            text = _DATE_OFFSET.sub("", text.strip())
+        try:
+            value = xsd_type.pythonvalue(text)
+        except ValueError:
+            # Not a valid value of the column type, written as null
+            return None
+        return convert(value) if convert is not None else value
+
+    return python_value
+
+
+def _flatten(table):
+    while any(pyarrow.types.is_struct(field.type) for field in table.schema):
+        table = table.flatten()
+    return table
+
+
+class ParquetExporter(object):
+    """
+    Writes every record of a paged web method to a Parquet file, one page at a time.
+    Nested records are flattened into ``parent.child`` columns typed from the WSDL.
+
+    .. code-block:: python
+
+        exporter = ParquetExporter(client.hcm, 'Get_Workers', 'Worker')
+        exporter.export('workers.parquet', Response_Filter={'Count': 999})
+    """
+
+    def __init__(self, api, method, record_name, max_depth=8, compression="snappy"):
+        """
+        :param api: The API to call
+        :type  api: :class:`workday.soap.BaseSoapApiClient`
+
+        :param method: The name of the web method
+        :type  method: ``str``
+
+        :param record_name: The name of the record list in ``Response_Data``
+        :type  record_name: ``str``
+
+        :param max_depth: Deepest level of nested types to map to columns,
+            deeper data is stored as JSON strings
+        :type  max_depth: ``int``
+
+        :param compression: Parquet compression codec
+        :type  compression: ``str``
+        """
+        if pyarrow is None:
+            raise ImportError(
+                "pyarrow is required for ParquetExporter, install workday[parquet]"
+            )
+        self.api = api
+        self.method = method
+        self.record_name = record_name
+        self.compression = compression
+        self.builder = ArrowSchemaBuilder(
+            _record_element(api, method, record_name), max_depth=max_depth
+        )
+        self._struct_schema = self.builder.schema
+        #: The schema of the Parquet file, with nested records flattened
+        self.schema = _flatten(self._struct_schema.empty_table()).schema
+
+    def batches(self, *args, **kwargs):
+        """
+        Call the web method and convert each page to an Arrow record batch
+
+        :rtype: ``generator`` of :class:`pyarrow.RecordBatch`
+        """
+        first, pages = _xml_pages(self.api, self.method, args, kwargs)
+        all_pages = itertools.chain([first], pages)
+        del first
+        try:
+            for page in all_pages:
+                records = _page_records(page.data, self.record_name)
+                del page
+                rows = [self.builder.row(record) for record in records]
+                del records
+                table = pyarrow.Table.from_pylist(rows, schema=self._struct_schema)
+                for batch in _flatten(table).to_batches():
+                    yield batch
+        finally:
+            # Stop fetching when the caller stops iterating early
+            close = getattr(pages, "close", None)
+            if close is not None:
+                close()
+
+    def export(self, path, *args, **kwargs):
+        """
+        Call the web method and write every record to the Parquet file ``path``
+
+        :param path: The file to write
+        :type  path: ``str``
+
+        :return: The number of records written
+        :rtype: ``int``
+        """
+        rows = 0
+        with pyarrow.parquet.ParquetWriter(
+            path, self.schema, compression=self.compression
+        ) as writer:
+            for batch in self.batches(*args, **kwargs):
+                writer.write_batch(batch)
+                rows += batch.num_rows
+        return rows
+
+
+def plain(record):
+    """
+    Convert a record of any response mode to ``dict``, ``list`` and scalar values
+
+    :param record: A zeep object, a :class:`workday.records.Record`, an lxml element or
+        a ``dict`` mode record
+    """
+    if isinstance(record, Record):
+        return record.as_dict()
+    if etree.iselement(record):
+        return element_to_dict(record)
+    if isinstance(record, dict):
+        return record
+    return zeep.helpers.serialize_object(record)
+
+
+if orjson is not None:
+
+    def _dump_line(value):
+        return orjson.dumps(
+            value,
+            default=json_default,
+            option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS,
+        )
+
+
+else:
+
+    def _dump_line(value):
+        text = json.dumps(
+            value, default=json_default, ensure_ascii=False, separators=(",", ":")
+        )
+        return text.encode("utf-8") + b"\n"
+
+
+class _Sink(object):
+    def __init__(self, fileobj):
+        self.fileobj = fileobj
+        #: Records written
+        self.count = 0
+        self._owned = None
+
+    def write_all(self, records):
+        """
+        Write every record of an iterable
+
+        :return: The number of records written
+        :rtype: ``int``
+        """
+        write = self.write
+        for record in records:
+            write(record)
+        return self.count
+
+    def close(self):
+        """
+        Flush the buffered records, and close the file if the sink opened it
+        """
+        self.fileobj.flush()
+        if self._owned is not None:
+            self._owned.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class JSONLinesSink(_Sink):
+    """
+    Writes each record as one line of JSON (NDJSON)
+    """
+
+    def __init__(self, fileobj):
+        """
+        :param fileobj: Binary file to write to
+        """
+        super(JSONLinesSink, self).__init__(fileobj)
+        self._write = fileobj.write
+
+    def write(self, record):
+        """
+        Write a record
+        """
+        self._write(_dump_line(plain(record)))
+        self.count += 1
+
+
+class JSONSink(JSONLinesSink):
+    """
+    Writes the records as one JSON array, with a record per line
+    """
+
+    def __init__(self, fileobj):
+        """
+        :param fileobj: Binary file to write to
+        """
+        super(JSONSink, self).__init__(fileobj)
+        self._closed = False
+
+    def write(self, record):
+        """
+        Write a record
+        """
+        self._write(b",\n" if self.count else b"[\n")
+        self._write(_dump_line(plain(record))[:-1])
+        self.count += 1
+
+    def close(self):
+        if not self._closed:
+            self._closed = True
+            self._write(b"\n]\n" if self.count else b"[]\n")
+        super(JSONSink, self).close()
+
+
+def _flat_row(value, prefix, row):
+    for key, child in value.items():
+        name = prefix + key
+        if isinstance(child, dict):
+            _flat_row(child, name + ".", row)
+        else:
+            row[name] = _csv_value(child)
+    return row
+
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, (list, tuple, dict)):
+        # Repeated elements don't fit in a cell, keep them as JSON
+        return _dump_line(value)[:-1].decode("utf-8")
+    return value
+
+
+class CSVSink(_Sink):
+    """
+    Writes each record as a CSV row. Nested elements become ``parent.child`` columns,
+    repeated elements are written as JSON.
+    """
+
+    def __init__(self, fileobj, columns=None):
+        """
+        :param fileobj: Binary file to write to
+        :param columns: (Optional) The columns to write, defaults to the columns of the
+            first record. Values of other columns are left out
+        :type  columns: ``list`` of ``str``
+        """
+        super(CSVSink, self).__init__(fileobj)
+        self.columns = list(columns) if columns else None
+        self._text = io.TextIOWrapper(fileobj, encoding="utf-8", newline="")
+        self._writer = None
+
+    def write(self, record):
+        """
+        Write a record
+        """
+        row = _flat_row(plain(record), "", {})
+        if self._writer is None:
+            if self.columns is None:
+                self.columns = list(row)
+            self._writer = csv.DictWriter(
+                self._text, self.columns, extrasaction="ignore"
+            )
+            self._writer.writeheader()
+        self._writer.writerow(row)
+        self.count += 1
+
+    def close(self):
+        self._text.flush()
+        # Leave the file open for the caller, unless the sink opened it
+        self._text.detach()
+        super(CSVSink, self).close()
+
+
+def _format(path):
+    name = path.lower()
+    compress = name.endswith(".gz")
+    if compress:
+        name = name[:-3]
+    for extension, format in SINK_FORMATS.items():
+        if name.endswith(extension):
+            return format, compress
+    return None, compress
+
+
+def open_sink(path, format=None, compress=None, columns=None, compresslevel=6):
+    """
+    Open a sink that writes to the file ``path``. Close it, or use it as a context
+    manager, to flush the last records.
+
+    :param path: The file to write
+    :type  path: ``str``
+
+    :param format: ``jsonl``, ``json`` or ``csv``, defaults to the extension of ``path``:
+        ``.jsonl`` or ``.ndjson`` for JSON Lines, ``.json`` for a JSON array
+    :type  format: ``str``
+
+    :param compress: Write gzip, defaults to ``True`` when ``path`` ends with ``.gz``
+    :type  compress: ``bool``
+
+    :param columns: (Optional) The columns of a CSV file
+    :type  columns: ``list`` of ``str``
+
+    :param compresslevel: gzip level, lower is faster
+    :type  compresslevel: ``int``
+
+    :rtype: :class:`JSONLinesSink`, :class:`JSONSink` or :class:`CSVSink`
+    """
+    guessed, gzipped = _format(path)
+    format = format or guessed
+    if format not in ("jsonl", "json", "csv"):
+        raise ValueError("Unknown export format for '{0}'".format(path))
+    if compress is None:
+        compress = gzipped
+    # Few large writes to the file (and to zlib) instead of one per record
+    if compress:
+        fileobj = io.BufferedWriter(
+            gzip.open(path, "wb", compresslevel=compresslevel), BUFFER_SIZE
+        )
+    else:
+        fileobj = io.open(path, "wb", buffering=BUFFER_SIZE)
+    if format == "csv":
+        sink = CSVSink(fileobj, columns=columns)
+    elif format == "json":
+        sink = JSONSink(fileobj)
+    else:
+        sink = JSONLinesSink(fileobj)
+    sink._owned = fileobj
+    return sink
+
+
+def export_records(records, path, format=None, compress=None, columns=None):
+    """
+    Write an iterable of records to the file ``path``, see :func:`open_sink`
+
+    :return: The number of records written
+    :rtype: ``int``
+    """
+    with open_sink(path, format=format, compress=compress, columns=columns) as sink:
+        return sink.write_all(records)
@@ -0,0 +1,294 @@
+# -*- coding: utf-8 -*-
+# Licensed to Anthony Shaw (anthonyshaw@apache.org) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""
+Lazy compilation of WSDL documents.
+
+Workday WSDLs define hundreds of operations and thousands of types, while an application
+usually calls a handful of them. A :class:`LazyDocument` only indexes the messages, operations
+and schema components by name when the WSDL is loaded. An operation, its messages and the
+types they need are compiled the first time the operation is used, and kept for later calls.
+
+Definitions pulled in with ``wsdl:import`` are compiled in full, Workday WSDLs do not use it.
+"""
+
+import functools
+import logging
+import os
+import threading
+import warnings
+from collections import OrderedDict
+
+try:
+    from collections.abc import Mapping
+except ImportError:  # Python 2
+    from collections import Mapping
+
+import six
+from lxml import etree
+
+from zeep.exceptions import IncompleteMessage, IncompleteOperation
+from zeep.loader import is_relative_path
+from zeep.settings import Settings
+from zeep.utils import as_qname, qname_attr
+from zeep.wsdl import parse
+from zeep.wsdl.definitions import PortType
+from zeep.wsdl.wsdl import NSMAP, Definition, Document
+from zeep.xsd import Schema
+from zeep.xsd.schema import SchemaDocument
+from zeep.xsd.visitor import SchemaVisitor, tags
+
+logger = logging.getLogger(__name__)
+
+# Top level schema components that are compiled on first use, by the name zeep looks them up as
+_COMPONENTS = {
+    tags.element: "element",
+    tags.complexType: "type",
+    tags.simpleType: "type",
+    tags.group: "group",
+    tags.attribute: "attribute",
+    tags.attributeGroup: "attributeGroup",
+}
+
+
+class _LazyMapping(Mapping):
+    """
+    Names of WSDL items, each compiled when it is first looked up
+    """
+
+    def __init__(self, items, compile, lock):
+        self._items = items
+        self._compiled = {}
+        self._compile = compile
+        self._lock = lock
+
+    def __getitem__(self, key):
+        with self._lock:
+            if key not in self._compiled:
+                value = self._compile(self._items[key])
+                if value is None:
+                    # Incomplete, zeep leaves these out
+                    del self._items[key]
+                    raise KeyError(key)
+                self._compiled[key] = value
+            return self._compiled[key]
+
+    def __contains__(self, key):
+        try:
+            self[key]
+        except KeyError:
+            return False
+        return True
+
+    def __iter__(self):
+        return iter(list(self._items))
+
+    def __len__(self):
+        return len(self._items)
+
+    @property
+    def compiled(self):
+        """
+        The names compiled so far
+
+        :rtype: ``list`` of ``str``
+        """
+        return list(self._compiled)
+
+
+class _LazySchemaDocument(SchemaDocument):
+    def __init__(self, namespace, location, base_url, lock):
+        SchemaDocument.__init__(self, namespace, location, base_url)
+        self._lock = lock
+        self._schema = None
+        # (item name, qualified name) -> (node, parent) of components not yet compiled
+        self._nodes = {}
+
+    @property
+    def is_empty(self):
+        return not bool(self._imports or self._types or self._elements or self._nodes)
+
+    def load(self, schema, node):
+        if node is None:
+            return
+        self._schema = schema
+        # Like SchemaVisitor.visit_schema, but the named components are only indexed
+        tns = node.get("targetNamespace")
+        if tns:
+            self._target_namespace = tns
+        self._element_form = node.get("elementFormDefault", "unqualified")
+        self._attribute_form = node.get("attributeFormDefault", "unqualified")
+
+        visitor = SchemaVisitor(schema, self)
+        for child in node:
+            item_name = _COMPONENTS.get(child.tag)
+            name = child.get("name")
+            if item_name and name:
+                qname = as_qname(name, child.nsmap, self._target_namespace)
+                self._nodes[(item_name, qname.text)] = (child, node)
+            else:
+                visitor.process(child, parent=node)
+
+    def _get_component(self, qname, items, item_name):
+        key = qname.text if isinstance(qname, etree.QName) else qname
+        with self._lock:
+            entry = self._nodes.pop((item_name, key), None)
+            if entry is not None:
+                node, parent = entry
+                logger.debug("Compiling %s %s", item_name, key)
+                SchemaVisitor(self._schema, self).process(node, parent=parent)
+                items[key] = items[key].resolve()
+            return SchemaDocument._get_component(self, qname, items, item_name)
+
+
+class _LazySchema(Schema):
+    def __init__(self, lock, **kwargs):
+        self._lock = lock
+        Schema.__init__(self, **kwargs)
+
+    def create_new_document(self, node, url, base_url=None, target_namespace=None):
+        namespace = node.get("targetNamespace") if node is not None else None
+        if not namespace:
+            namespace = target_namespace
+        if base_url is None:
+            base_url = url
+        document = _LazySchemaDocument(namespace, url, base_url, self._lock)
+        self.documents.add(document)
+        document.load(self, node)
+        return document
+
+
+def _message(definition, node):
+    try:
+        return parse.parse_abstract_message(definition, node)
+    except IncompleteMessage as exc:
+        warnings.warn(str(exc))
+        return None
+
+
+def _operation(definition, operation):
+    try:
+        operation.resolve(definition)
+    except IncompleteOperation as exc:
+        warnings.warn(str(exc))
+        return None
+    return operation
+
+
+class _LazyDefinition(Definition):
+    def parse_messages(self, doc):
+        nodes = OrderedDict(
+            (qname_attr(node, "name", self.target_namespace).text, node)
+            for node in doc.findall("wsdl:message", namespaces=NSMAP)
+        )
+        return _LazyMapping(nodes, functools.partial(_message, self), self.wsdl._lock)
+
+    def parse_ports(self, doc):
+        result = {}
+        for port_node in doc.findall("wsdl:portType", namespaces=NSMAP):
+            name = qname_attr(port_node, "name", self.target_namespace)
+            nodes = OrderedDict(
+                (node.get("name"), node)
+                for node in port_node.findall("wsdl:operation", namespaces=NSMAP)
+            )
+            operations = _LazyMapping(
+                nodes,
+                functools.partial(parse.parse_abstract_operation, self),
+                self.wsdl._lock,
+            )
+            result[name.text] = PortType(name, operations)
+        return result
+
+    def resolve_imports(self):
+        if self._resolved_imports:
+            return
+        self._resolved_imports = True
+
+        for definition in self.imports.values():
+            definition.resolve_imports()
+
+        # Messages are compiled when an operation needs them, binding operations when
+        # they are first called
+        for binding in self.bindings.values():
+            binding.port_type = self.get("port_types", binding.port_name.text)
+            binding._operations = _LazyMapping(
+                binding._operations, functools.partial(_operation, self), self.wsdl._lock
+            )
+
+        for service in self.services.values():
+            service.resolve(self)
+
+
+class LazyDocument(Document):
+    """
+    A :class:`zeep.wsdl.Document` that compiles each operation and the types it needs
+    the first time the operation is used. Use it with :class:`workday.snapshot.SnapshotClient`,
+    or pass ``lazy_schema=True`` to :class:`workday.client.WorkdayClient`.
+    """
+
+    def __init__(self, location, transport, base=None, settings=None):
+        """
+        :param location: URL or path of the WSDL
+        :type  location: ``str``
+
+        :param transport: The transport to download the WSDL and schemas with
+        :type  transport: :class:`zeep.transports.Transport`
+
+        :param settings: (Optional) zeep settings for the document
+        :type  settings: :class:`zeep.settings.Settings`
+        """
+        # Document.__init__ with lazy definitions and schema
+        self.settings = settings or Settings()
+        if isinstance(location, six.string_types):
+            if is_relative_path(location):
+                location = os.path.abspath(location)
+            self.location = location
+        else:
+            self.location = base
+        self.transport = transport
+
+        # Compilation is recursive and may happen on several threads at once
+        self._lock = threading.RLock()
+        self._definitions = {}
+        self.types = _LazySchema(
+            self._lock,
+            node=None,
+            transport=self.transport,
+            location=self.location,
+            settings=self.settings,
+        )
+
+        document = self._get_xml_document(location)
+        root_definitions = _LazyDefinition(self, document, self.location)
+        root_definitions.resolve_imports()
+
+        self.messages = root_definitions.messages
+        self.port_types = root_definitions.port_types
+        self.bindings = root_definitions.bindings
+        self.services = root_definitions.services
+
+    @property
+    def compiled_operations(self):
+        """
+        The names of the operations compiled so far
+
+        :rtype: ``list`` of ``str``
+        """
+        names = []
+        for binding in self.bindings.values():
+            names.extend(binding._operations.compiled)
+        return names
@@ -0,0 +1,409 @@
+# -*- coding: utf-8 -*-
+# Licensed to Anthony Shaw (anthonyshaw@apache.org) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Aggregated call metrics per API and web method, in the Prometheus text format.
+
+:class:`Metrics` is a hook for :class:`workday.client.WorkdayClient`, see
+:mod:`workday.timing`. It counts calls, faults by code, bytes sent and received and pages
+fetched, and keeps a latency histogram of every web method:
+
+.. code-block:: python
+
+    metrics = Metrics()
+    client = WorkdayClient(wsdls=wsdls, authentication=auth, hooks=[metrics])
+    metrics.serve(port=9464)  # or metrics.render() / metrics.snapshot()
+
+Each thread records into its own shard, so concurrent callers never wait for each other.
+The shards are merged when the metrics are read. When a thread ends, its shard is folded
+into a shared base, so short-lived worker threads don't make reading slower over time.
+"""
+
+import bisect
+import threading
+import weakref
+
+import six
+from six.moves import BaseHTTPServer
+
+from .timing import PHASES
+
+#: Upper bounds of the latency histogram buckets, in seconds
+DEFAULT_BUCKETS = (
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+    120.0,
+    300.0,
+)
+
+#: Quantiles estimated from the histograms
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+def fault_code(error):
+    """
+    The label to count a failed call under: the SOAP fault code, or the class name of
+    other errors
+
+    :rtype: ``str``
+    """
+    fault = getattr(error, "_fault", error)
+    code = getattr(fault, "code", None)
+    if isinstance(code, six.string_types) and code:
+        return code
+    return type(error).__name__
+
+
+class _Series(object):
+    __slots__ = (
+        "buckets",
+        "sum",
+        "count",
+        "pages",
+        "request_bytes",
+        "response_bytes",
+        "phases",
+        "faults",
+    )
+
+    def __init__(self, size):
+        # One count per bucket plus the +Inf bucket, not cumulative
+        self.buckets = [0] * (size + 1)
+        self.sum = 0.0
+        self.count = 0
+        self.pages = 0
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.phases = [0.0] * len(PHASES)
+        self.faults = {}
+
+    def merge(self, other):
+        for i, count in enumerate(other.buckets):
+            self.buckets[i] += count
+        self.sum += other.sum
+        self.count += other.count
+        self.pages += other.pages
+        self.request_bytes += other.request_bytes
+        self.response_bytes += other.response_bytes
+        for i, seconds in enumerate(other.phases):
+            self.phases[i] += seconds
+        for code, count in list(other.faults.items()):
+            self.faults[code] = self.faults.get(code, 0) + count
+
+
+def _merge_shard(merged, shard, size):
+    for key, series in list(shard.items()):
+        if key not in merged:
+            merged[key] = _Series(size)
+        merged[key].merge(series)
+
+
+class _Owner(object):
+    # Kept by the thread-local of the thread recording into a shard, it goes away
+    # with the thread
+    __slots__ = ("__weakref__",)
+
+
+def _quantile(q, bounds, buckets, count):
+    # Linear interpolation within the bucket, like Prometheus' histogram_quantile()
+    if not count:
+        return None
+    rank = q * count
+    seen = 0
+    for i, bucket in enumerate(buckets):
+        if seen + bucket >= rank and bucket:
+            if i == len(bounds):
+                return bounds[-1]
+            lower = bounds[i - 1] if i else 0.0
+            return lower + (bounds[i] - lower) * (rank - seen) / bucket
+        seen += bucket
+    return bounds[-1]
+
+
+def _escape(value):
+    return (
+        str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    )
+
+
+def _labels(**labels):
+    return "{" + ",".join(
+        '{0}="{1}"'.format(name, _escape(value)) for name, value in sorted(labels.items())
+    ) + "}"
+
+
+def _number(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metrics(object):
+    """
+    Call metrics per API and web method, use it as a hook
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS, namespace="workday"):
+        """
+        :param buckets: Upper bounds of the latency histogram buckets in seconds, ascending
+        :type  buckets: ``tuple`` of ``float``
+
+        :param namespace: Prefix of the metric names
+        :type  namespace: ``str``
+        """
+        self.buckets = tuple(sorted(buckets))
+        self.namespace = namespace
+        self._local = threading.local()
+        # Shard of each live thread, keyed by a weak reference to its owner
+        self._shards = {}
+        # Series of the threads that have ended
+        self._base = {}
+        self._lock = threading.RLock()
+
+    def _shard(self):
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = {}
+            owner = self._local.owner = _Owner()
+            with self._lock:
+                self._shards[weakref.ref(owner, self._release)] = shard
+            self._local.shard = shard
+        return shard
+
+    def _release(self, owner):
+        # The thread has ended
+        with self._lock:
+            shard = self._shards.pop(owner, None)
+            if shard:
+                _merge_shard(self._base, shard, len(self.buckets))
+
+    def __call__(self, timings):
+        self.record(timings)
+
+    def record(self, timings):
+        """
+        Add a call to the metrics
+
+        :param timings: The timings of the call
+        :type  timings: :class:`workday.timing.CallTimings`
+        """
+        shard = self._shard()
+        key = (timings.api, timings.method)
+        series = shard.get(key)
+        if series is None:
+            series = shard[key] = _Series(len(self.buckets))
+        series.buckets[bisect.bisect_left(self.buckets, timings.total)] += 1
+        series.sum += timings.total
+        series.count += 1
+        series.request_bytes += timings.request_bytes
+        series.response_bytes += timings.response_bytes
+        phases = series.phases
+        for i, phase in enumerate(PHASES):
+            phases[i] += getattr(timings, phase)
+        if timings.error is not None:
+            code = fault_code(timings.error)
+            series.faults[code] = series.faults.get(code, 0) + 1
+        elif timings.paged:
+            series.pages += 1
+
+    def _merged(self):
+        merged = {}
+        with self._lock:
+            _merge_shard(merged, self._base, len(self.buckets))
+            shards = list(self._shards.values())
+        for shard in shards:
+            _merge_shard(merged, shard, len(self.buckets))
+        return merged
+
+    def reset(self):
+        """
+        Forget every recorded call
+        """
+        with self._lock:
+            self._base.clear()
+            for shard in self._shards.values():
+                shard.clear()
+
+    def snapshot(self):
+        """
+        The metrics of every web method called so far
+
+        :return: ``{(api, method): {"calls", "faults", "pages", "request_bytes",
+            "response_bytes", "seconds", "p50", "p95", "p99", "phases"}}``, where
+            ``faults`` maps fault codes to counts and ``phases`` phases to seconds
+        :rtype: ``dict``
+        """
+        result = {}
+        for key, series in self._merged().items():
+            entry = {
+                "calls": series.count,
+                "faults": dict(series.faults),
+                "pages": series.pages,
+                "request_bytes": series.request_bytes,
+                "response_bytes": series.response_bytes,
+                "seconds": series.sum,
+                "phases": dict(zip(PHASES, series.phases)),
+            }
+            for q in QUANTILES:
+                entry["p{0:g}".format(q * 100)] = _quantile(
+                    q, self.buckets, series.buckets, series.count
+                )
+            result[key] = entry
+        return result
+
+    def render(self):
+        """
+        The metrics in the Prometheus text exposition format
+
+        :rtype: ``str``
+        """
+        merged = sorted(self._merged().items())
+        ns = self.namespace
+        lines = []
+
+        def family(name, kind, help):
+            lines.append("# HELP {0}_{1} {2}".format(ns, name, help))
+            lines.append("# TYPE {0}_{1} {2}".format(ns, name, kind))
+
+        def sample(name, labels, value):
+            lines.append("{0}_{1}{2} {3}".format(ns, name, labels, _number(value)))
+
+        family("call_duration_seconds", "histogram", "Duration of web method calls")
+        for (api, method), series in merged:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), series.buckets):
+                cumulative += count
+                sample(
+                    "call_duration_seconds_bucket",
+                    _labels(api=api, method=method, le=_number(bound)),
+                    cumulative,
+                )
+            labels = _labels(api=api, method=method)
+            sample("call_duration_seconds_sum", labels, series.sum)
+            sample("call_duration_seconds_count", labels, series.count)
+
+        family(
+            "call_duration_quantile_seconds",
+            "gauge",
+            "Quantiles of the call duration estimated from the histogram",
+        )
+        for (api, method), series in merged:
+            for q in QUANTILES:
+                value = _quantile(q, self.buckets, series.buckets, series.count)
+                if value is not None:
+                    sample(
+                        "call_duration_quantile_seconds",
+                        _labels(api=api, method=method, quantile=q),
+                        value,
+                    )
+
+        counters = (
+            ("calls_total", "Web method calls", "count"),
+            ("pages_total", "Pages of results fetched", "pages"),
+            ("request_bytes_total", "Bytes of request bodies sent", "request_bytes"),
+            (
+                "response_bytes_total",
+                "Bytes of response bodies received, before decompression",
+                "response_bytes",
+            ),
+        )
+        for name, help, attr in counters:
+            family(name, "counter", help)
+            for (api, method), series in merged:
+                sample(name, _labels(api=api, method=method), getattr(series, attr))
+
+        family("faults_total", "counter", "Failed calls by SOAP fault code or error")
+        for (api, method), series in merged:
+            for code, count in sorted(series.faults.items()):
+                sample("faults_total", _labels(api=api, method=method, code=code), count)
+
+        family("phase_seconds_total", "counter", "Seconds spent in each phase of the calls")
+        for (api, method), series in merged:
+            for phase, seconds in zip(PHASES, series.phases):
+                sample(
+                    "phase_seconds_total",
+                    _labels(api=api, method=method, phase=phase),
+                    seconds,
+                )
+        return "\n".join(lines) + "\n"
+
+    def serve(self, port=9464, host="127.0.0.1"):
+        """
+        Serve :meth:`render` at ``http://host:port/metrics`` on a background thread
+
+        :param port: Port to listen on, 0 for any free port
+        :type  port: ``int``
+
+        :param host: Address to listen on, only the local host by default
+        :type  host: ``str``
+
+        :rtype: :class:`MetricsServer`
+        """
+        return MetricsServer(self, port=port, host=host)
+
+
+class MetricsServer(object):
+    """
+    HTTP endpoint for a :class:`Metrics`, call :meth:`close` to stop it
+    """
+
+    def __init__(self, metrics, port=9464, host="127.0.0.1"):
+        class Handler(BaseHTTPServer.BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = metrics.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self._server = BaseHTTPServer.HTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        #: The port the server listens on
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever)
+        self._thread.daemon = True
+        self._thread.start()
+
+    @property
+    def url(self):
+        return "http://{0}:{1}/metrics".format(
+            self._server.server_address[0], self.port
+        )
+
+    def close(self):
+        """
+        Stop serving
+        """
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
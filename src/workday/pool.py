@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+# Licensed to Anthony Shaw (anthonyshaw@apache.org) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Connection pooling for the :class:`requests.Session` shared by the APIs of a
+:class:`workday.client.WorkdayClient`.
+"""
+
+import threading
+import time
+
+from requests import Request
+from requests.adapters import HTTPAdapter
+
+
+class PoolStats(object):
+    """
+    Connection pool counters of a :class:`WorkdayHTTPAdapter`.
+    A low reuse ratio means connections are being discarded, usually because
+    ``pool_maxsize`` is smaller than the number of concurrent requests.
+    """
+
+    def __init__(self):
+        #: Connections taken from the pool, one per HTTP request
+        self.requests = 0
+        #: Connections (and TLS handshakes) opened to the server
+        self.connections = 0
+        #: Requests that had to wait for a free connection, only with ``pool_block``
+        self.waits = 0
+        #: Seconds spent waiting for a free connection
+        self.wait_time = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def reuse_ratio(self):
+        """
+        Share of requests that were sent over an already open connection
+        """
+        if not self.requests:
+            return 0.0
+        return max(0.0, 1.0 - float(self.connections) / self.requests)
+
+    def _add(self, **counts):
+        with self._lock:
+            for name, value in counts.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    def __repr__(self):
+        return "<PoolStats requests={0} connections={1} reuse_ratio={2:.2f} waits={3}>".format(
+            self.requests, self.connections, self.reuse_ratio, self.waits
+        )
+
+
+def _connection_class(base, stats):
+    def connect(self):
+        stats._add(connections=1)
+        return base.connect(self)
+
+    return type(base.__name__, (base,), {"connect": connect})
+
+
+def _pool_class(base, stats):
+    def _get_conn(self, timeout=None):
+        # The queue holds a slot per connection, it is empty when all are checked out
+        blocked = self.block and self.pool is not None and self.pool.empty()
+        start = time.time()
+        conn = base._get_conn(self, timeout=timeout)
+        if blocked:
+            stats._add(requests=1, waits=1, wait_time=time.time() - start)
+        else:
+            stats._add(requests=1)
+        return conn
+
+    return type(
+        base.__name__,
+        (base,),
+        {
+            "ConnectionCls": _connection_class(base.ConnectionCls, stats),
+            "_get_conn": _get_conn,
+        },
+    )
+
+
+class WorkdayHTTPAdapter(HTTPAdapter):
+    """
+    :class:`requests.adapters.HTTPAdapter` that records :class:`PoolStats`
+    and applies default timeouts
+    """
+
+    def __init__(
+        self,
+        pool_connections=10,
+        pool_maxsize=10,
+        pool_block=False,
+        timeout=None,
+        max_retries=0,
+    ):
+        """
+        :param pool_connections: Number of hosts to keep a connection pool for
+        :type  pool_connections: ``int``
+
+        :param pool_maxsize: Maximum number of connections kept open per host
+        :type  pool_maxsize: ``int``
+
+        :param pool_block: Wait for a free connection when all ``pool_maxsize`` connections
+            are busy, instead of opening a connection that is discarded afterwards
+        :type  pool_block: ``bool``
+
+        :param timeout: (Optional) Timeout for every request in seconds, or a
+            ``(connect, read)`` tuple
+        :type  timeout: ``float`` or ``tuple``
+        """
+        self.stats = PoolStats()
+        self.timeout = timeout
+        super(WorkdayHTTPAdapter, self).__init__(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=max_retries,
+            pool_block=pool_block,
+        )
+
+    def _instrument(self, manager):
+        manager.pool_classes_by_scheme = dict(
+            (scheme, _pool_class(cls, self.stats))
+            for scheme, cls in manager.pool_classes_by_scheme.items()
+        )
+        return manager
+
+    def init_poolmanager(self, *args, **kwargs):
+        super(WorkdayHTTPAdapter, self).init_poolmanager(*args, **kwargs)
+        self._instrument(self.poolmanager)
+
+    def proxy_manager_for(self, proxy, **proxy_kwargs):
+        new = proxy not in self.proxy_manager
+        manager = super(WorkdayHTTPAdapter, self).proxy_manager_for(proxy, **proxy_kwargs)
+        if new:
+            self._instrument(manager)
+        return manager
+
+    def send(self, request, **kwargs):
+        if self.timeout is not None:
+            kwargs["timeout"] = self.timeout
+        return super(WorkdayHTTPAdapter, self).send(request, **kwargs)
+
+    def _pool_for(self, url, proxies, verify):
+        # Use the same pool as requests would so the warm connections get reused
+        if hasattr(self, "get_connection_with_tls_context"):
+            request = Request("GET", url).prepare()
+            return self.get_connection_with_tls_context(request, verify, proxies=proxies)
+        return self.get_connection(url, proxies)
+
+    def warm(self, url, connections=1, proxies=None, verify=True):
+        """
+        Open up to ``connections`` connections to the host of ``url`` and
+        return them to the pool, so the first requests don't pay for the handshakes
+
+        :param url: A URL on the host to connect to
+        :type  url: ``str``
+
+        :param connections: Number of connections to open, at most ``pool_maxsize``
+        :type  connections: ``int``
+
+        :param proxies: (Optional) The proxies of the session
+        :type  proxies: ``dict``
+
+        :param verify: The TLS verification setting of the session
+        :type  verify: ``bool`` or ``str``
+        """
+        pool = self._pool_for(url, proxies, verify)
+        opened = []
+        try:
+            for _ in range(min(connections, self._pool_maxsize)):
+                conn = pool._get_conn()
+                opened.append(conn)
+                if pool.proxy is not None and pool.scheme == "https":
+                    pool._prepare_proxy(conn)
+                else:
+                    conn.connect()
+        finally:
+            for conn in opened:
+                pool._put_conn(conn)
@@ -0,0 +1,230 @@
+# -*- coding: utf-8 -*-
+# Licensed to Anthony Shaw (anthonyshaw@apache.org) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Profile individual web method calls in a running process.
+
+A :class:`Profiler` runs the selected calls under :mod:`cProfile` and :mod:`tracemalloc` and
+writes, for each call, a ``.prof`` file (open it with :mod:`pstats` or snakeviz) and a ``.txt``
+report to a directory, named after the API, the operation and the time of the call. The report
+attributes the time and the allocations to the transport, WS-Security signing, XML parsing and
+object construction, next to the phases measured by :mod:`workday.timing`.
+
+.. code-block:: python
+
+    with client.profile('/tmp/profiles', operations=['Get_Workers'], max_calls=3):
+        client.hcm.Get_Workers(Response_Filter={'Count': 999})
+
+Only one call is profiled at a time, calls made while another is being profiled run normally.
+Allocations made by libxml2 itself are not seen by tracemalloc.
+"""
+
+import cProfile
+import datetime
+import io
+import logging
+import os
+import pstats
+import threading
+import tracemalloc
+
+from .timing import PHASES
+
+logger = logging.getLogger(__name__)
+
+#: Components that time and allocations are attributed to, the first match of a
+#: file name or function name wins
+COMPONENTS = (
+    ("signing", ("zeep/wsse", "xmlsec", "signxml")),
+    (
+        "transport",
+        (
+            "requests/",
+            "urllib3/",
+            "http/client",
+            "socket",
+            "ssl",
+            "zeep/transports",
+            "workday/transport",
+            "workday/throttle",
+            "workday/pool",
+        ),
+    ),
+    ("parsing", ("lxml", "defusedxml", "zeep/loader", "XMLParser")),
+    (
+        "objects",
+        ("zeep/xsd", "zeep/helpers", "zeep/wsdl", "workday/raw", "workday/records"),
+    ),
+)
+
+
+def component(location):
+    """
+    The component a file or function belongs to, ``other`` if none matches
+
+    :param location: A file name, optionally followed by the function name
+    :type  location: ``str``
+
+    :rtype: ``str``
+    """
+    location = location.replace(os.sep, "/")
+    for name, patterns in COMPONENTS:
+        for pattern in patterns:
+            if pattern in location:
+                return name
+    return "other"
+
+
+class _CallProfile(object):
+    def __init__(self, profiler, api, method):
+        self.profiler = profiler
+        self.api = api
+        self.method = method
+        self.started = datetime.datetime.now()
+        self.tracing = tracemalloc.is_tracing()
+        if not self.tracing:
+            tracemalloc.start(profiler.frames)
+        self.before = tracemalloc.take_snapshot()
+        self.profile = cProfile.Profile()
+        self.profile.enable()
+
+    def finish(self, timings):
+        self.profile.disable()
+        try:
+            after = tracemalloc.take_snapshot()
+            if not self.tracing:
+                tracemalloc.stop()
+            return self.profiler._write(self, timings, after)
+        finally:
+            self.profiler._release()
+
+
+class Profiler(object):
+    """
+    Runs selected calls under cProfile and tracemalloc, see the module documentation
+    """
+
+    def __init__(self, directory, operations=None, max_calls=None, top=30, frames=1):
+        """
+        :param directory: Where to write the profiles
+        :type  directory: ``str``
+
+        :param operations: (Optional) Names of the web methods to profile, defaults to all
+        :type  operations: ``list`` of ``str``
+
+        :param max_calls: (Optional) Stop after profiling this many calls
+        :type  max_calls: ``int``
+
+        :param top: Number of functions and allocation sites in each report
+        :type  top: ``int``
+
+        :param frames: Frames of traceback tracemalloc keeps per allocation
+        :type  frames: ``int``
+        """
+        self.directory = directory
+        self.operations = set(operations) if operations else None
+        self.max_calls = max_calls
+        self.top = top
+        self.frames = frames
+        #: Paths of the reports written so far
+        self.reports = []
+        self._lock = threading.Lock()
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+    def start(self, api, method):
+        """
+        Start profiling a call if it is selected and no other call is being profiled
+
+        :rtype: An object whose ``finish(timings)`` ends the profile, or ``None``
+        """
+        if self.operations is not None and method not in self.operations:
+            return None
+        if self.max_calls is not None and len(self.reports) >= self.max_calls:
+            return None
+        if not self._lock.acquire(False):
+            logger.debug("Not profiling %s.%s, another call is being profiled", api, method)
+            return None
+        try:
+            return _CallProfile(self, api, method)
+        except Exception:
+            self._release()
+            raise
+
+    def _release(self):
+        self._lock.release()
+
+    def _write(self, call, timings, after):
+        base = os.path.join(
+            self.directory,
+            "{0}.{1}.{2}".format(
+                call.api, call.method, call.started.strftime("%Y%m%dT%H%M%S.%f")
+            ),
+        )
+        call.profile.dump_stats(base + ".prof")
+        with io.open(base + ".txt", "w", encoding="utf-8") as fo:
+            fo.write(self._report(call, timings, after))
+        self.reports.append(base + ".txt")
+        logger.info("Profile of %s.%s written to %s.txt", call.api, call.method, base)
+        return base
+
+    def _report(self, call, timings, after):
+        lines = [
+            "{0}.{1} at {2}".format(call.api, call.method, call.started.isoformat()),
+            "",
+            "Phases (wall clock):",
+        ]
+        for phase in PHASES:
+            lines.append("  {0:<12}{1:>10.4f}s".format(phase, getattr(timings, phase)))
+        lines.append("  {0:<12}{1:>10.4f}s".format("total", timings.total))
+        lines.append(
+            "  sent {0} bytes, received {1} bytes{2}".format(
+                timings.request_bytes,
+                timings.response_bytes,
+                ", failed: {0!r}".format(timings.error) if timings.error else "",
+            )
+        )
+
+        stats = pstats.Stats(call.profile, stream=io.StringIO())
+        cpu = {}
+        for (filename, _, function), stat in stats.stats.items():
+            name = component(filename + ":" + function)
+            cpu[name] = cpu.get(name, 0.0) + stat[2]
+        lines.extend(["", "CPU time by component (own time of the functions):"])
+        for name, seconds in sorted(cpu.items(), key=lambda item: -item[1]):
+            lines.append("  {0:<12}{1:>10.4f}s".format(name, seconds))
+
+        differences = after.compare_to(call.before, "filename")
+        allocated = {}
+        for difference in differences:
+            name = component(difference.traceback[0].filename)
+            size, count = allocated.get(name, (0, 0))
+            allocated[name] = (size + difference.size_diff, count + difference.count_diff)
+        lines.extend(["", "Memory still allocated after the call, by component:"])
+        for name, (size, count) in sorted(allocated.items(), key=lambda item: -item[1][0]):
+            lines.append("  {0:<12}{1:>12} bytes {2:>9} blocks".format(name, size, count))
+
+        lines.extend(["", "Top allocation sites:"])
+        for difference in after.compare_to(call.before, "lineno")[: self.top]:
+            if difference.size_diff:
+                lines.append("  {0}".format(difference))
+
+        lines.extend(["", "Top functions by cumulative time:"])
+        output = io.StringIO()
+        stats.stream = output
+        stats.sort_stats("cumulative").print_stats(self.top)
+        lines.append(output.getvalue())
+        return u"\n".join(lines)
@@ -0,0 +1,393 @@
+# -*- coding: utf-8 -*-
+# Licensed to Anthony Shaw (anthonyshaw@apache.org) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Lightweight response modes that skip zeep's typed deserialization.
+
+``dict`` mode converts the reply straight from the XML into plain dicts and lists:
+
+* Elements without children or attributes become their text (always a ``str``)
+* Attributes are keys of the element's dict, the text of an element with attributes
+  is stored under ``_value_1`` like zeep does
+* Elements that occur more than once become lists, the records in ``Response_Data``
+  are always lists
+
+``xml`` mode leaves ``Response_Data`` as an :class:`lxml.etree._Element`.
+
+``slots`` mode converts the records in ``Response_Data`` to compact classes generated from
+the WSDL types, see :mod:`workday.records`.
+
+In all these modes ``Response_Results`` is a dict, so the paging properties of
+:class:`workday.soap.WorkdayResponse` keep working.
+"""
+
+import contextlib
+
+import requests
+from lxml import etree
+
+import zeep.exceptions
+
+from . import timing
+from .exceptions import WorkdaySoapApiError
+
+RESPONSE_MODES = ("zeep", "dict", "xml", "slots")
+
+_SOAP_ENV = "http://schemas.xmlsoap.org/soap/envelope/"
+_BODY = "{%s}Body" % _SOAP_ENV
+_FAULT = "{%s}Fault" % _SOAP_ENV
+
+_parser = etree.XMLParser(huge_tree=True, resolve_entities=False, remove_blank_text=True)
+
+
+def _localname(tag):
+    return tag.rsplit("}", 1)[-1]
+
+
+def element_to_dict(element):
+    """
+    Convert an element to plain Python values, see the module documentation
+
+    :param element: The element to convert
+    :type  element: :class:`lxml.etree._Element`
+    """
+    children = len(element)
+    attrib = element.attrib
+    if not children and not attrib:
+        return element.text
+    result = {}
+    for key, value in attrib.items():
+        result[_localname(key)] = value
+    if not children:
+        result["_value_1"] = element.text
+        return result
+    for child in element:
+        if not isinstance(child.tag, str):
+            # Comments and processing instructions
+            continue
+        name = _localname(child.tag)
+        value = element_to_dict(child)
+        if name in result:
+            existing = result[name]
+            if isinstance(existing, list):
+                existing.append(value)
+            else:
+                result[name] = [existing, value]
+        else:
+            result[name] = value
+    return result
+
+
+def _records(element):
+    data = {}
+    for child in element:
+        if isinstance(child.tag, str):
+            data.setdefault(_localname(child.tag), []).append(element_to_dict(child))
+    return data
+
+
+def _fault(element):
+    return zeep.exceptions.Fault(
+        message=element.findtext("faultstring"),
+        code=element.findtext("faultcode"),
+        detail=element.find("detail"),
+    )
+
+
+_MISSING = object()
+
+
+@contextlib.contextmanager
+def raw_responses(client):
+    """
+    Make the calls of this thread inside the ``with`` block return the HTTP reply.
+    Unlike ``client.settings(raw_response=True)``, the setting is restored when a call raises.
+
+    :param client: The zeep client
+    :type  client: :class:`zeep.Client`
+    """
+    # The settings of each thread are kept in zeep's thread-local
+    local = client.settings._tls
+    previous = getattr(local, "raw_response", _MISSING)
+    local.raw_response = True
+    try:
+        yield
+    finally:
+        if previous is _MISSING:
+            del local.raw_response
+        else:
+            local.raw_response = previous
+
+
+def _response_data_element(client, operation):
+    output = client.service._binding.get(operation).output.body
+    return dict(output.type.elements)["Response_Data"]
+
+
+def parse_reply(client, response, mode, operation=None, records=None):
+    """
+    Convert the HTTP reply to a SOAP call into the ``dict``, ``xml`` or ``slots`` response mode
+
+    :param client: The zeep client that made the call
+    :type  client: :class:`zeep.Client`
+
+    :param response: The HTTP reply
+    :type  response: :class:`requests.Response`
+
+    :param mode: ``dict``, ``xml`` or ``slots``
+    :type  mode: ``str``
+
+    :param operation: (Optional) The name of the web method, required for ``slots``
+    :type  operation: ``str``
+
+    :param records: (Optional) The record factory, required for ``slots``
+    :type  records: :class:`workday.records.RecordFactory`
+
+    :rtype: ``dict``
+    """
+    _check_status(response)
+    document = _document(response.content, response.status_code)
+    if client.wsse:
+        for wsse in client.wsse if isinstance(client.wsse, list) else [client.wsse]:
+            wsse.verify(document)
+    reply = _reply(document, response.status_code)
+    timing.mark("parse")
+    if reply.tag == _FAULT:
+        raise WorkdaySoapApiError(_fault(reply))
+    result = _result(reply, mode, client, operation, records)
+    timing.mark("build")
+    return result
+
+
+def _check_status(response):
+    if response.status_code not in (200, 500) or not response.content:
+        raise zeep.exceptions.TransportError(
+            u"Server returned HTTP status %d" % response.status_code,
+            status_code=response.status_code,
+            content=response.content,
+        )
+
+
+def _document(content, status_code):
+    try:
+        return etree.fromstring(content, parser=_parser)
+    except etree.XMLSyntaxError as exc:
+        raise zeep.exceptions.TransportError(
+            "Server returned response (%s) with invalid XML: %s" % (status_code, exc),
+            status_code=status_code,
+            content=content,
+        )
+
+
+def _reply(document, status_code):
+    body = document.find(_BODY)
+    if body is None or not len(body):
+        raise zeep.exceptions.TransportError(
+            "Server returned a reply without a SOAP body", status_code=status_code
+        )
+    return body[0]
+
+
+def _result(reply, mode, client=None, operation=None, records=None):
+    result = {
+        "Request_References": None,
+        "Response_Filter": None,
+        "Response_Results": None,
+        "Response_Data": None,
+    }
+    for child in reply:
+        if not isinstance(child.tag, str):
+            continue
+        name = _localname(child.tag)
+        if name == "Response_Data":
+            if mode == "xml":
+                result[name] = child
+            elif mode == "slots":
+                result[name] = records.records(
+                    child, _response_data_element(client, operation)
+                )
+            else:
+                result[name] = _records(child)
+        else:
+            result[name] = element_to_dict(child)
+    return result
+
+
+def _parse_in_process(content, status_code):
+    # Runs in a worker process. lxml elements can't be pickled, so a fault is
+    # sent back as XML and raised by the caller
+    reply = _reply(_document(content, status_code), status_code)
+    if reply.tag == _FAULT:
+        return None, etree.tostring(reply)
+    return _result(reply, "dict"), None
+
+
+def _verifies_replies(client):
+    from zeep.wsse.username import UsernameToken
+
+    wsse = client.wsse if isinstance(client.wsse, list) else [client.wsse]
+    return any(w is not None and not isinstance(w, UsernameToken) for w in wsse)
+
+
+def parse_reply_in_executor(client, response, executor):
+    """
+    Like :func:`parse_reply` in the ``dict`` mode, but parse the reply in a worker
+    process of ``executor`` so parsing large pages doesn't hold the GIL of this process.
+    Replies that must be verified, e.g. signed with WS-Security, are parsed here.
+
+    :param client: The zeep client that made the call
+    :type  client: :class:`zeep.Client`
+
+    :param response: The HTTP reply
+    :type  response: :class:`requests.Response`
+
+    :param executor: The pool of worker processes
+    :type  executor: :class:`concurrent.futures.ProcessPoolExecutor`
+
+    :rtype: ``dict``
+    """
+    if _verifies_replies(client):
+        return parse_reply(client, response, "dict")
+    _check_status(response)
+    result, fault = executor.submit(
+        _parse_in_process, response.content, response.status_code
+    ).result()
+    # Parsed and built in one go in the worker process
+    timing.mark("parse")
+    if fault is not None:
+        raise WorkdaySoapApiError(_fault(etree.fromstring(fault)))
+    return result
+
+
+def _parse_raw(service, method, response):
+    if service.executor is not None and service.mode == "dict":
+        return parse_reply_in_executor(service.client, response, service.executor)
+    return parse_reply(
+        service.client, response, service.mode, operation=method, records=service.records
+    )
+
+
+class RawService(object):
+    """
+    Wraps a :class:`zeep.proxy.ServiceProxy` so that its methods return
+    the ``dict``, ``xml`` or ``slots`` response mode
+    """
+
+    def __init__(self, client, mode, records=None, executor=None):
+        """
+        :param client: The zeep client
+        :type  client: :class:`zeep.Client`
+
+        :param mode: ``dict``, ``xml`` or ``slots``
+        :type  mode: ``str``
+
+        :param records: (Optional) The record factory for the ``slots`` mode
+        :type  records: :class:`workday.records.RecordFactory`
+
+        :param executor: (Optional) Process pool to parse ``dict`` mode replies in,
+            see :func:`parse_reply_in_executor`
+        :type  executor: :class:`concurrent.futures.ProcessPoolExecutor`
+        """
+        self.client = client
+        self.mode = mode
+        self.records = records
+        self.executor = executor
+
+    def _parse(self, method, response):
+        return _parse_raw(self, method, response)
+
+    def __getattr__(self, method):
+        operation = getattr(self.client.service, method)
+
+        def call_raw(*args, **kwargs):
+            with raw_responses(self.client):
+                response = operation(*args, **kwargs)
+            return self._parse(method, response)
+
+        return call_raw
+
+
+def _cached_reply(content):
+    response = requests.Response()
+    response._content = content
+    response.status_code = 200
+    return response
+
+
+class CachedService(object):
+    """
+    Wraps a :class:`zeep.proxy.ServiceProxy` so that replies to read operations
+    are answered from a :class:`workday.cache.ResponseCache`
+    """
+
+    def __init__(self, name, client, mode, cache, records=None, executor=None):
+        """
+        :param name: The name of the API
+        :type  name: ``str``
+
+        :param client: The zeep client
+        :type  client: :class:`zeep.Client`
+
+        :param mode: The response mode
+        :type  mode: ``str``
+
+        :param cache: The cache of replies
+        :type  cache: :class:`workday.cache.ResponseCache`
+
+        :param records: (Optional) The record factory for the ``slots`` mode
+        :type  records: :class:`workday.records.RecordFactory`
+
+        :param executor: (Optional) Process pool to parse ``dict`` mode replies in
+        :type  executor: :class:`concurrent.futures.ProcessPoolExecutor`
+        """
+        self.name = name
+        self.client = client
+        self.mode = mode
+        self.cache = cache
+        self.records = records
+        self.executor = executor
+
+    def _parse(self, method, response):
+        if self.mode == "zeep":
+            binding = self.client.service._binding
+            return binding.process_reply(self.client, binding.get(method), response)
+        return _parse_raw(self, method, response)
+
+    def __getattr__(self, method):
+        service = self.client.service
+        if not self.cache.cacheable(method):
+            if self.mode != "zeep":
+                service = RawService(
+                    self.client, self.mode, records=self.records, executor=self.executor
+                )
+            return getattr(service, method)
+
+        def call_cached(*args, **kwargs):
+            key = self.cache.key(
+                self.name, service._binding_options["address"], method, args, kwargs
+            )
+            content = self.cache.get(key, method)
+            if content is not None:
+                return self._parse(method, _cached_reply(content))
+            with raw_responses(self.client):
+                response = getattr(service, method)(*args, **kwargs)
+            # Faults raise here, so only successful replies are stored
+            result = self._parse(method, response)
+            if response.status_code == 200:
+                self.cache.add(key, response.content)
+            return result
+
+        return call_cached
@@ -0,0 +1,252 @@
+# -*- coding: utf-8 -*-
+# Licensed to Anthony Shaw (anthonyshaw@apache.org) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Compact records for the ``slots`` response mode.
+
+Each complex type of the WSDL gets a generated class with ``__slots__`` for its elements
+and attributes, so a record has no per-instance ``__dict__``. Classes are generated the
+first time a type is seen in a reply and reused afterwards.
+
+* Fields that hold simple values are strings, as in the ``dict`` mode
+* Attribute values and short strings are interned, so the reference type IDs
+  (``WID``, ``Language_ID`` and so on) repeated in every record are stored once
+* Repeated elements are lists, an absent repeated element is an empty tuple
+  and any other absent element is ``None``
+* Elements that are not in the schema are ignored
+"""
+
+import re
+
+import six
+from six.moves import intern
+
+import zeep.xsd
+
+# Strings longer than this are unlikely to repeat, e.g. descriptions and WIDs
+INTERN_MAX_LENGTH = 32
+
+_NOT_IDENTIFIER = re.compile(r"\W")
+
+
+def _localname(tag):
+    return tag.rsplit("}", 1)[-1]
+
+
+def _slot_name(name):
+    name = _NOT_IDENTIFIER.sub("_", name)
+    if name[0].isdigit():
+        name = "_" + name
+    return name
+
+
+def _intern(value):
+    if value is not None and len(value) <= INTERN_MAX_LENGTH and isinstance(value, str):
+        return intern(value)
+    return value
+
+
+class Record(object):
+    """
+    Base class of the generated record classes.
+    Fields can be read as attributes or by key, like zeep objects.
+    """
+
+    __slots__ = ()
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key)
+
+    def __contains__(self, key):
+        return key in self.__slots__
+
+    def __eq__(self, other):
+        return type(self) is type(other) and all(
+            getattr(self, slot) == getattr(other, slot) for slot in self.__slots__
+        )
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+    def __repr__(self):
+        return "{0}({1})".format(
+            type(self).__name__,
+            ", ".join(
+                "{0}={1!r}".format(slot, getattr(self, slot))
+                for slot in self.__slots__
+                if getattr(self, slot) not in (None, ())
+            ),
+        )
+
+    def as_dict(self):
+        """
+        Convert the record and its nested records to dicts and lists
+
+        :rtype: ``dict``
+        """
+        return dict((slot, _as_dict(getattr(self, slot))) for slot in self.__slots__)
+
+
+def _as_dict(value):
+    if isinstance(value, Record):
+        return value.as_dict()
+    if isinstance(value, (list, tuple)):
+        return [_as_dict(item) for item in value]
+    return value
+
+
+class _Field(object):
+    __slots__ = ("slot", "xsd_type", "repeated")
+
+    def __init__(self, slot, xsd_type, repeated):
+        self.slot = slot
+        self.xsd_type = xsd_type
+        self.repeated = repeated
+
+
+class RecordFactory(object):
+    """
+    Generates a record class per WSDL type and converts reply elements to records.
+    One factory is shared by all the calls of a :class:`workday.soap.BaseSoapApiClient`.
+    """
+
+    def __init__(self):
+        # xsd type -> (record class, defaults, {element name: field}, {attribute name: slot})
+        self._types = {}
+
+    def record_class(self, xsd_type):
+        """
+        Get the record class for a complex type of the WSDL
+
+        :param xsd_type: The type
+        :type  xsd_type: :class:`zeep.xsd.ComplexType`
+
+        :rtype: ``type``
+        """
+        return self._type_info(xsd_type)[0]
+
+    def _type_info(self, xsd_type):
+        info = self._types.get(xsd_type)
+        if info is not None:
+            return info
+
+        fields = {}
+        attributes = {}
+        slots = []
+        for name, element in xsd_type.elements:
+            slot = _slot_name(name)
+            child_type = element.type
+            if not isinstance(child_type, zeep.xsd.ComplexType):
+                child_type = None
+            repeated = getattr(element, "max_occurs", 1) != 1
+            fields[name] = _Field(slot, child_type, repeated)
+            slots.append(slot)
+        for name, attribute in xsd_type.attributes:
+            if not name or name in fields:
+                continue
+            slot = _slot_name(name)
+            attributes[name] = slot
+            slots.append(slot)
+
+        defaults = tuple(
+            (field.slot, () if field.repeated else None) for field in fields.values()
+        ) + tuple((slot, None) for slot in attributes.values())
+        class_name = _slot_name(xsd_type.name or "Record")
+        if six.PY2:
+            class_name = class_name.encode("ascii", "replace")
+        cls = type(class_name, (Record,), {"__slots__": tuple(slots)})
+        info = (cls, defaults, fields, attributes)
+        self._types[xsd_type] = info
+        return info
+
+    def convert(self, element, xsd_type):
+        """
+        Convert an element of the reply to a record
+
+        :param element: The element to convert
+        :type  element: :class:`lxml.etree._Element`
+
+        :param xsd_type: The type of the element
+        :type  xsd_type: :class:`zeep.xsd.ComplexType`
+
+        :rtype: :class:`Record`
+        """
+        cls, defaults, fields, attributes = self._type_info(xsd_type)
+        record = cls.__new__(cls)
+        for slot, default in defaults:
+            setattr(record, slot, default)
+
+        for key, value in element.attrib.items():
+            slot = attributes.get(_localname(key))
+            if slot is not None:
+                setattr(record, slot, _intern(value))
+
+        if not len(element):
+            # Simple content with attributes, zeep calls the value _value_1
+            field = fields.get("_value_1")
+            if field is not None:
+                setattr(record, field.slot, _intern(element.text))
+            return record
+
+        for child in element:
+            if not isinstance(child.tag, str):
+                continue
+            field = fields.get(_localname(child.tag))
+            if field is None:
+                continue
+            if field.xsd_type is None:
+                value = _intern(child.text)
+            else:
+                value = self.convert(child, field.xsd_type)
+            if field.repeated:
+                values = getattr(record, field.slot)
+                if not isinstance(values, list):
+                    values = []
+                    setattr(record, field.slot, values)
+                values.append(value)
+            else:
+                setattr(record, field.slot, value)
+        return record
+
+    def records(self, response_data, xsd_element):
+        """
+        Convert the ``Response_Data`` element of a reply
+
+        :param response_data: The ``Response_Data`` element
+        :type  response_data: :class:`lxml.etree._Element`
+
+        :param xsd_element: The schema element of ``Response_Data``
+        :type  xsd_element: :class:`zeep.xsd.Element`
+
+        :return: The records, by element name
+        :rtype: ``dict`` of ``list``
+        """
+        fields = self._type_info(xsd_element.type)[2]
+        data = {}
+        for child in response_data:
+            if not isinstance(child.tag, str):
+                continue
+            name = _localname(child.tag)
+            field = fields.get(name)
+            if field is None or field.xsd_type is None:
+                continue
+            data.setdefault(name, []).append(self.convert(child, field.xsd_type))
+        return data
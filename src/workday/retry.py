@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+# Licensed to Anthony Shaw (anthonyshaw@apache.org) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""
+Retries with jittered exponential backoff, shared by :mod:`workday.bulk`,
+:mod:`workday.checkpoint` and :mod:`workday.throttle`.
+"""
+
+import random
+import time
+
+import requests
+
+import zeep.exceptions
+
+#: Errors in transit, the request can be sent again
+TRANSIENT_ERRORS = (requests.RequestException, zeep.exceptions.TransportError)
+
+
+def backoff_delay(attempt, backoff, max_backoff):
+    """
+    Seconds to wait before resending a request that failed ``attempt + 1`` times
+
+    :param attempt: Retries made so far
+    :type  attempt: ``int``
+
+    :param backoff: Seconds to wait before the first retry, doubled for each further retry
+    :type  backoff: ``float``
+
+    :param max_backoff: Longest wait in seconds
+    :type  max_backoff: ``float``
+
+    :rtype: ``float``
+    """
+    delay = min(max_backoff, backoff * 2 ** attempt)
+    # Jitter so requests that failed together don't retry in lockstep
+    return delay * random.uniform(0.5, 1.0)
+
+
+def call_with_retries(
+    func, retryable, max_retries=3, backoff=1.0, max_backoff=30.0, on_retry=None
+):
+    """
+    Call ``func`` and call it again when it raises an error ``retryable`` accepts,
+    the last error is raised once ``max_retries`` retries have failed
+
+    :param func: Sends the request
+    :type  func: ``callable``
+
+    :param retryable: Whether an exception raised by ``func`` is worth retrying
+    :type  retryable: ``callable``
+
+    :param max_retries: Times to call ``func`` again
+    :type  max_retries: ``int``
+
+    :param backoff: Seconds to wait before the first retry, doubled for each further retry
+    :type  backoff: ``float``
+
+    :param max_backoff: Longest wait between retries in seconds
+    :type  max_backoff: ``float``
+
+    :param on_retry: (Optional) Called with the exception and the delay before each retry
+    :type  on_retry: ``callable``
+
+    :return: What ``func`` returned
+    """
+    attempt = 0
+    while True:
+        try:
+            return func()
+        except Exception as exc:
+            if attempt >= max_retries or not retryable(exc):
+                raise
+            delay = backoff_delay(attempt, backoff, max_backoff)
+            if on_retry is not None:
+                on_retry(exc, delay)
+            time.sleep(delay)
+            attempt += 1
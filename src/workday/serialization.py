@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+# Licensed to Anthony Shaw (anthonyshaw@apache.org) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""
+Helpers to write values returned by the web methods as JSON.
+"""
+
+import datetime
+
+import six
+
+
+def json_default(value):
+    """
+    Encode values the JSON encoder doesn't support, use it as ``default`` of
+    :func:`json.dumps` or ``orjson.dumps``
+
+    :param value: A value of a zeep object, e.g. a :class:`decimal.Decimal` or a date
+    :rtype: ``str``
+    """
+    if isinstance(value, (datetime.date, datetime.time)):
+        # zeep sends ISO strings for xsd date and time fields as they are
+        return value.isoformat()
+    return six.text_type(value)
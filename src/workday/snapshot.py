@@ -0,0 +1,303 @@
+# -*- coding: utf-8 -*-
+# Licensed to Anthony Shaw (anthonyshaw@apache.org) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Precompiled snapshots of parsed WSDL documents.
+
+Building the zeep type and operation model for a large Workday WSDL is far slower than
+reading it back from a pickle. A snapshot is only ever loaded for the same WSDL URL,
+snapshot format and zeep version it was compiled with, and while the WSDL still has the
+same content, otherwise the WSDL is parsed again. The snapshot keeps the ETag and
+Last-Modified headers the WSDL was served with, so checking the content is a conditional
+GET that doesn't download an unchanged WSDL. Without these headers the WSDL is downloaded
+and compared with the SHA-256 kept in the snapshot. With a :class:`workday.cache.WsdlCache`
+the cache revalidates the WSDL.
+
+Snapshots are pickles, only load snapshot files that you created yourself.
+"""
+
+import hashlib
+import io
+import logging
+import os
+import pickle
+import sys
+
+from six.moves.urllib.parse import urlparse
+
+import requests
+from lxml import etree
+
+import zeep
+import zeep.exceptions
+import zeep.settings
+import zeep.transports
+from zeep.loader import is_relative_path
+from zeep.wsdl import Document
+
+from .cache import _atomic_write
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FORMAT = 2
+
+# Classes zeep generates at runtime, these are rebuilt from their name, bases and attributes
+_DYNAMIC_MODULES = ("zeep.xsd.dynamic_types", "zeep.objects")
+
+
+def _digest(content):
+    return hashlib.sha256(content).hexdigest()
+
+
+def _fetch_wsdl(wsdl_url, transport, etag=None, last_modified=None):
+    """
+    Download the WSDL, only if it has changed when given the validators it was served with
+
+    :return: ``(content, validators)``, the content is ``None`` when the WSDL is unchanged
+    """
+    if transport.cache is not None or urlparse(wsdl_url).scheme not in ("http", "https"):
+        # Files are read locally and cached documents are revalidated by the cache
+        return transport.load(wsdl_url), {}
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    response = transport.session.get(
+        wsdl_url, timeout=transport.load_timeout, headers=headers
+    )
+    if response.status_code == 304 and headers:
+        return None, {"etag": etag, "last_modified": last_modified}
+    response.raise_for_status()
+    validators = {
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+    }
+    return response.content, validators
+
+
+def _rebuild_type(name, bases, attrs):
+    return type(name, bases, attrs)
+
+
+class _SnapshotPickler(pickle.Pickler):
+    def persistent_id(self, obj):
+        # The transport and settings belong to the process, not to the snapshot
+        if isinstance(obj, zeep.transports.Transport):
+            return "transport"
+        if isinstance(obj, zeep.settings.Settings):
+            return "settings"
+        return None
+
+    def reducer_override(self, obj):
+        if isinstance(obj, type) and obj.__module__ in _DYNAMIC_MODULES:
+            attrs = dict(
+                (key, value)
+                for key, value in vars(obj).items()
+                if key not in ("__dict__", "__weakref__")
+            )
+            return _rebuild_type, (obj.__name__, obj.__bases__, attrs)
+        if isinstance(obj, etree.QName):
+            return etree.QName, (obj.text,)
+        if isinstance(obj, etree._Element):
+            return etree.fromstring, (etree.tostring(obj),)
+        return NotImplemented
+
+
+class _SnapshotUnpickler(pickle.Unpickler):
+    def __init__(self, fo, transport, settings):
+        pickle.Unpickler.__init__(self, fo)
+        self._persistent = {"transport": transport, "settings": settings}
+
+    def persistent_load(self, pid):
+        return self._persistent[pid]
+
+
+class SnapshotClient(zeep.Client):
+    """
+    A :class:`zeep.Client` built from an already parsed WSDL document
+    """
+
+    def __init__(self, document, wsse=None, transport=None, plugins=None, settings=None):
+        """
+        :param document: The parsed WSDL document
+        :type  document: :class:`zeep.wsdl.Document`
+        """
+        self.settings = settings or document.settings
+        self.transport = transport if transport is not None else document.transport
+        self.wsdl = document
+        self.wsse = wsse
+        self.plugins = plugins if plugins is not None else []
+
+        self._default_service = None
+        self._default_service_name = None
+        self._default_port_name = None
+        self._default_soapheaders = None
+
+
+def _check_supported():
+    if sys.version_info < (3, 8):
+        raise RuntimeError("WSDL snapshots require Python 3.8 or newer")
+
+
+def save_snapshot(document, path, digest=None, etag=None, last_modified=None):
+    """
+    Save a parsed WSDL document to ``path``
+
+    :param document: The parsed WSDL document
+    :type  document: :class:`zeep.wsdl.Document`
+
+    :param path: The file to write the snapshot to
+    :type  path: ``str``
+
+    :param digest: (Optional) SHA-256 of the WSDL the document was parsed from, defaults
+        to downloading the WSDL again with the document's transport
+    :type  digest: ``str``
+
+    :param etag: (Optional) ETag header the WSDL was served with
+    :type  etag: ``str``
+
+    :param last_modified: (Optional) Last-Modified header the WSDL was served with
+    :type  last_modified: ``str``
+    """
+    _check_supported()
+    if digest is None:
+        content, validators = _fetch_wsdl(document.location, document.transport)
+        digest = _digest(content)
+        etag = validators.get("etag")
+        last_modified = validators.get("last_modified")
+    # Deeply nested Workday schemas exceed the default recursion limit
+    limit = sys.getrecursionlimit()
+    sys.setrecursionlimit(max(limit, 100000))
+    try:
+        buf = io.BytesIO()
+        pickler = _SnapshotPickler(buf, protocol=pickle.HIGHEST_PROTOCOL)
+        pickler.dump(
+            {
+                "format": SNAPSHOT_FORMAT,
+                "zeep": zeep.__version__,
+                "wsdl": document.location,
+                "digest": digest,
+                "etag": etag,
+                "last_modified": last_modified,
+            }
+        )
+        pickler.dump(document)
+    finally:
+        sys.setrecursionlimit(limit)
+    directory = os.path.dirname(os.path.abspath(path))
+    if not os.path.isdir(directory):
+        os.makedirs(directory)
+    _atomic_write(path, buf.getvalue())
+    logger.debug("Saved snapshot of %s to %s", document.location, path)
+
+
+def load_snapshot(path, wsdl_url, transport, settings=None):
+    """
+    Load a parsed WSDL document from ``path``
+
+    :param path: The snapshot file
+    :type  path: ``str``
+
+    :param wsdl_url: The WSDL the snapshot must have been compiled from
+    :type  wsdl_url: ``str``
+
+    :param transport: The transport the document will use
+    :type  transport: :class:`zeep.transports.Transport`
+
+    :param settings: (Optional) zeep settings for the document
+    :type  settings: :class:`zeep.settings.Settings`
+
+    :return: The document, or ``None`` if there is no usable snapshot
+    :rtype: :class:`zeep.wsdl.Document`
+    """
+    _check_supported()
+    if not os.path.exists(path):
+        return None
+    settings = settings or zeep.settings.Settings()
+    if is_relative_path(wsdl_url):
+        wsdl_url = os.path.abspath(wsdl_url)
+    limit = sys.getrecursionlimit()
+    sys.setrecursionlimit(max(limit, 100000))
+    try:
+        with io.open(path, "rb") as fo:
+            unpickler = _SnapshotUnpickler(fo, transport, settings)
+            header = unpickler.load()
+            digest = header.pop("digest", None)
+            validators = {
+                "etag": header.pop("etag", None),
+                "last_modified": header.pop("last_modified", None),
+            }
+            if header != {
+                "format": SNAPSHOT_FORMAT,
+                "zeep": zeep.__version__,
+                "wsdl": wsdl_url,
+            }:
+                logger.debug("Snapshot %s is stale, ignoring it", path)
+                return None
+            if not _same_wsdl(wsdl_url, transport, digest, validators):
+                logger.info("The WSDL of snapshot %s has changed, ignoring it", path)
+                return None
+            return unpickler.load()
+    except (pickle.UnpicklingError, EOFError, AttributeError, ImportError) as e:
+        logger.warning("Could not load snapshot %s: %s", path, e)
+        return None
+    finally:
+        sys.setrecursionlimit(limit)
+
+
+def _same_wsdl(wsdl_url, transport, digest, validators):
+    try:
+        content, _ = _fetch_wsdl(wsdl_url, transport, **validators)
+        # Not modified since the snapshot was compiled, or the same content
+        return content is None or _digest(content) == digest
+    except (IOError, OSError, requests.RequestException, zeep.exceptions.TransportError) as e:
+        # Can't tell, the snapshot is better than nothing
+        logger.warning("Could not check the WSDL %s: %s", wsdl_url, e)
+        return True
+
+
+def compile_snapshot(wsdl_url, path, transport=None, settings=None):
+    """
+    Parse a WSDL and save it as a snapshot for :class:`workday.soap.BaseSoapApiClient` to load
+
+    :param wsdl_url: The WSDL to compile
+    :type  wsdl_url: ``str``
+
+    :param path: The file to write the snapshot to
+    :type  path: ``str``
+
+    :param transport: (Optional) The transport to download the WSDL with
+    :type  transport: :class:`zeep.transports.Transport`
+
+    :param settings: (Optional) zeep settings for the document
+    :type  settings: :class:`zeep.settings.Settings`
+
+    :rtype: :class:`zeep.wsdl.Document`
+    """
+    transport = transport if transport is not None else zeep.transports.Transport()
+    if is_relative_path(wsdl_url):
+        wsdl_url = os.path.abspath(wsdl_url)
+    # Parse the downloaded WSDL, so it is only downloaded once
+    content, validators = _fetch_wsdl(wsdl_url, transport)
+    document = Document(
+        io.BytesIO(content),
+        transport,
+        base=wsdl_url,
+        settings=settings or zeep.settings.Settings(),
+    )
+    save_snapshot(document, path, digest=_digest(content), **validators)
+    return document
@@ -14,11 +14,17 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import copy
+
+from lxml import etree
+
 import zeep
 import zeep.exceptions
-import zeep.transports
+
 
 from .exceptions import WorkdaySoapApiError
+from .timing import TimedService, TimingPlugin, take
+from .transport import WorkdayTransport
 
 
 class WorkdayResponse(object):
@@ -26,7 +32,17 @@ class WorkdayResponse(object):
     Response from the Workday API
     """
 
-    def __init__(self, response, service, method, called_args, called_kwargs):
+    def __init__(
+        self,
+        response,
+        service,
+        method,
+        called_args,
+        called_kwargs,
+        max_workers=None,
+        prefetch=None,
+        timings=None,
+    ):
         """
         :param response: The response from the API
         :type  response: ``dict``
@@ -42,14 +58,31 @@ class WorkdayResponse(object):
 
         :param called_kwargs: The keyword-arguments that were used to call the method
         :type  called_kwargs: ``dict``
+
+        :param max_workers: (Optional) Fetch the remaining pages concurrently with
+            this many threads when iterating
+        :type  max_workers: ``int``
+
+        :param prefetch: (Optional) Fetch up to this many pages ahead on a background
+            thread when iterating
+        :type  prefetch: ``int``
+
+        :param timings: (Optional) Where the time of the call that returned this page went
+        :type  timings: :class:`workday.timing.CallTimings`
         """
         self.service = service
         self.method = method
         self.called_args = called_args
         self.called_kwargs = called_kwargs
+        self.max_workers = max_workers
+        self.prefetch = prefetch
+        #: The :class:`workday.timing.CallTimings` of the call that returned this page
+        self.timings = timings
         self._response = response
 
     def __iter__(self):
+        if (self.max_workers and self.max_workers > 1) or self.prefetch:
+            return self.iter_pages()
         return self
 
     def __next__(self):
@@ -79,18 +112,176 @@ class WorkdayResponse(object):
                 method=self.method,
                 called_args=self.called_args,
                 called_kwargs=self.called_kwargs,
+                timings=take(),
             )
 
     def next(self):
         return self.__next__()
 
+    def fetch_page(self, page):
+        """
+        Fetch a single page of this result set. The call arguments are copied,
+        so this is safe to use from several threads at once.
+
+        :param page: The page number to fetch
+        :type  page: ``int``
+
+        :rtype: :class:`WorkdayResponse`
+        """
+        called_kwargs = copy.deepcopy(self.called_kwargs)
+        called_kwargs.setdefault("Response_Filter", {})["Page"] = page
+        try:
+            result = getattr(self.service, self.method)(
+                *self.called_args, **called_kwargs
+            )
+        except zeep.exceptions.Fault as fault:
+            raise WorkdaySoapApiError(fault)
+        return WorkdayResponse(
+            result,
+            service=self.service,
+            method=self.method,
+            called_args=self.called_args,
+            called_kwargs=called_kwargs,
+            max_workers=self.max_workers,
+            prefetch=self.prefetch,
+            timings=take(),
+        )
+
+    def iter_pages(self, max_workers=None, ordered=True, prefetch=None):
+        """
+        Iterate the pages after this one. Since this page already tells us the total
+        number of pages, the rest can be fetched concurrently.
+
+        :param max_workers: (Optional) Number of pages to fetch at once, defaults to the
+            client setting or fetching one page at a time
+        :type  max_workers: ``int``
+
+        :param ordered: Yield pages in page order, otherwise as soon as they arrive
+        :type  ordered: ``bool``
+
+        :param prefetch: (Optional) Fetch up to this many pages ahead on a background
+            thread while the caller processes the current page, defaults to the client setting.
+            The returned :class:`workday.concurrency.PrefetchIterator` reports how long
+            the caller and the fetcher waited for each other in its ``stats``
+        :type  prefetch: ``int``
+
+        :rtype: ``iterator`` of :class:`WorkdayResponse`
+        """
+        max_workers = max_workers or self.max_workers or 1
+        prefetch = prefetch or self.prefetch
+        pages = range(self.page + 1, self.total_pages + 1)
+        # Fetch through a copy without the data so the iterator doesn't hold on to this page
+        fetch_page = self._without_data().fetch_page
+        from .concurrency import PrefetchIterator, bounded_map
+
+        if max_workers == 1:
+            results = (fetch_page(page) for page in pages)
+        else:
+            results = bounded_map(fetch_page, pages, max_workers, ordered=ordered)
+        if prefetch:
+            return PrefetchIterator(results, prefetch)
+        return results
+
+    def iter_records(self, record_name, max_workers=None, prefetch=None):
+        """
+        Iterate the records in ``Response_Data`` of this page and all the following pages.
+        Each page is released once its records have been consumed, so memory stays
+        at about one page regardless of the size of the result set.
+
+        :param record_name: The name of the record list in ``Response_Data``, e.g. ``Certification``
+        :type  record_name: ``str``
+
+        :param max_workers: (Optional) Number of pages to fetch at once
+        :type  max_workers: ``int``
+
+        :param prefetch: (Optional) Number of pages to fetch ahead on a background thread
+        :type  prefetch: ``int``
+
+        :rtype: ``generator``
+        """
+        pages = self.iter_pages(max_workers=max_workers, prefetch=prefetch)
+        return _iter_records(self.data, pages, record_name)
+
+    def export(
+        self,
+        path,
+        record_name,
+        format=None,
+        compress=None,
+        columns=None,
+        max_workers=None,
+        prefetch=None,
+    ):
+        """
+        Write the records in ``Response_Data`` of this page and all the following pages
+        to a JSON Lines, JSON or CSV file as they arrive, see :func:`workday.export.open_sink`
+
+        .. code-block:: python
+
+            response = client.hcm.Get_Workers(Response_Filter={'Count': 999})
+            response.export('workers.jsonl.gz', 'Worker')
+
+        :param path: The file to write, ``.jsonl``, ``.ndjson``, ``.json`` or ``.csv``,
+            optionally followed by ``.gz``
+        :type  path: ``str``
+
+        :param record_name: The name of the record list in ``Response_Data``
+        :type  record_name: ``str``
+
+        :param format: (Optional) ``jsonl``, ``json`` or ``csv``, defaults to the extension
+            of ``path``
+        :type  format: ``str``
+
+        :param compress: (Optional) Write gzip, defaults to the extension of ``path``
+        :type  compress: ``bool``
+
+        :param columns: (Optional) The columns of a CSV file
+        :type  columns: ``list`` of ``str``
+
+        :param max_workers: (Optional) Number of pages to fetch at once, defaults to the
+            setting of this response
+        :type  max_workers: ``int``
+
+        :param prefetch: (Optional) Number of pages to fetch ahead on a background thread
+            while records are written, defaults to the setting of this response
+        :type  prefetch: ``int``
+
+        :return: The number of records written
+        :rtype: ``int``
+        """
+        from .export import export_records
+
+        records = self.iter_records(
+            record_name, max_workers=max_workers, prefetch=prefetch
+        )
+        return export_records(
+            records, path, format=format, compress=compress, columns=columns
+        )
+
+    def _without_data(self):
+        return type(self)(
+            None,
+            service=self.service,
+            method=self.method,
+            called_args=self.called_args,
+            called_kwargs=self.called_kwargs,
+            max_workers=self.max_workers,
+            prefetch=self.prefetch,
+        )
+
+    def _get(self, name):
+        # zeep objects support ``in`` and ``[]`` but not ``get``
+        if name in self._response:
+            return self._response[name]
+        return None
+
     @property
     def references(self):
-        return self._response.get("Request_References", None)
+        return self._get("Request_References")
 
     @property
     def filter(self):
-        return self._response.get("Response_Filter", None)
+        return self._get("Response_Filter")
 
     @property
     def total_results(self):
@@ -113,8 +304,197 @@ class WorkdayResponse(object):
         return self._response["Response_Data"]
 
 
+def _page_records(data, record_name):
+    if data is None:
+        return []
+    if isinstance(data, etree._Element):
+        return data.findall("{*}" + record_name)
+    if record_name not in data:
+        return []
+    return data[record_name] or []
+
+
+def _iter_records(first_data, pages, record_name):
+    try:
+        records = _page_records(first_data, record_name)
+        del first_data
+        for record in records:
+            yield record
+        for page in pages:
+            records = _page_records(page.data, record_name)
+            del page
+            for record in records:
+                yield record
+    finally:
+        # Stop fetching when the caller stops iterating early
+        close = getattr(pages, "close", None)
+        if close is not None:
+            close()
+
+
+class SoapMethod(object):
+    """
+    A web method of a :class:`BaseSoapApiClient`, call it to get a :class:`WorkdayResponse`
+    """
+
+    def __init__(self, api, name, response_mode=None):
+        """
+        :param api: The API this method belongs to
+        :type  api: :class:`BaseSoapApiClient`
+
+        :param name: The name of the web method
+        :type  name: ``str``
+
+        :param response_mode: (Optional) The response mode of the calls, defaults to
+            the response mode of the API
+        :type  response_mode: ``str``
+        """
+        self.api = api
+        self.name = name
+        self.response_mode = response_mode
+
+    def __call__(self, *args, **kwargs):
+        """
+        Call the web method
+
+        :rtype: :class:`WorkdayResponse`
+        """
+        if self.response_mode is None:
+            service = self.api.service
+        else:
+            service = self.api.get_service(self.response_mode)
+        try:
+            result = getattr(service, self.name)(*args, **kwargs)
+            return WorkdayResponse(
+                result,
+                service=service,
+                method=self.name,
+                called_args=args,
+                called_kwargs=kwargs,
+                max_workers=self.api.max_workers,
+                prefetch=self.api.prefetch,
+                timings=take(),
+            )
+        except zeep.exceptions.Fault as fault:
+            raise WorkdaySoapApiError(fault)
+
+    def iter_records(self, record_name, *args, **kwargs):
+        """
+        Call the web method and iterate the records of every page, one at a time.
+
+        .. code-block:: python
+
+            for certification in client.talent.Get_Certifications.iter_records('Certification'):
+                print(certification.Certification_Data)
+
+        The other arguments are passed to the web method, except for the keyword
+        arguments ``max_workers`` and ``prefetch``.
+
+        :param record_name: The name of the record list in ``Response_Data``
+        :type  record_name: ``str``
+
+        :param max_workers: (Optional) Number of pages to fetch at once, defaults to the
+            client setting
+        :type  max_workers: ``int``
+
+        :param prefetch: (Optional) Number of pages to fetch ahead on a background thread,
+            defaults to the client setting
+        :type  prefetch: ``int``
+
+        :rtype: ``generator``
+        """
+        # Keyword-only, Python 2 has no syntax for it
+        max_workers = kwargs.pop("max_workers", None)
+        prefetch = kwargs.pop("prefetch", None)
+        return self(*args, **kwargs).iter_records(
+            record_name, max_workers=max_workers, prefetch=prefetch
+        )
+
+    def stream(self, *args, **kwargs):
+        """
+        Call the web method and parse the reply while it is downloaded,
+        see :class:`workday.streaming.StreamingResponse`
+
+        .. code-block:: python
+
+            for worker in client.hcm.Get_Workers.stream().iter_records():
+                print(worker.Worker_Data)
+
+        :rtype: :class:`workday.streaming.StreamingResponse`
+        """
+        from .streaming import StreamingResponse
+
+        return StreamingResponse(self.api, self.name, args, kwargs)
+
+    def checkpointed(self, store, key=None, **options):
+        """
+        Page through the web method with a durable checkpoint after each page,
+        see :class:`workday.checkpoint.CheckpointedCall`
+
+        .. code-block:: python
+
+            store = CheckpointStore('/var/lib/exports')
+            export = client.hcm.Get_Workers.checkpointed(store, key='workers')
+            for page in export.pages(Response_Filter={'Count': 999}):
+                write(page.data)
+
+            # After a crash, continue with the next page
+            for page in export.resume():
+                write(page.data)
+
+        :param store: Where to keep the checkpoint
+        :type  store: :class:`workday.checkpoint.CheckpointStore`
+
+        :param key: (Optional) Name of the run, required to :meth:`resume` it
+        :type  key: ``str``
+
+        :rtype: :class:`workday.checkpoint.CheckpointedCall`
+        """
+        from .checkpoint import CheckpointedCall
+
+        return CheckpointedCall(self, store, key=key, **options)
+
+    def bulk(self, **options):
+        """
+        Call the web method once for each of many payloads, several at a time,
+        see :class:`workday.bulk.BulkSubmitter`
+
+        .. code-block:: python
+
+            bulk = client.staffing.Put_Location.bulk(max_workers=8)
+            for result in bulk.submit({'Location_Data': data} for data in locations):
+                if not result.ok:
+                    print(result.index, result.fault)
+            print(bulk.summary)
+
+        :rtype: :class:`workday.bulk.BulkSubmitter`
+        """
+        from .bulk import BulkSubmitter
+
+        return BulkSubmitter(self, **options)
+
+
 class BaseSoapApiClient(object):
-    def __init__(self, name, session, wsdl_url, authentication, proxy_url=None):
+    def __init__(
+        self,
+        name,
+        session,
+        wsdl_url,
+        authentication,
+        proxy_url=None,
+        wsdl_cache=None,
+        snapshot_path=None,
+        max_workers=None,
+        prefetch=None,
+        response_mode="zeep",
+        response_cache=None,
+        compress_requests=None,
+        throttle=None,
+        parse_executor=None,
+        hooks=None,
+        profiler=None,
+        lazy_schema=False,
+    ):
         """
         :param name: Name of this API
         :type  name: ``str``
@@ -130,33 +510,161 @@ class BaseSoapApiClient(object):
 
         :param proxy_url: (Optional) HTTP Proxy URL
         :type  proxy_url: ``str``
+
+        :param wsdl_cache: (Optional) Cache for the WSDL and XSD documents
+        :type  wsdl_cache: :class:`workday.cache.WsdlCache`
+
+        :param snapshot_path: (Optional) Precompiled snapshot of the WSDL, see :mod:`workday.snapshot`.
+            The snapshot is created if it is missing or was compiled from a different WSDL
+        :type  snapshot_path: ``str``
+
+        :param max_workers: (Optional) Default number of pages to fetch concurrently
+            when iterating responses
+        :type  max_workers: ``int``
+
+        :param prefetch: (Optional) Default number of pages to fetch ahead on a background
+            thread when iterating responses
+        :type  prefetch: ``int``
+
+        :param response_mode: ``zeep`` for zeep objects, ``dict`` for plain dicts and lists,
+            ``xml`` for lxml elements, see :mod:`workday.raw`, or ``slots`` for compact records
+            generated from the WSDL types, see :mod:`workday.records`
+        :type  response_mode: ``str``
+
+        :param response_cache: (Optional) Cache for the replies to ``Get_*`` operations
+        :type  response_cache: :class:`workday.cache.ResponseCache`
+
+        :param compress_requests: (Optional) Gzip compress request bodies of at least
+            this many bytes
+        :type  compress_requests: ``int``
+
+        :param throttle: (Optional) Rate and concurrency limits for the tenant
+        :type  throttle: :class:`workday.throttle.Throttle`
+
+        :param parse_executor: (Optional) Process pool to parse replies in,
+            requires the ``dict`` response mode
+        :type  parse_executor: :class:`concurrent.futures.ProcessPoolExecutor`
+
+        :param hooks: (Optional) Called with the :class:`workday.timing.CallTimings`
+            of every call, see :mod:`workday.timing`
+        :type  hooks: ``list`` of ``callable``
+
+        :param profiler: (Optional) Profiles selected calls, see :mod:`workday.profiling`
+        :type  profiler: :class:`workday.profiling.Profiler`
+
+        :param lazy_schema: Compile each operation and the types it needs on first use,
+            see :mod:`workday.lazy`
+        :type  lazy_schema: ``bool``
         """
+        from .raw import RESPONSE_MODES
+
+        if response_mode not in RESPONSE_MODES:
+            raise ValueError(
+                "response_mode must be one of {0}".format(", ".join(RESPONSE_MODES))
+            )
+        if parse_executor is not None and response_mode != "dict":
+            raise ValueError("Parsing in worker processes requires response_mode='dict'")
+        if lazy_schema and snapshot_path:
+            raise ValueError("A lazily compiled WSDL cannot be loaded from a snapshot")
+        self.name = name
+        self.wsdl_url = wsdl_url
+        self.response_mode = response_mode
+        self.response_cache = response_cache
+        self.record_factory = None
+        if response_mode == "slots":
+            from .records import RecordFactory
+
+            self.record_factory = RecordFactory()
+        self.parse_executor = parse_executor
+        #: Called with the :class:`workday.timing.CallTimings` of every call
+        self.hooks = hooks if hooks is not None else []
+        self.profiler = profiler
+        self.max_workers = max_workers
+        self.prefetch = prefetch
         auth_kwargs = authentication.kwargs
-        self._client = zeep.Client(
-            wsdl=wsdl_url,
-            transport=zeep.transports.Transport(session=session),
-            **auth_kwargs
+        transport = WorkdayTransport(
+            session=session,
+            cache=wsdl_cache,
+            compress_requests=compress_requests,
+            throttle=throttle,
         )
+        if snapshot_path:
+            from .snapshot import SnapshotClient, compile_snapshot, load_snapshot
+
+            document = load_snapshot(snapshot_path, wsdl_url, transport)
+            if document is None:
+                document = compile_snapshot(wsdl_url, snapshot_path, transport)
+            self._client = SnapshotClient(
+                document, transport=transport, plugins=[TimingPlugin()], **auth_kwargs
+            )
+        elif lazy_schema:
+            from .lazy import LazyDocument
+            from .snapshot import SnapshotClient
+
+            self._client = SnapshotClient(
+                LazyDocument(wsdl_url, transport),
+                transport=transport,
+                plugins=[TimingPlugin()],
+                **auth_kwargs
+            )
+        else:
+            self._client = zeep.Client(
+                wsdl=wsdl_url,
+                transport=transport,
+                plugins=[TimingPlugin()],
+                **auth_kwargs
+            )
+
+    @property
+    def service(self):
+        """
+        The service that web methods are called on, in the configured response mode
+        """
+        return self.get_service()
+
+    def get_service(self, response_mode=None):
+        """
+        The service that web methods are called on, with the hooks, profiler and
+        response cache of this API
+
+        :param response_mode: (Optional) One of ``zeep``, ``dict``, ``xml`` or ``slots``,
+            defaults to the configured response mode
+        :type  response_mode: ``str``
+        """
+        response_mode = response_mode or self.response_mode
+        if response_mode == "slots" and self.record_factory is None:
+            from .records import RecordFactory
+
+            self.record_factory = RecordFactory()
+        if self.response_cache is not None:
+            from .raw import CachedService
+
+            service = CachedService(
+                self.name,
+                self._client,
+                response_mode,
+                self.response_cache,
+                records=self.record_factory,
+                executor=self.parse_executor,
+            )
+        elif response_mode == "zeep":
+            service = self._client.service
+        else:
+            from .raw import RawService
+
+            service = RawService(
+                self._client,
+                response_mode,
+                records=self.record_factory,
+                executor=self.parse_executor,
+            )
+        return TimedService(service, self.name, self.hooks, profiler=self.profiler)
 
     def __getattr__(self, attr):
         """
         Wrapper around the SOAP client service methods.
         Converts responses to a :class:`WorkdayResponse` instance
 
-        :rtype: :class:`WorkdayResponse`
+        :rtype: :class:`SoapMethod`
         """
-
-        def call_soap_method(*args, **kwargs):
-            try:
-                result = getattr(self._client.service, attr)(*args, **kwargs)
-                return WorkdayResponse(
-                    result,
-                    service=self._client.service,
-                    method=attr,
-                    called_args=args,
-                    called_kwargs=kwargs,
-                )
-            except zeep.exceptions.Fault as fault:
-                raise WorkdaySoapApiError(fault)
-
-        return call_soap_method
+        return SoapMethod(self, attr)
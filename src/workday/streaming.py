@@ -0,0 +1,219 @@
+# -*- coding: utf-8 -*-
+# Licensed to Anthony Shaw (anthonyshaw@apache.org) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Incremental parsing of SOAP responses.
+
+The regular path reads the whole reply, builds an lxml tree and then a zeep object graph,
+so a page is held in memory three times. A :class:`StreamingResponse` parses the reply as
+it arrives from the socket and hands out each ``Response_Data`` record as soon as it is
+complete, clearing it once the caller moves on.
+"""
+
+import copy
+
+from lxml import etree
+
+import zeep.exceptions
+import zeep.wsdl.utils
+import zeep.wsse.signature
+
+from .exceptions import WorkdaySoapApiError
+
+_SOAP_ENV = "http://schemas.xmlsoap.org/soap/envelope/"
+_FAULT = "{%s}Fault" % _SOAP_ENV
+
+
+def _localname(tag):
+    return etree.QName(tag).localname
+
+
+def _child_elements(xsd_element):
+    return dict(xsd_element.type.elements)
+
+
+def _verifies_signature(wsse):
+    wsse = wsse if isinstance(wsse, list) else [wsse]
+    return any(isinstance(w, zeep.wsse.signature.Signature) for w in wsse)
+
+
+def _fault(element):
+    code = element.findtext("faultcode")
+    message = element.findtext("faultstring")
+    detail = element.find("detail")
+    return zeep.exceptions.Fault(message=message, code=code, detail=detail)
+
+
+class StreamingResponse(object):
+    """
+    A page of results that is parsed while it is downloaded.
+    Iterate it to get the records in ``Response_Data``.
+
+    The paging properties are available once the first record has been read.
+    """
+
+    def __init__(self, api, method, called_args, called_kwargs, parse=True):
+        """
+        :param api: The API to call
+        :type  api: :class:`workday.soap.BaseSoapApiClient`
+
+        :param method: The name of the web method to call
+        :type  method: ``str``
+
+        :param called_args: The arguments to call the method with
+        :type  called_args: ``list``
+
+        :param called_kwargs: The keyword-arguments to call the method with
+        :type  called_kwargs: ``dict``
+
+        :param parse: Build zeep objects from the records, otherwise yield the
+            :class:`lxml.etree._Element` of each record, which is cleared once the
+            next record is read
+        :type  parse: ``bool``
+        """
+        client = api._client
+        if client.wsse and _verifies_signature(client.wsse):
+            raise ValueError(
+                "Streaming responses cannot verify WS-Security signatures of replies"
+            )
+        self.api = api
+        self.method = method
+        self.called_args = called_args
+        self.called_kwargs = called_kwargs
+        self.parse = parse
+        self._results = None
+        self._records = None
+        self._pending = []
+
+    def __iter__(self):
+        if self._records is None:
+            self._records = self._read()
+        while self._pending:
+            yield self._pending.pop(0)
+        for record in self._records:
+            yield record
+
+    def _ensure_results(self):
+        if self._results is None:
+            if self._records is None:
+                self._records = self._read()
+            # Read ahead to the first record, Response_Results comes before Response_Data
+            for record in self._records:
+                self._pending.append(record)
+                break
+        if self._results is None:
+            raise ValueError("The response has no Response_Results")
+        return self._results
+
+    def _read(self):
+        client = self.api._client
+        service = client.service
+        binding = service._binding
+        envelope, http_headers = binding._create(
+            self.method,
+            self.called_args,
+            self.called_kwargs,
+            client=client,
+            options=service._binding_options,
+        )
+        response = client.transport.post_stream(
+            service._binding_options["address"],
+            zeep.wsdl.utils.etree_to_string(envelope),
+            http_headers,
+        )
+        if response.status_code not in (200, 500):
+            response.close()
+            raise zeep.exceptions.TransportError(
+                u"Server returned HTTP status %d" % response.status_code,
+                status_code=response.status_code,
+            )
+
+        schema = client.wsdl.types
+        output = binding.get(self.method).output.body
+        output_elements = _child_elements(output)
+        record_elements = _child_elements(output_elements["Response_Data"])
+
+        try:
+            # Like zeep's parser, never expand entities or load a DTD from the reply
+            for _, element in etree.iterparse(
+                response.raw,
+                events=("end",),
+                huge_tree=client.settings.xml_huge_tree,
+                resolve_entities=False,
+                load_dtd=False,
+                no_network=True,
+            ):
+                parent = element.getparent()
+                if parent is None:
+                    continue
+                if element.tag == _FAULT:
+                    raise WorkdaySoapApiError(_fault(element))
+                if _localname(parent.tag) == "Response_Data":
+                    if self.parse:
+                        xsd_element = record_elements[_localname(element.tag)]
+                        yield xsd_element.parse(element, schema)
+                    else:
+                        yield element
+                    # Drop the record and everything before it
+                    element.clear()
+                    while element.getprevious() is not None:
+                        del parent[0]
+                elif _localname(element.tag) == "Response_Results" and _localname(
+                    parent.tag
+                ) == _localname(output.qname):
+                    self._results = output_elements["Response_Results"].parse(
+                        element, schema
+                    )
+        except etree.XMLSyntaxError as exc:
+            raise zeep.exceptions.TransportError(
+                "Server returned response (%s) with invalid XML: %s"
+                % (response.status_code, exc),
+                status_code=response.status_code,
+            )
+        finally:
+            response.close()
+
+    def iter_records(self):
+        """
+        Iterate the records of this page and then stream each of the following pages
+
+        :rtype: ``generator``
+        """
+        for record in self:
+            yield record
+        for page in range(self.page + 1, self.total_pages + 1):
+            called_kwargs = copy.deepcopy(self.called_kwargs)
+            called_kwargs.setdefault("Response_Filter", {})["Page"] = page
+            for record in StreamingResponse(
+                self.api, self.method, self.called_args, called_kwargs, parse=self.parse
+            ):
+                yield record
+
+    @property
+    def total_results(self):
+        return int(self._ensure_results()["Total_Results"])
+
+    @property
+    def total_pages(self):
+        return int(self._ensure_results()["Total_Pages"])
+
+    @property
+    def page_results(self):
+        return int(self._ensure_results()["Page_Results"])
+
+    @property
+    def page(self):
+        return int(self._ensure_results()["Page"])
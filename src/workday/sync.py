@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+# Licensed to Anthony Shaw (anthonyshaw@apache.org) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Incremental synchronisation of Workday data.
+
+A :class:`DeltaSync` remembers, per API and web method, the time up to which changes have
+been fetched (the watermark). Each run asks Workday only for the records changed since then,
+using the transaction log criteria that most ``Get_*`` operations accept, and moves the
+watermark forward once every changed record has been consumed.
+"""
+
+import copy
+import datetime
+
+_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+
+def _utcnow():
+    return datetime.datetime.utcnow().replace(microsecond=0)
+
+
+def transaction_log_criteria(updated_from, updated_through):
+    """
+    ``Request_Criteria`` for the records changed between two times, using the
+    transaction log. Accepted by ``Get_Workers`` and most other ``Get_*`` operations.
+
+    :param updated_from: Start of the window, ``xsd:dateTime``
+    :type  updated_from: ``str``
+
+    :param updated_through: End of the window, ``xsd:dateTime``
+    :type  updated_through: ``str``
+
+    :rtype: ``dict``
+    """
+    return {
+        "Transaction_Log_Criteria_Data": {
+            "Transaction_Date_Range_Data": {
+                "Updated_From": updated_from,
+                "Updated_Through": updated_through,
+            }
+        }
+    }
+
+
+class DeltaSync(object):
+    """
+    Fetches the records of a web method that changed since the previous run
+
+    .. code-block:: python
+
+        store = CheckpointStore('/var/lib/workday-sync')
+        sync = DeltaSync(client, 'hcm', 'Get_Workers', 'Worker', store)
+        for worker in sync.changes(Response_Filter={'Count': 999}):
+            upsert(worker)
+    """
+
+    def __init__(
+        self,
+        client,
+        api,
+        method,
+        record_name,
+        store,
+        criteria=transaction_log_criteria,
+        overlap=60,
+        full_initial=True,
+    ):
+        """
+        :param client: The client to call
+        :type  client: :class:`workday.client.WorkdayClient`
+
+        :param api: The name of the API, e.g. ``hcm``
+        :type  api: ``str``
+
+        :param method: The name of the web method, e.g. ``Get_Workers``
+        :type  method: ``str``
+
+        :param record_name: The name of the record list in ``Response_Data``, e.g. ``Worker``
+        :type  record_name: ``str``
+
+        :param store: Where to keep the watermarks, a store can be shared by many syncs
+        :type  store: :class:`workday.checkpoint.CheckpointStore`
+
+        :param criteria: Builds the ``Request_Criteria`` for the records updated between
+            two times, for operations that filter changes differently
+        :type  criteria: ``callable``
+
+        :param overlap: Seconds to start each window before the watermark, so changes
+            committed while the previous run was reading are not missed. Records changed in
+            the overlap are fetched twice
+        :type  overlap: ``int``
+
+        :param full_initial: Fetch every record on the first run, otherwise the first run
+            only sets the watermark
+        :type  full_initial: ``bool``
+        """
+        self.client = client
+        self.api = api
+        self.method = method
+        self.record_name = record_name
+        self.store = store
+        self.criteria = criteria
+        self.overlap = overlap
+        self.full_initial = full_initial
+
+    @property
+    def key(self):
+        return "watermark-{0}-{1}".format(self.api, self.method)
+
+    @property
+    def watermark(self):
+        """
+        The time up to which changes have been fetched, ``None`` before the first run
+
+        :rtype: ``str``
+        """
+        state = self.store.get(self.key)
+        return state["watermark"] if state else None
+
+    def reset(self):
+        """
+        Forget the watermark, the next run fetches every record again
+        """
+        self.store.delete(self.key)
+
+    def changes(self, *args, **kwargs):
+        """
+        Call the web method for the records changed since the watermark and iterate them.
+        The watermark moves forward once the last record has been iterated, so a run that
+        is interrupted is repeated in full by the next one.
+
+        The arguments are passed to the web method, ``Request_Criteria`` is extended
+        with the change window and ``As_Of_Entry_DateTime`` is pinned to its end.
+
+        :rtype: ``generator``
+        """
+        through = _utcnow()
+        watermark = self.watermark
+        if watermark is None and not self.full_initial:
+            self._save(through)
+            return
+        kwargs = copy.deepcopy(kwargs)
+        through_text = through.strftime(_FORMAT)
+        kwargs.setdefault("Response_Filter", {}).setdefault(
+            "As_Of_Entry_DateTime", through_text
+        )
+        if watermark is not None:
+            updated_from = datetime.datetime.strptime(
+                watermark, _FORMAT
+            ) - datetime.timedelta(seconds=self.overlap)
+            request_criteria = kwargs.setdefault("Request_Criteria", {})
+            request_criteria.update(
+                self.criteria(updated_from.strftime(_FORMAT), through_text)
+            )
+
+        method = getattr(getattr(self.client, self.api), self.method)
+        for record in method.iter_records(self.record_name, *args, **kwargs):
+            yield record
+        self._save(through)
+
+    def _save(self, through):
+        self.store.save(
+            self.key,
+            {"api": self.api, "method": self.method, "watermark": through.strftime(_FORMAT)},
+        )
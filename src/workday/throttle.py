@@ -0,0 +1,324 @@
+# -*- coding: utf-8 -*-
+# Licensed to Anthony Shaw (anthonyshaw@apache.org) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Client-side throttling so bulk and concurrent calls stay within what the tenant allows.
+
+A :class:`Throttle` combines a :class:`TokenBucket` that caps the request rate with a
+:class:`ConcurrencyGovernor` that adapts the number of requests in flight: the limit grows
+by one for every round trip's worth of successful requests and is halved when Workday
+throttles (HTTP 429 or 503, or a throttling SOAP fault) or, optionally, when latency
+exceeds a target. Throttled requests wait and are sent again instead of failing.
+"""
+
+import logging
+import threading
+import time
+
+from .retry import backoff_delay
+
+logger = logging.getLogger(__name__)
+
+_clock = getattr(time, "monotonic", time.time)
+
+#: HTTP status codes that mean the tenant is throttling
+THROTTLE_STATUS_CODES = (429, 503)
+
+#: Phrases in a SOAP fault that mean the tenant is throttling, matched case-insensitively
+THROTTLE_FAULT_PATTERNS = (
+    "throttl",
+    "too many requests",
+    "rate limit",
+    "concurrent requests",
+)
+
+
+class TokenBucket(object):
+    """
+    Allows ``rate`` requests per second on average, with bursts of up to ``burst`` requests
+    """
+
+    def __init__(self, rate, burst=None):
+        """
+        :param rate: Requests per second
+        :type  rate: ``float``
+
+        :param burst: (Optional) Size of the bucket, defaults to one second's worth of requests
+        :type  burst: ``int``
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self.burst = float(burst or max(1.0, rate))
+        self._tokens = self.burst
+        self._updated = _clock()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """
+        Take a token, waiting until one is available
+
+        :return: Seconds waited
+        :rtype: ``float``
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = _clock()
+                self._tokens = min(
+                    self.burst, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+class ConcurrencyGovernor(object):
+    """
+    Limits the requests in flight with additive increase, multiplicative decrease (AIMD)
+    """
+
+    def __init__(
+        self, initial=4, minimum=1, maximum=64, decrease=0.5, latency_target=None
+    ):
+        """
+        :param initial: Starting limit
+        :type  initial: ``int``
+
+        :param minimum: The limit never drops below this
+        :type  minimum: ``int``
+
+        :param maximum: The limit never grows beyond this
+        :type  maximum: ``int``
+
+        :param decrease: Factor the limit is multiplied by on congestion
+        :type  decrease: ``float``
+
+        :param latency_target: (Optional) Treat requests slower than this many seconds
+            as congestion
+        :type  latency_target: ``float``
+        """
+        if not 1 <= minimum <= initial <= maximum:
+            raise ValueError("expected 1 <= minimum <= initial <= maximum")
+        self.limit = float(initial)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.decrease = decrease
+        self.latency_target = latency_target
+        self.active = 0
+        self._last_decrease = None
+        self._cond = threading.Condition()
+
+    def acquire(self):
+        """
+        Wait for a free slot
+
+        :return: Seconds waited
+        :rtype: ``float``
+        """
+        start = _clock()
+        with self._cond:
+            while self.active >= int(self.limit):
+                self._cond.wait()
+            self.active += 1
+        return _clock() - start
+
+    def release(self, latency, throttled=False, failed=False):
+        """
+        Free a slot and adjust the limit
+
+        :param latency: Seconds the request took
+        :type  latency: ``float``
+
+        :param throttled: Whether the server throttled the request
+        :type  throttled: ``bool``
+
+        :param failed: Whether the request raised, e.g. on a connection error or timeout,
+            which counts as congestion
+        :type  failed: ``bool``
+        """
+        with self._cond:
+            self.active -= 1
+            now = _clock()
+            congested = throttled or failed or (
+                self.latency_target is not None and latency > self.latency_target
+            )
+            if congested:
+                # Requests in flight together see the same congestion, decrease once per round trip
+                if self._last_decrease is None or now - self._last_decrease > latency:
+                    self.limit = max(self.minimum, self.limit * self.decrease)
+                    self._last_decrease = now
+            else:
+                self.limit = min(self.maximum, self.limit + 1.0 / self.limit)
+            self._cond.notify_all()
+
+
+class ThrottleStats(object):
+    """
+    Counters of a :class:`Throttle`
+    """
+
+    def __init__(self):
+        #: Requests sent, including retries
+        self.requests = 0
+        #: Requests the server throttled
+        self.throttled = 0
+        #: Seconds requests spent queued for a token or a slot
+        self.queue_time = 0.0
+        self._lock = threading.Lock()
+
+    def _add(self, **counts):
+        with self._lock:
+            for name, value in counts.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    def __repr__(self):
+        return "<ThrottleStats requests={0} throttled={1} queue_time={2:.3f}s>".format(
+            self.requests, self.throttled, self.queue_time
+        )
+
+
+class Throttle(object):
+    """
+    Rate cap and adaptive concurrency limit for one tenant. Share one instance between
+    all the clients that call the same tenant.
+    """
+
+    def __init__(
+        self,
+        rate=None,
+        burst=None,
+        initial_concurrency=4,
+        max_concurrency=64,
+        latency_target=None,
+        max_retries=10,
+        backoff=1.0,
+        max_backoff=60.0,
+        fault_patterns=THROTTLE_FAULT_PATTERNS,
+    ):
+        """
+        :param rate: (Optional) Maximum requests per second
+        :type  rate: ``float``
+
+        :param burst: (Optional) Requests allowed in a burst above ``rate``
+        :type  burst: ``int``
+
+        :param initial_concurrency: Requests in flight allowed at first
+        :type  initial_concurrency: ``int``
+
+        :param max_concurrency: Upper bound on requests in flight
+        :type  max_concurrency: ``int``
+
+        :param latency_target: (Optional) Back off when requests take longer than this many seconds
+        :type  latency_target: ``float``
+
+        :param max_retries: Times to resend a throttled request before returning
+            the throttled reply to the caller
+        :type  max_retries: ``int``
+
+        :param backoff: Seconds to wait before the first retry, doubled for each
+            further retry. A ``Retry-After`` header takes precedence
+        :type  backoff: ``float``
+
+        :param max_backoff: Longest wait between retries in seconds
+        :type  max_backoff: ``float``
+
+        :param fault_patterns: Phrases in SOAP faults that mean the request was throttled
+        :type  fault_patterns: ``tuple`` of ``str``
+        """
+        self.bucket = TokenBucket(rate, burst) if rate else None
+        self.governor = ConcurrencyGovernor(
+            initial=initial_concurrency,
+            maximum=max_concurrency,
+            latency_target=latency_target,
+        )
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.fault_patterns = tuple(p.lower() for p in fault_patterns)
+        self.stats = ThrottleStats()
+
+    def is_throttled(self, response, stream=False):
+        """
+        Whether the server throttled the request that got ``response``
+
+        :param response: The HTTP reply
+        :type  response: :class:`requests.Response`
+
+        :param stream: The body of the reply has not been read, only the status is checked
+        :type  stream: ``bool``
+        """
+        if response.status_code in THROTTLE_STATUS_CODES:
+            return True
+        if response.status_code != 500 or stream:
+            return False
+        content = response.content.lower()
+        return any(p.encode("utf-8") in content for p in self.fault_patterns)
+
+    def _delay(self, response, attempt):
+        retry_after = response.headers.get("Retry-After")
+        if retry_after:
+            try:
+                return min(self.max_backoff, float(retry_after))
+            except ValueError:
+                pass
+        return backoff_delay(attempt, self.backoff, self.max_backoff)
+
+    def send(self, send, stream=False):
+        """
+        Send a request through the throttle, resending it while the server throttles
+
+        :param send: Sends the request and returns the reply
+        :type  send: ``callable``
+
+        :param stream: ``send`` returns replies whose body has not been read
+        :type  stream: ``bool``
+
+        :rtype: :class:`requests.Response`
+        """
+        attempt = 0
+        while True:
+            waited = self.bucket.acquire() if self.bucket else 0.0
+            waited += self.governor.acquire()
+            start = _clock()
+            throttled = False
+            failed = True
+            try:
+                response = send()
+                throttled = self.is_throttled(response, stream=stream)
+                failed = False
+            finally:
+                self.governor.release(
+                    _clock() - start, throttled=throttled, failed=failed
+                )
+                self.stats._add(
+                    requests=1, throttled=int(throttled), queue_time=waited
+                )
+            if not throttled or attempt >= self.max_retries:
+                return response
+            delay = self._delay(response, attempt)
+            logger.debug(
+                "Request throttled, retrying in %.2fs (limit %.1f)",
+                delay,
+                self.governor.limit,
+            )
+            response.close()
+            time.sleep(delay)
+            attempt += 1
@@ -0,0 +1,286 @@
+# -*- coding: utf-8 -*-
+# Licensed to Anthony Shaw (anthonyshaw@apache.org) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Where the time of each web method call goes.
+
+Every call made through a :class:`workday.soap.BaseSoapApiClient` is measured in phases and
+the :class:`CallTimings` are attached to the :class:`workday.soap.WorkdayResponse` as
+``timings`` and passed to the hooks of the API:
+
+.. code-block:: python
+
+    def log_slow_calls(timings):
+        if timings.total > 5:
+            logger.warning('%r', timings)
+
+    client = WorkdayClient(wsdls=wsdls, authentication=auth, hooks=[log_slow_calls])
+
+The phases are marked by the transport, by the response modes and by :class:`TimingPlugin`,
+a zeep plugin, on the thread that makes the call.
+"""
+
+import logging
+import threading
+import time
+
+import zeep
+
+logger = logging.getLogger(__name__)
+
+_clock = getattr(time, "perf_counter", time.time)
+
+_local = threading.local()
+
+#: The phases of a call, in order
+PHASES = ("serialize", "sign", "queue", "ttfb", "download", "parse", "build")
+
+
+class CallTimings(object):
+    """
+    Durations in seconds of the phases of one call, and the bytes sent and received
+    """
+
+    __slots__ = (
+        "api",
+        "method",
+        "serialize",
+        "sign",
+        "queue",
+        "ttfb",
+        "download",
+        "parse",
+        "build",
+        "total",
+        "request_bytes",
+        "response_bytes",
+        "attempts",
+        "error",
+        "paged",
+        "_start",
+        "_mark",
+        "_parsed",
+    )
+
+    def __init__(self, api, method):
+        #: The name of the API
+        self.api = api
+        #: The name of the web method
+        self.method = method
+        #: Building the SOAP envelope from the arguments
+        self.serialize = 0.0
+        #: Applying WS-Security to the envelope
+        self.sign = 0.0
+        #: Compressing the request and waiting for the throttle
+        self.queue = 0.0
+        #: From sending the request to receiving the response headers (time to first byte)
+        self.ttfb = 0.0
+        #: Reading the response body
+        self.download = 0.0
+        #: Parsing the XML
+        self.parse = 0.0
+        #: Converting the XML to the objects of the response mode
+        self.build = 0.0
+        #: The whole call
+        self.total = 0.0
+        #: Size of the request body as sent, after compression
+        self.request_bytes = 0
+        #: Size of the response body as received, before decompression
+        self.response_bytes = 0
+        #: HTTP requests sent, more than one when the throttle resent the request
+        self.attempts = 0
+        #: The exception the call raised, if any
+        self.error = None
+        #: The reply was a page of results, with ``Response_Results``
+        self.paged = False
+        self._start = _clock()
+        self._mark = self._start
+        self._parsed = False
+
+    def _phase(self, name):
+        # Time since the previous mark is spent in phase ``name``
+        now = _clock()
+        setattr(self, name, getattr(self, name) + now - self._mark)
+        self._mark = now
+
+    def as_dict(self):
+        """
+        :rtype: ``dict``
+        """
+        result = dict((name, getattr(self, name)) for name in PHASES)
+        result.update(
+            api=self.api,
+            method=self.method,
+            total=self.total,
+            request_bytes=self.request_bytes,
+            response_bytes=self.response_bytes,
+            attempts=self.attempts,
+            error=self.error,
+            paged=self.paged,
+        )
+        return result
+
+    def __repr__(self):
+        return "<CallTimings {0}.{1} total={2:.3f}s {3} sent={4}B received={5}B>".format(
+            self.api,
+            self.method,
+            self.total,
+            " ".join("{0}={1:.3f}s".format(name, getattr(self, name)) for name in PHASES),
+            self.request_bytes,
+            self.response_bytes,
+        )
+
+
+def current():
+    """
+    The timings of the call in progress on this thread
+
+    :rtype: :class:`CallTimings` or ``None``
+    """
+    return getattr(_local, "timings", None)
+
+
+def take():
+    """
+    The timings of the last call completed on this thread, cleared once taken
+
+    :rtype: :class:`CallTimings` or ``None``
+    """
+    timings = getattr(_local, "last", None)
+    _local.last = None
+    return timings
+
+
+def mark(phase):
+    """
+    End ``phase`` of the call in progress on this thread, if any
+    """
+    timings = getattr(_local, "timings", None)
+    if timings is not None:
+        timings._phase(phase)
+
+
+def sending(message):
+    """
+    The request body is about to be sent, after WS-Security, compression and throttling
+    """
+    timings = getattr(_local, "timings", None)
+    if timings is not None:
+        timings._phase("queue")
+        timings.attempts += 1
+        timings.request_bytes = len(message)
+
+
+def received(response, stream=False):
+    """
+    The response arrived, and unless ``stream`` its body has been read
+    """
+    timings = getattr(_local, "timings", None)
+    if timings is None:
+        return
+    now = _clock()
+    ttfb = response.elapsed.total_seconds()
+    timings.ttfb += ttfb
+    if not stream:
+        timings.download += max(0.0, now - timings._mark - ttfb)
+        try:
+            # Bytes read from the connection, before decompression
+            timings.response_bytes = response.raw.tell() or len(response.content)
+        except (AttributeError, TypeError, ValueError):
+            timings.response_bytes = len(response.content)
+    timings._mark = now
+
+
+class TimingPlugin(zeep.Plugin):
+    """
+    Marks the end of serializing the request and of parsing the reply
+    """
+
+    def egress(self, envelope, http_headers, operation, binding_options):
+        # zeep applies WS-Security after the plugins
+        mark("serialize")
+        return envelope, http_headers
+
+    def ingress(self, envelope, http_headers, operation):
+        timings = current()
+        if timings is not None:
+            timings._phase("parse")
+            timings._parsed = True
+        return envelope, http_headers
+
+
+def _paged(result):
+    try:
+        return result["Response_Results"] is not None
+    except (KeyError, TypeError, AttributeError):
+        return False
+
+
+class TimedService(object):
+    """
+    Wraps a service so that each call is measured and passed to ``hooks``
+    """
+
+    def __init__(self, service, api, hooks, profiler=None):
+        """
+        :param service: The service to call
+        :param api: The name of the API
+        :type  api: ``str``
+
+        :param hooks: Called with the :class:`CallTimings` after every call
+        :type  hooks: ``list`` of ``callable``
+
+        :param profiler: (Optional) Profiles selected calls
+        :type  profiler: :class:`workday.profiling.Profiler`
+        """
+        self.service = service
+        self.api = api
+        self.hooks = hooks
+        self.profiler = profiler
+
+    def __getattr__(self, method):
+        operation = getattr(self.service, method)
+
+        def call_timed(*args, **kwargs):
+            timings = CallTimings(self.api, method)
+            outer = getattr(_local, "timings", None)
+            _local.timings = timings
+            profile = (
+                self.profiler.start(self.api, method) if self.profiler is not None else None
+            )
+            try:
+                result = operation(*args, **kwargs)
+                if timings._parsed:
+                    # zeep mode, the objects were built after the ingress plugin
+                    timings._phase("build")
+                timings.paged = _paged(result)
+                return result
+            except Exception as exc:
+                timings.error = exc
+                raise
+            finally:
+                timings.total = _clock() - timings._start
+                if profile is not None:
+                    profile.finish(timings)
+                _local.timings = outer
+                _local.last = timings
+                for hook in self.hooks:
+                    try:
+                        hook(timings)
+                    except Exception:
+                        logger.exception("Timing hook %r failed", hook)
+
+        return call_timed
@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+# Licensed to Anthony Shaw (anthonyshaw@apache.org) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import zlib
+
+from six.moves.urllib.parse import urlparse
+
+import zeep.transports
+
+from . import timing
+from .cache import WsdlCache
+
+#: Response encodings requests can decode while streaming
+ACCEPT_ENCODING = "gzip, deflate"
+
+
+def gzip_compress(data, level=6):
+    """
+    Compress ``data`` in the gzip format
+
+    :rtype: ``bytes``
+    """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    return compressor.compress(data) + compressor.flush()
+
+
+class WorkdayTransport(zeep.transports.Transport):
+    """
+    zeep transport used by :class:`workday.soap.BaseSoapApiClient`.
+
+    When given a :class:`workday.cache.WsdlCache`, expired WSDL and XSD documents
+    are revalidated with a conditional GET so unchanged documents are not downloaded again.
+
+    Replies are always requested with gzip or deflate compression and decompressed as they
+    are read. Request bodies are gzip compressed when ``compress_requests`` is set.
+
+    SOAP requests are sent through the ``throttle``, if any.
+    """
+
+    def __init__(self, compress_requests=None, throttle=None, **kwargs):
+        """
+        :param compress_requests: (Optional) Compress request bodies of at least this many
+            bytes, e.g. large Put_* payloads. The server must accept ``Content-Encoding: gzip``
+        :type  compress_requests: ``int``
+
+        :param throttle: (Optional) Rate and concurrency limits for the tenant
+        :type  throttle: :class:`workday.throttle.Throttle`
+        """
+        super(WorkdayTransport, self).__init__(**kwargs)
+        self.compress_requests = compress_requests
+        self.throttle = throttle
+
+    def _encode(self, message, headers):
+        headers = dict(headers)
+        headers.setdefault("Accept-Encoding", ACCEPT_ENCODING)
+        if self.compress_requests is not None and len(message) >= self.compress_requests:
+            if not isinstance(message, bytes):
+                message = message.encode("utf-8")
+            message = gzip_compress(message)
+            headers["Content-Encoding"] = "gzip"
+        return message, headers
+
+    def load(self, url):
+        if not isinstance(self.cache, WsdlCache) or urlparse(url).scheme not in (
+            "http",
+            "https",
+        ):
+            return super(WorkdayTransport, self).load(url)
+
+        entry = self.cache.get_entry(url)
+        if entry is not None and not entry.is_expired(self.cache.timeout):
+            self.logger.debug("Cache HIT for %s", url)
+            return entry.content
+
+        headers = entry.validators if entry is not None else {}
+        self.logger.debug("Loading remote data from: %s", url)
+        response = self.session.get(url, timeout=self.load_timeout, headers=headers)
+        if response.status_code == 304 and entry is not None:
+            self.logger.debug("%s not modified, reusing cached copy", url)
+            self.cache.touch(url)
+            return entry.content
+        response.raise_for_status()
+
+        content = response.content
+        self.cache.add(
+            url,
+            content,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+        )
+        return content
+
+    def post(self, address, message, headers):
+        timing.mark("sign")
+        message, headers = self._encode(message, headers)
+        if self.throttle is None:
+            return self._post(address, message, headers)
+        return self.throttle.send(lambda: self._post(address, message, headers))
+
+    def _post(self, address, message, headers):
+        timing.sending(message)
+        if "Content-Encoding" not in headers:
+            response = super(WorkdayTransport, self).post(address, message, headers)
+        else:
+            # zeep would try to log the compressed body as text
+            self.logger.debug("HTTP Post to %s (%d bytes gzip)", address, len(message))
+            response = self.session.post(
+                address, data=message, headers=headers, timeout=self.operation_timeout
+            )
+        timing.received(response)
+        return response
+
+    def post_stream(self, address, message, headers):
+        """
+        POST ``message`` without reading the reply, the body is read incrementally
+        from ``response.raw``
+
+        :rtype: :class:`requests.Response`
+        """
+        timing.mark("sign")
+        message, headers = self._encode(message, headers)
+        if self.throttle is None:
+            return self._post_stream(address, message, headers)
+        return self.throttle.send(
+            lambda: self._post_stream(address, message, headers), stream=True
+        )
+
+    def _post_stream(self, address, message, headers):
+        timing.sending(message)
+        self.logger.debug("HTTP Post to %s (streaming reply)", address)
+        response = self.session.post(
+            address,
+            data=message,
+            headers=headers,
+            timeout=self.operation_timeout,
+            stream=True,
+        )
+        response.raw.decode_content = True
+        timing.received(response, stream=True)
+        return response
@@ -21,6 +21,7 @@ import pytest
 from lxml import etree
 
 import workday.auth
+from workday.soap import SoapMethod
 
 import requests.sessions
 from requests_staticmock import ClassAdapter
@@ -51,6 +52,28 @@ def test_response_dict():
     }
 
 
+class FakeApi(object):
+    """
+    Stands in for a :class:`workday.soap.BaseSoapApiClient`, its web methods are answered
+    by the methods of ``service``
+    """
+
+    max_workers = None
+    prefetch = None
+
+    def __init__(self, service, name="test"):
+        self.service = service
+        self.name = name
+
+    def __getattr__(self, method):
+        return SoapMethod(self, method)
+
+
+@pytest.fixture()
+def fake_api():
+    return FakeApi
+
+
 @pytest.fixture()
 def workday_client(test_authentication, test_wsdl, mocker):
     class MockSoapClass(BaseMockClass):
@@ -84,3 +107,37 @@ def workday_client(test_authentication, test_wsdl, mocker):
     client._session.adapters = {}
     client._session.mount("https://workday.com/", adapter)
     return client
+
+
+class TalentMockClass(BaseMockClass):
+    """
+    The v30.1 Talent API, replies with the fixture named after the requested operation
+    """
+
+    base_path = "tests/fixtures/v30_1"
+
+    def _ccx_service_testdomain_Talent_v30_1(self, request, url, method, params, headers):
+        if "?wsdl" in url:
+            with open(os.path.join(self.base_path, "talent_wsdl"), "rb") as fo:
+                return StaticResponseFactory.GoodResponse(fo.read(), request)
+        root = etree.XML(request.body)
+        body = root.find("{http://schemas.xmlsoap.org/soap/envelope/}Body")
+        operation = etree.QName(body[0]).localname[: -len("_Request")]
+        if operation in self.faults:
+            with open(os.path.join("tests/fixtures/errors", self.faults[operation]), "rb") as fo:
+                return StaticResponseFactory.GoodResponse(fo.read(), request, status_code=500)
+        with open(os.path.join(self.base_path, "talent", operation + ".xml"), "rb") as fo:
+            return StaticResponseFactory.GoodResponse(fo.read(), request)
+
+    faults = {"Get_Mentorships": "task_not_authorized"}
+
+
+@pytest.fixture()
+def talent_client(test_authentication):
+    client = workday.WorkdayClient(
+        wsdls={"talent": "https://workday.com/ccx/service/testdomain/Talent/v30.1"},
+        authentication=test_authentication,
+    )
+    client._session.adapters = {}
+    client._session.mount("https://workday.com/", ClassAdapter(TalentMockClass))
+    return client
@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+# Licensed to Anthony Shaw (anthonyshaw@apache.org) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import os
+
+import pytest
+import requests
+from requests_staticmock import ClassAdapter
+from requests_staticmock.abstractions import BaseMockClass
+from requests_staticmock.responses import StaticResponseFactory
+
+pytest.importorskip("aiohttp")
+
+import workday.exceptions  # noqa: E402
+from workday.aio import (  # noqa: E402
+    AsyncWorkdayClient,
+    AsyncWorkdayResponse,
+    async_bounded_map,
+)
+
+
+def run(coro):
+    return asyncio.new_event_loop().run_until_complete(coro)
+
+
+class WsdlMockClass(BaseMockClass):
+    def _api_v30(self, request, url, method, params, headers):
+        with open("tests/fixtures/v30_1/test_wsdl", "rb") as fo:
+            return StaticResponseFactory.GoodResponse(fo.read(), request)
+
+
+@pytest.fixture()
+def async_client(test_wsdl, test_authentication):
+    client = AsyncWorkdayClient(wsdls=test_wsdl, authentication=test_authentication)
+    client._session.adapters = {}
+    client._session.mount("https://workday.com/", ClassAdapter(WsdlMockClass))
+    return client
+
+
+def test_async_client_call(async_client):
+    posted = []
+
+    async def post(address, message, headers):
+        posted.append((address, message))
+        response = requests.Response()
+        with open(os.path.join("tests/fixtures/v30_1", "test_soap_response"), "rb") as fo:
+            response._content = fo.read()
+        response.status_code = 200
+        response.headers = {"Content-Type": "text/xml"}
+        return response
+
+    async_client._post = post
+
+    async def call():
+        return await async_client.test.sayHello("xavier")
+
+    result = run(call())
+    assert isinstance(result, AsyncWorkdayResponse)
+    assert result._response == "hello xavier"
+    assert posted[0][0] == "https://workday.com/api/test"
+    assert b"xavier" in posted[0][1]
+
+
+def test_async_client_bad_api(async_client):
+    with pytest.raises(workday.exceptions.WsdlNotProvidedError):
+        async_client.banana
+
+
+def test_async_client_auth(test_wsdl):
+    with pytest.raises(ValueError):
+        AsyncWorkdayClient(wsdls=test_wsdl, authentication=("username", "password"))
+
+
+@pytest.fixture
+def async_service():
+    class test_service(object):
+        async def Get_Test(self, **kwargs):
+            page = kwargs.get("Response_Filter", {}).get("Page", 1)
+            await asyncio.sleep(0.001 * (10 - page))
+            return AsyncWorkdayResponse(
+                {
+                    "Response_Results": {
+                        "Page": page,
+                        "Total_Pages": 10,
+                        "Total_Results": 10,
+                        "Page_Results": 1,
+                    },
+                    "Response_Data": {"TestData": [{"TestRecord": page}]},
+                },
+                service=self,
+                method="Get_Test",
+                called_args=(),
+                called_kwargs=kwargs,
+            )
+
+    return test_service()
+
+
+def test_async_paging(async_service):
+    async def pages():
+        first = await async_service.Get_Test()
+        return [page.page async for page in first]
+
+    assert run(pages()) == list(range(2, 11))
+
+
+def test_async_concurrent_paging(async_service):
+    async def pages(ordered):
+        first = await async_service.Get_Test()
+        return [
+            page.page
+            async for page in first.iter_pages(max_concurrency=5, ordered=ordered)
+        ]
+
+    assert run(pages(True)) == list(range(2, 11))
+    assert sorted(run(pages(False))) == list(range(2, 11))
+
+
+def test_async_bounded_map_limits_concurrency():
+    state = {"running": 0, "peak": 0}
+
+    async def work(i):
+        state["running"] += 1
+        state["peak"] = max(state["peak"], state["running"])
+        await asyncio.sleep(0.001)
+        state["running"] -= 1
+        return i
+
+    async def collect():
+        return [i async for i in async_bounded_map(work, range(20), 3)]
+
+    assert run(collect()) == list(range(20))
+    assert state["peak"] == 3
+
+
+def test_async_bounded_map_slow_first_item():
+    started = {}
+    finished = {}
+    loop = asyncio.new_event_loop()
+
+    async def work(i):
+        started[i] = loop.time()
+        await asyncio.sleep(0.3 if i == 0 else 0.02)
+        finished[i] = loop.time()
+        return i
+
+    async def collect():
+        return [i async for i in async_bounded_map(work, range(8), 4)]
+
+    assert loop.run_until_complete(collect()) == list(range(8))
+    # The other calls kept going while the first item was slow
+    assert all(started[i] < finished[0] for i in range(1, 8))
+
+
+def test_async_iter_records(async_service):
+    async def records():
+        first = await async_service.Get_Test()
+        return [r["TestRecord"] async for r in first.iter_records("TestData")]
+
+    assert run(records()) == list(range(1, 11))
@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+# Licensed to Anthony Shaw (anthonyshaw@apache.org) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+import time
+
+import requests
+from lxml import etree
+
+import zeep.exceptions
+
+from workday.bulk import fault_details
+from workday.exceptions import WorkdaySoapApiError
+
+FAULT_DETAIL = b"""<detail xmlns:wd="urn:com.workday/bsvc">
+  <wd:Validation_Fault>
+    <wd:Validation_Error>
+      <wd:Message>Invalid ID value</wd:Message>
+      <wd:Detail_Message>Location_ID 'X' does not exist</wd:Detail_Message>
+      <wd:Xpath>/ns0:Put_Location_Request[1]/ns0:Location_Data[1]</wd:Xpath>
+    </wd:Validation_Error>
+  </wd:Validation_Fault>
+</detail>"""
+
+
+class PutService(object):
+    def __init__(self, rejected=(), transient=None, delay=0.0):
+        self.rejected = set(rejected)
+        self.transient = dict(transient or {})
+        self.delay = delay
+        self.calls = []
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def Put_Location(self, **kwargs):
+        number = kwargs["Location_Data"]["ID"]
+        with self._lock:
+            self.calls.append(number)
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            # Later items finish first, results must still come back in order
+            time.sleep(self.delay / (number + 1))
+            if self.transient.get(number):
+                self.transient[number] -= 1
+                raise requests.ConnectionError("connection reset")
+            if number in self.rejected:
+                raise WorkdaySoapApiError(
+                    zeep.exceptions.Fault(
+                        "Validation error occurred. Invalid ID value",
+                        code="SOAP-ENV:Client.validationError",
+                        detail=etree.fromstring(FAULT_DETAIL),
+                    )
+                )
+            return {"Location_Reference": {"ID": number}}
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+def _payloads(count):
+    return ({"Location_Data": {"ID": i}} for i in range(count))
+
+
+def test_bulk_results_in_order(fake_api):
+    service = PutService(delay=0.02)
+    bulk = fake_api(service).Put_Location.bulk(max_workers=4)
+    results = list(bulk.submit(_payloads(20)))
+    assert [r.index for r in results] == list(range(20))
+    assert all(r.ok for r in results)
+    assert results[3].response._response == {"Location_Reference": {"ID": 3}}
+    assert 1 < service.max_active <= 4
+    assert bulk.summary.total == bulk.summary.succeeded == 20
+
+
+def test_bulk_partial_failure(fake_api):
+    service = PutService(rejected={2, 5})
+    bulk = fake_api(service).Put_Location.bulk(max_workers=2, backoff=0)
+    results = list(bulk.submit(_payloads(8)))
+    assert [r.ok for r in results] == [i not in (2, 5) for i in range(8)]
+    # Validation faults are not retried
+    assert sorted(service.calls) == list(range(8))
+    summary = bulk.summary
+    assert (summary.total, summary.succeeded, summary.failed) == (8, 6, 2)
+    assert [r.index for r in summary.failures] == [2, 5]
+    assert summary.failures_by_message == [
+        ("Validation error occurred. Invalid ID value", 2)
+    ]
+    fault = summary.failures[0].fault
+    assert fault["code"] == "SOAP-ENV:Client.validationError"
+    assert fault["validation_errors"] == [
+        {
+            "message": "Invalid ID value",
+            "detail_message": "Location_ID 'X' does not exist",
+            "xpath": "/ns0:Put_Location_Request[1]/ns0:Location_Data[1]",
+        }
+    ]
+
+
+def test_bulk_retries_transient_errors(fake_api):
+    service = PutService(transient={1: 2, 3: 5})
+    summary = fake_api(service).Put_Location.bulk(max_retries=3, backoff=0).run(_payloads(4))
+    assert (summary.succeeded, summary.failed, summary.retried) == (3, 1, 2)
+    failure = summary.failures[0]
+    assert failure.index == 3
+    assert failure.attempts == 4
+    assert isinstance(failure.error, requests.ConnectionError)
+    assert failure.fault is None
+
+
+def test_bulk_retry_faults(fake_api):
+    service = PutService(rejected={0})
+    summary = (
+        fake_api(service).Put_Location
+        .bulk(max_retries=2, backoff=0, retry_faults=True)
+        .run(_payloads(1))
+    )
+    assert service.calls == [0, 0, 0]
+    assert summary.failures[0].attempts == 3
+
+
+def test_fault_details_without_detail():
+    error = WorkdaySoapApiError(zeep.exceptions.Fault("Oops"))
+    assert fault_details(error) == {
+        "message": "Oops",
+        "code": None,
+        "validation_errors": [],
+    }
+
+
+def test_bulk_malformed_item(fake_api):
+    service = PutService()
+    payloads = [
+        {"Location_Data": {"ID": 0}},
+        # Raises TypeError in the call
+        {"Location_Data": None},
+        {"Location_Data": {"ID": 2}},
+    ]
+    bulk = fake_api(service).Put_Location.bulk(max_workers=2, backoff=0)
+    results = list(bulk.submit(payloads))
+    assert [r.ok for r in results] == [True, False, True]
+    assert isinstance(results[1].error, TypeError)
+    assert results[1].attempts == 1
+    assert results[1].fault is None
+    assert bulk.summary.failed == 1
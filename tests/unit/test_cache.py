@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+# Licensed to Anthony Shaw (anthonyshaw@apache.org) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+import requests
+
+import workday
+from workday.cache import DiskResponseCache, MemoryResponseCache, WsdlCache
+from workday.transport import WorkdayTransport
+
+
+_URL = "https://workday.com/api/v30?wsdl"
+
+
+class MockResponse(object):
+    def __init__(self, status_code, content=b"", headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise Exception(self.status_code)
+
+
+class MockSession(object):
+    def __init__(self, responses):
+        self.headers = {}
+        self.responses = list(responses)
+        self.requests = []
+
+    def get(self, url, timeout=None, headers=None):
+        self.requests.append(headers)
+        return self.responses.pop(0)
+
+
+def test_cache_add_get(tmpdir):
+    cache = WsdlCache(path=str(tmpdir))
+    assert cache.get(_URL) is None
+    cache.add(_URL, b"<wsdl/>")
+    assert cache.get(_URL) == b"<wsdl/>"
+
+
+def test_cache_keyed_by_tenant_and_version(tmpdir):
+    WsdlCache(path=str(tmpdir), tenant="a", version="v30.1").add(_URL, b"<wsdl/>")
+    assert WsdlCache(path=str(tmpdir), tenant="b", version="v30.1").get(_URL) is None
+    assert WsdlCache(path=str(tmpdir), tenant="a", version="v31.0").get(_URL) is None
+    assert WsdlCache(path=str(tmpdir), tenant="a", version="v30.1").get(_URL) == b"<wsdl/>"
+
+
+def test_cache_expiry(tmpdir):
+    cache = WsdlCache(path=str(tmpdir), timeout=-1)
+    cache.add(_URL, b"<wsdl/>")
+    assert cache.get(_URL) is None
+    assert cache.get_entry(_URL).content == b"<wsdl/>"
+
+
+def test_cache_max_size(tmpdir):
+    cache = WsdlCache(path=str(tmpdir), max_size=15)
+    cache.add("https://workday.com/1", b"1234567890")
+    cache.add("https://workday.com/2", b"1234567890")
+    assert cache.size <= 15
+    assert cache.get("https://workday.com/1") is None
+    assert cache.get("https://workday.com/2") == b"1234567890"
+
+
+def test_cache_bad_content(tmpdir):
+    with pytest.raises(TypeError):
+        WsdlCache(path=str(tmpdir)).add(_URL, u"<wsdl/>")
+
+
+def test_transport_stores_validators(tmpdir):
+    cache = WsdlCache(path=str(tmpdir))
+    session = MockSession(
+        [MockResponse(200, b"<wsdl/>", {"ETag": '"abc"', "Last-Modified": "yesterday"})]
+    )
+    transport = WorkdayTransport(session=session, cache=cache)
+    assert transport.load(_URL) == b"<wsdl/>"
+    # Fresh entries are served without a request
+    assert transport.load(_URL) == b"<wsdl/>"
+    assert len(session.requests) == 1
+    entry = cache.get_entry(_URL)
+    assert entry.validators == {"If-None-Match": '"abc"', "If-Modified-Since": "yesterday"}
+
+
+def test_transport_revalidates_expired_entry(tmpdir):
+    cache = WsdlCache(path=str(tmpdir), timeout=-1)
+    cache.add(_URL, b"<wsdl/>", etag='"abc"')
+    session = MockSession([MockResponse(304)])
+    transport = WorkdayTransport(session=session, cache=cache)
+    assert transport.load(_URL) == b"<wsdl/>"
+    assert session.requests == [{"If-None-Match": '"abc"'}]
+
+
+def test_transport_replaces_modified_entry(tmpdir):
+    cache = WsdlCache(path=str(tmpdir), timeout=-1)
+    cache.add(_URL, b"<wsdl/>", etag='"abc"')
+    session = MockSession([MockResponse(200, b"<wsdl2/>", {"ETag": '"def"'})])
+    transport = WorkdayTransport(session=session, cache=cache)
+    assert transport.load(_URL) == b"<wsdl2/>"
+    assert cache.get_entry(_URL).etag == '"def"'
+
+
+def test_client_wsdl_cache(workday_client, tmpdir):
+    cache = WsdlCache(path=str(tmpdir))
+    workday_client._wsdl_cache = cache
+    assert hasattr(workday_client.test, "sayHello")
+    assert cache.get("https://workday.com/api/v30?wsdl") is not None
+    assert isinstance(
+        workday_client.test.sayHello("xavier"), workday.soap.WorkdayResponse
+    )
+
+
+def test_response_cache_only_get_operations():
+    cache = MemoryResponseCache(method_ttls={"Get_Workers": 0})
+    assert cache.cacheable("Get_Languages")
+    assert not cache.cacheable("Put_Language")
+    assert not cache.cacheable("Get_Workers")
+
+
+def test_response_cache_key_normalizes_arguments():
+    cache = MemoryResponseCache()
+    key = cache.key("talent", "https://x", "Get_Languages", (), {"a": 1, "b": [1, 2]})
+    assert key == cache.key("talent", "https://x", "Get_Languages", (), {"b": [1, 2], "a": 1})
+    assert key != cache.key("talent", "https://x", "Get_Languages", (), {"a": 2, "b": [1, 2]})
+    assert key != cache.key("talent", "https://y", "Get_Languages", (), {"a": 1, "b": [1, 2]})
+
+
+def test_memory_response_cache_ttl_and_stats():
+    cache = MemoryResponseCache(ttl=60, method_ttls={"Get_Degrees": -1})
+    cache.add("a", b"<reply/>")
+    assert cache.get("a", "Get_Languages") == b"<reply/>"
+    assert cache.get("a", "Get_Degrees") is None
+    assert cache.get("b", "Get_Languages") is None
+    assert (cache.stats.hits, cache.stats.misses) == (1, 2)
+    assert cache.stats.hit_rate == 1 / 3.0
+
+
+def test_memory_response_cache_lru():
+    cache = MemoryResponseCache(max_entries=2)
+    cache.add("a", b"a")
+    cache.add("b", b"b")
+    cache.get("a", "Get_X")
+    cache.add("c", b"c")
+    assert len(cache) == 2
+    assert cache.get("b", "Get_X") is None
+    assert cache.get("a", "Get_X") == b"a"
+    assert cache.stats.evictions == 1
+
+
+def test_disk_response_cache(tmpdir):
+    cache = DiskResponseCache(path=str(tmpdir), max_entries=2, method_ttls={"Get_Y": -1})
+    cache.add("a", b"a")
+    assert DiskResponseCache(path=str(tmpdir)).get("a", "Get_X") == b"a"
+    assert cache.get("a", "Get_Y") is None
+    cache.add("b", b"b")
+    cache.add("c", b"c")
+    assert len(cache) == 2
+    cache.clear()
+    assert len(cache) == 0
+
+
+@pytest.mark.parametrize("mode", ["zeep", "dict", "slots"])
+def test_response_cache_client(talent_client, mocker, mode):
+    cache = MemoryResponseCache()
+    talent_client._response_mode = mode
+    talent_client._response_cache = cache
+    post = mocker.spy(talent_client._session, "post")
+    first = talent_client.talent.Get_Languages()
+    second = talent_client.talent.Get_Languages()
+    assert post.call_count == 1
+    assert second.total_results == first.total_results == 87
+    assert (cache.stats.hits, cache.stats.misses) == (1, 1)
+
+
+def test_response_cache_client_faults_not_cached(talent_client):
+    cache = MemoryResponseCache()
+    talent_client._response_cache = cache
+    for _ in range(2):
+        with pytest.raises(workday.exceptions.WorkdaySoapApiError):
+            talent_client.talent.Get_Mentorships()
+    assert len(cache) == 0
+
+
+def test_response_cache_client_transport_error(talent_client, mocker):
+    talent_client._response_cache = MemoryResponseCache(method_ttls={"Get_Degrees": 0})
+    api = talent_client.talent
+    mocker.patch.object(
+        talent_client._session, "post", side_effect=requests.ConnectionError("reset")
+    )
+    with pytest.raises(requests.ConnectionError):
+        api.Get_Languages()
+    mocker.stopall()
+    # Uncached methods on this thread still return zeep objects
+    assert api.Get_Degrees().total_results > 0
@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+# Licensed to Anthony Shaw (anthonyshaw@apache.org) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import datetime
+
+import pytest
+import requests
+import zeep.exceptions
+
+from workday.checkpoint import CheckpointStore
+from workday.exceptions import WorkdaySoapApiError
+
+
+class PagedService(object):
+    def __init__(self, pages=5, failures=None, error=None):
+        self.pages = pages
+        self.failures = dict(failures or {})
+        self.error = error or requests.ConnectionError("connection reset")
+        self.filters = []
+
+    def Get_Test(self, **kwargs):
+        response_filter = kwargs["Response_Filter"]
+        self.filters.append(dict(response_filter))
+        page = response_filter["Page"]
+        if self.failures.get(page):
+            self.failures[page] -= 1
+            raise self.error
+        return {
+            "Response_Filter": {
+                "Page": page,
+                "As_Of_Effective_Date": response_filter.get(
+                    "As_Of_Effective_Date", datetime.date(2026, 10, page)
+                ),
+                "As_Of_Entry_DateTime": response_filter.get(
+                    "As_Of_Entry_DateTime", "2026-10-18T10:00:0{0}".format(page)
+                ),
+            },
+            "Response_Results": {
+                "Page": page,
+                "Total_Pages": self.pages,
+                "Total_Results": self.pages,
+                "Page_Results": 1,
+            },
+            "Response_Data": {"Record": [page]},
+        }
+
+
+def test_checkpointed_pages(tmpdir, fake_api):
+    store = CheckpointStore(str(tmpdir))
+    service = PagedService()
+    export = fake_api(service).Get_Test.checkpointed(store, key="job")
+    pages = []
+    for page in export.pages(Response_Filter={"Count": 1}):
+        pages.append(page.page)
+        if page.page > 1:
+            assert store.get("job")["last_page"] == page.page - 1
+    assert pages == [1, 2, 3, 4, 5]
+    # Later pages are pinned to the dates of the first
+    assert all(f["As_Of_Effective_Date"] == "2026-10-01" for f in service.filters[1:])
+    assert all(f["As_Of_Entry_DateTime"] == "2026-10-18T10:00:01" for f in service.filters[1:])
+    assert all(f["Count"] == 1 for f in service.filters)
+    assert store.get("job") is None
+
+
+def test_checkpointed_resume(tmpdir, fake_api):
+    store = CheckpointStore(str(tmpdir))
+    export = fake_api(PagedService()).Get_Test.checkpointed(store, key="job")
+    for page in export.pages(Response_Filter={"Count": 1}):
+        if page.page == 3:
+            break
+    checkpoint = store.get("job")
+    assert checkpoint["last_page"] == 2
+    assert checkpoint["as_of"]["As_Of_Effective_Date"] == "2026-10-01"
+
+    service = PagedService()
+    resumed = fake_api(service).Get_Test.checkpointed(store, key="job")
+    assert [page.page for page in resumed.resume()] == [3, 4, 5]
+    assert service.filters[0] == {
+        "Count": 1,
+        "Page": 3,
+        "As_Of_Effective_Date": "2026-10-01",
+        "As_Of_Entry_DateTime": "2026-10-18T10:00:01",
+    }
+    assert store.get("job") is None
+
+
+def test_checkpointed_same_call_continues(tmpdir, fake_api):
+    store = CheckpointStore(str(tmpdir))
+    method = fake_api(PagedService()).Get_Test
+    records = method.checkpointed(store).records("Record")
+    assert [next(records), next(records), next(records)] == [1, 2, 3]
+    del records
+    assert list(method.checkpointed(store).records("Record")) == [3, 4, 5]
+
+
+def test_checkpointed_retries_failed_pages(tmpdir, fake_api):
+    store = CheckpointStore(str(tmpdir))
+    service = PagedService(failures={2: 2})
+    export = fake_api(service).Get_Test.checkpointed(store, backoff=0.001)
+    assert [page.page for page in export.pages()] == [1, 2, 3, 4, 5]
+
+
+def test_checkpointed_gives_up(tmpdir, fake_api):
+    store = CheckpointStore(str(tmpdir))
+    export = fake_api(PagedService(failures={3: 5})).Get_Test.checkpointed(
+        store, key="job", max_retries=1, backoff=0.001
+    )
+    with pytest.raises(requests.ConnectionError):
+        list(export.pages())
+    assert store.get("job")["last_page"] == 2
+
+
+def test_resume_without_checkpoint(tmpdir, fake_api):
+    export = fake_api(PagedService()).Get_Test.checkpointed(
+        CheckpointStore(str(tmpdir)), key="job"
+    )
+    with pytest.raises(ValueError):
+        export.resume()
+
+
+def test_checkpointed_retries_transient_faults(tmpdir, fake_api):
+    service = PagedService(
+        failures={2: 2}, error=zeep.exceptions.Fault("Too many requests, try again later")
+    )
+    export = fake_api(service).Get_Test.checkpointed(
+        CheckpointStore(str(tmpdir)), backoff=0.001
+    )
+    assert [page.page for page in export.pages()] == [1, 2, 3, 4, 5]
+
+
+def test_checkpointed_raises_other_faults(tmpdir, fake_api):
+    service = PagedService(
+        failures={2: 1}, error=zeep.exceptions.Fault("Validation error occurred")
+    )
+    store = CheckpointStore(str(tmpdir))
+    export = fake_api(service).Get_Test.checkpointed(store, key="job", backoff=0.001)
+    with pytest.raises(WorkdaySoapApiError):
+        list(export.pages())
+    # Not retried
+    assert [f["Page"] for f in service.filters] == [1, 2]
+    assert store.get("job")["last_page"] == 1
+
+
+def test_checkpointed_zeep_client(talent_client, tmpdir):
+    store = CheckpointStore(str(tmpdir))
+    export = talent_client.talent.Get_Languages.checkpointed(store, key="job")
+    records = list(export.records("Language"))
+    assert len(records) == 87
+    assert records[0].Language_Data[0].ID == "English"
+    assert store.get("job") is None
@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+# Licensed to Anthony Shaw (anthonyshaw@apache.org) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+import time
+
+import pytest
+
+from workday.concurrency import PrefetchIterator, bounded_map
+
+
+def test_bounded_map_ordered():
+    def slow(i):
+        time.sleep(0.01 * (5 - i))
+        return i * 2
+
+    assert list(bounded_map(slow, range(5), max_workers=5)) == [0, 2, 4, 6, 8]
+
+
+def test_bounded_map_unordered():
+    def slow(i):
+        time.sleep(0.02 * (5 - i))
+        return i
+
+    results = list(bounded_map(slow, range(5), max_workers=5, ordered=False))
+    assert sorted(results) == [0, 1, 2, 3, 4]
+    assert results[0] == 4
+
+
+def test_bounded_map_limits_concurrency():
+    lock = threading.Lock()
+    state = {"running": 0, "peak": 0}
+
+    def work(i):
+        with lock:
+            state["running"] += 1
+            state["peak"] = max(state["peak"], state["running"])
+        time.sleep(0.01)
+        with lock:
+            state["running"] -= 1
+        return i
+
+    assert list(bounded_map(work, range(20), max_workers=3)) == list(range(20))
+    assert state["peak"] <= 3
+
+
+def test_bounded_map_slow_first_item():
+    started = {}
+    finished = {}
+
+    def work(i):
+        started[i] = time.time()
+        time.sleep(0.3 if i == 0 else 0.02)
+        finished[i] = time.time()
+        return i
+
+    assert list(bounded_map(work, range(8), max_workers=4)) == list(range(8))
+    # The other workers kept going while the first item was slow
+    assert all(started[i] < finished[0] for i in range(1, 8))
+
+
+def test_bounded_map_raises():
+    def fail(i):
+        if i == 2:
+            raise ValueError(i)
+        return i
+
+    results = bounded_map(fail, range(5), max_workers=2)
+    assert next(results) == 0
+    assert next(results) == 1
+    with pytest.raises(ValueError):
+        next(results)
+
+
+def test_bounded_map_bad_workers():
+    with pytest.raises(ValueError):
+        list(bounded_map(str, range(5), max_workers=0))
+
+
+def test_prefetch_iterator():
+    with PrefetchIterator(iter(range(10)), size=2) as prefetched:
+        assert list(prefetched) == list(range(10))
+        assert prefetched.stats.items == 10
+
+
+def test_prefetch_overlaps_producer():
+    def produce():
+        for i in range(5):
+            time.sleep(0.02)
+            yield i
+
+    prefetched = PrefetchIterator(produce(), size=5)
+    time.sleep(0.15)
+    start = time.time()
+    assert list(prefetched) == list(range(5))
+    # Everything was fetched while the consumer was busy
+    assert time.time() - start < 0.05
+    assert prefetched.stats.consumer_wait < 0.05
+
+
+def test_prefetch_bounded_buffer():
+    produced = []
+
+    def produce():
+        for i in range(10):
+            produced.append(i)
+            yield i
+
+    prefetched = PrefetchIterator(produce(), size=2)
+    time.sleep(0.05)
+    # Two items in the buffer and one waiting to be put
+    assert len(produced) <= 3
+    prefetched.close()
+    assert prefetched.stats.producer_wait > 0
+
+
+def test_prefetch_raises():
+    def produce():
+        yield 1
+        raise ValueError()
+
+    prefetched = PrefetchIterator(produce())
+    assert next(prefetched) == 1
+    with pytest.raises(ValueError):
+        next(prefetched)
+    with pytest.raises(StopIteration):
+        next(prefetched)
+
+
+def test_prefetch_abandoned():
+    closed = []
+
+    def produce():
+        try:
+            for i in range(100):
+                yield i
+        finally:
+            closed.append(True)
+
+    prefetched = PrefetchIterator(produce(), size=2)
+    assert next(prefetched) == 0
+    thread = prefetched._thread
+    del prefetched
+    thread.join(timeout=1)
+    assert not thread.is_alive()
+    assert closed == [True]
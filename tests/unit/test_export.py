@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+# Licensed to Anthony Shaw (anthonyshaw@apache.org) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import csv
+import datetime
+import gzip
+import io
+import json
+
+import pytest
+import requests
+
+from workday.export import JSONLinesSink, ParquetExporter, export_records
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+requires_pyarrow = pytest.mark.skipif(pyarrow is None, reason="pyarrow is not installed")
+
+
+@requires_pyarrow
+def test_parquet_schema(talent_client):
+    exporter = ParquetExporter(talent_client.talent, "Get_Languages", "Language")
+    schema = exporter.schema
+    assert schema.field("Language_Reference.ID").type == pyarrow.list_(
+        pyarrow.struct(
+            [
+                pyarrow.field("_value_1", pyarrow.string()),
+                pyarrow.field("type", pyarrow.string()),
+            ]
+        )
+    )
+    data = schema.field("Language_Data").type.value_type
+    assert data.field("Inactive").type == pyarrow.bool_()
+    assert data.field("Language_Description").type == pyarrow.string()
+
+
+@requires_pyarrow
+def test_parquet_export(talent_client, tmpdir):
+    path = str(tmpdir.join("languages.parquet"))
+    exporter = ParquetExporter(talent_client.talent, "Get_Languages", "Language")
+    assert exporter.export(path) == 87
+    table = pyarrow.parquet.read_table(path)
+    assert table.num_rows == 87
+    first = table.slice(0, 1).to_pylist()[0]
+    assert first["Language_Reference.ID"] == [
+        {"_value_1": "f942185b33c210c3b1644501bdf38835", "type": "WID"},
+        {"_value_1": "English", "type": "Language_ID"},
+    ]
+    assert first["Language_Data"][0]["Inactive"] is False
+    assert first["Language_Data"][0]["Language_Description"] == "English"
+
+
+@requires_pyarrow
+def test_parquet_export_pages(talent_client, tmpdir):
+    # The mock answers every page with the same two-page fixture
+    path = str(tmpdir.join("categories.parquet"))
+    exporter = ParquetExporter(
+        talent_client.talent, "Get_Competency_Categories", "Competency_Category"
+    )
+    batches = list(exporter.batches())
+    assert len(batches) == 2
+    assert exporter.export(path) == sum(b.num_rows for b in batches)
+
+
+@requires_pyarrow
+def test_parquet_export_hooks(talent_client, tmpdir):
+    calls = []
+    talent_client.talent.hooks.append(calls.append)
+    exporter = ParquetExporter(talent_client.talent, "Get_Languages", "Language")
+    exporter.export(str(tmpdir.join("languages.parquet")))
+    assert [(timings.method, timings.error) for timings in calls] == [
+        ("Get_Languages", None)
+    ]
+
+
+@requires_pyarrow
+def test_parquet_export_transport_error(talent_client, tmpdir, mocker):
+    api = talent_client.talent
+    exporter = ParquetExporter(api, "Get_Languages", "Language")
+    mocker.patch.object(
+        talent_client._session, "post", side_effect=requests.ConnectionError("reset")
+    )
+    with pytest.raises(requests.ConnectionError):
+        exporter.export(str(tmpdir.join("languages.parquet")))
+    mocker.stopall()
+    # The client still returns zeep objects
+    assert api.Get_Languages().total_results == 87
+
+
+@requires_pyarrow
+def test_parquet_max_depth(talent_client):
+    exporter = ParquetExporter(
+        talent_client.talent, "Get_Languages", "Language", max_depth=1
+    )
+    assert exporter.schema.field("Language_Reference").type == pyarrow.string()
+
+
+def test_export_jsonl_gzip(talent_client, tmpdir):
+    path = str(tmpdir.join("languages.jsonl.gz"))
+    response = talent_client.talent.Get_Languages()
+    assert response.export(path, "Language") == 87
+    with gzip.open(path, "rt") as fo:
+        lines = [json.loads(line) for line in fo]
+    assert len(lines) == 87
+    assert lines[0]["Language_Reference"]["ID"][1] == {
+        "_value_1": "English",
+        "type": "Language_ID",
+    }
+    assert lines[0]["Language_Data"][0]["Inactive"] is False
+
+
+def test_export_csv(talent_client, tmpdir):
+    path = str(tmpdir.join("languages.csv"))
+    response = talent_client.talent.Get_Languages()
+    assert response.export(path, "Language") == 87
+    with io.open(path, "r", encoding="utf-8", newline="") as fo:
+        rows = list(csv.DictReader(fo))
+    assert len(rows) == 87
+    assert list(rows[0]) == [
+        "Language_Reference.ID",
+        "Language_Reference.Descriptor",
+        "Language_Data",
+    ]
+    assert json.loads(rows[0]["Language_Data"])[0]["Language_Description"] == "English"
+
+
+def test_export_csv_columns(tmpdir):
+    path = str(tmpdir.join("rows.csv"))
+    records = [{"a": {"b": 1}, "c": True}, {"a": {"b": 2}, "d": "x"}]
+    assert export_records(records, path, columns=["a.b", "d"]) == 2
+    with io.open(path, "r", encoding="utf-8") as fo:
+        assert fo.read().splitlines() == ["a.b,d", "1,", "2,x"]
+
+
+def test_export_json(talent_client, tmpdir):
+    path = str(tmpdir.join("languages.json"))
+    response = talent_client.talent.Get_Languages()
+    assert response.export(path, "Language") == 87
+    with io.open(path, "r", encoding="utf-8") as fo:
+        records = json.load(fo)
+    assert len(records) == 87
+    assert records[0]["Language_Data"][0]["Language_Description"] == "English"
+
+
+def test_export_json_empty(tmpdir):
+    path = str(tmpdir.join("rows.json.gz"))
+    assert export_records([], path) == 0
+    with gzip.open(path, "rt") as fo:
+        assert json.load(fo) == []
+
+
+def test_export_unknown_format(tmpdir):
+    with pytest.raises(ValueError):
+        export_records([], str(tmpdir.join("rows.txt")))
+
+
+def test_jsonl_sink_fileobj():
+    fileobj = io.BytesIO()
+    with JSONLinesSink(fileobj) as sink:
+        sink.write_all([{"a": 1}, {"b": None}])
+    assert sink.count == 2
+    assert fileobj.getvalue().splitlines() == [b'{"a":1}', b'{"b":null}']
+
+
+def _dates(value):
+    if isinstance(value, dict):
+        value = list(value.values())
+    if isinstance(value, list):
+        return [date for item in value for date in _dates(item)]
+    return [value] if isinstance(value, datetime.date) else []
+
+
+@requires_pyarrow
+def test_parquet_export_dates(talent_client, tmpdir):
+    path = str(tmpdir.join("competencies.parquet"))
+    exporter = ParquetExporter(talent_client.talent, "Get_Competencies", "Competency")
+    assert exporter.export(path) == 2
+    rows = pyarrow.parquet.read_table(path).to_pylist()
+    # Workday's dates have a UTC offset, 2018-06-25-07:00
+    assert _dates(rows) == [datetime.date(2018, 6, 25)] * 2
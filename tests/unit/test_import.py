@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+# Licensed to Anthony Shaw (anthonyshaw@apache.org) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import json
+import subprocess
+import sys
+
+import pytest
+
+HEAVY_MODULES = ("requests", "zeep", "lxml", "six")
+
+# Imported by the features that use them, not by the client
+FEATURE_MODULES = (
+    "workday.bulk",
+    "workday.checkpoint",
+    "workday.concurrency",
+    "workday.raw",
+    "workday.records",
+    "workday.snapshot",
+    "workday.streaming",
+    "concurrent.futures.process",
+)
+
+
+def _loaded(statement):
+    code = "{0}\nimport json, sys\nprint(json.dumps(sorted(sys.modules)))".format(statement)
+    return set(json.loads(subprocess.check_output([sys.executable, "-c", code])))
+
+
+@pytest.mark.skipif(sys.version_info < (3, 7), reason="needs module __getattr__")
+@pytest.mark.parametrize("statement", ["import workday", "import workday.auth"])
+def test_import_is_lazy(statement):
+    loaded = _loaded(statement)
+    assert not [name for name in HEAVY_MODULES if name in loaded]
+
+
+@pytest.mark.skipif(sys.version_info < (3, 7), reason="needs module __getattr__")
+def test_client_import_is_lazy():
+    loaded = _loaded("from workday import WorkdayClient")
+    assert not [name for name in ("zeep", "lxml", "workday.soap") if name in loaded]
+    assert not [name for name in FEATURE_MODULES if name in loaded]
+
+
+def test_features_imported_on_use():
+    loaded = _loaded("import workday.soap")
+    assert not [name for name in FEATURE_MODULES if name in loaded]
+    loaded = _loaded(
+        "import workday.soap\nworkday.soap.SoapMethod(None, 'Get_Workers').bulk()"
+    )
+    assert "workday.bulk" in loaded
+
+
+def test_wsse_imported_on_use():
+    loaded = _loaded(
+        "import workday.auth\n"
+        "workday.auth.WsSecurityCredentialAuthentication('user', 'password')"
+    )
+    assert "zeep.wsse.username" in loaded
+
+
+def test_lazy_attributes():
+    import workday
+    from workday.client import WorkdayClient
+
+    assert workday.WorkdayClient is WorkdayClient
+    assert workday.records.Record is not None
+    assert "WorkdayClient" in dir(workday)
+    with pytest.raises(AttributeError):
+        workday.missing
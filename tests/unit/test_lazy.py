@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+# Licensed to Anthony Shaw (anthonyshaw@apache.org) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import threading
+
+import pytest
+import zeep.helpers
+import zeep.transports
+from zeep.wsdl import Document
+
+import workday
+from workday.lazy import LazyDocument
+from workday.snapshot import SnapshotClient
+
+_TALENT_WSDL = "tests/fixtures/v30_1/talent_wsdl"
+
+
+def test_lazy_document_compiles_on_use():
+    document = LazyDocument(_TALENT_WSDL, zeep.transports.Transport())
+    assert document.compiled_operations == []
+    schema = document.types.documents.get_by_namespace("urn:com.workday/bsvc", False)[0]
+    indexed = len(schema._nodes)
+
+    client = SnapshotClient(document)
+    message = client.create_message(
+        client.service, "Get_Languages", Response_Filter={"Page": 2}
+    )
+    assert b"<ns0:Page>2</ns0:Page>" in zeep.wsdl.utils.etree_to_string(message)
+    assert document.compiled_operations == ["Get_Languages"]
+    # Only the types Get_Languages needs were compiled
+    assert 0 < indexed - len(schema._nodes) < indexed / 4
+
+
+def test_lazy_document_matches_document():
+    eager = Document(_TALENT_WSDL, zeep.transports.Transport())
+    lazy = LazyDocument(_TALENT_WSDL, zeep.transports.Transport())
+    for name, binding in eager.bindings.items():
+        operations = binding.all()
+        assert list(lazy.bindings[name].all()) == list(operations)
+        for operation in operations:
+            assert str(lazy.bindings[name].get(operation)) == str(binding.get(operation))
+
+
+def test_lazy_document_threads():
+    document = LazyDocument(_TALENT_WSDL, zeep.transports.Transport())
+    binding = list(document.bindings.values())[0]
+    signatures = []
+
+    def compile():
+        signatures.append(str(binding.get("Get_Competencies")))
+
+    threads = [threading.Thread(target=compile) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(set(signatures)) == 1
+
+
+def test_client_lazy_schema(talent_client):
+    talent_client._lazy_schema = True
+    response = talent_client.talent.Get_Languages()
+    assert isinstance(response, workday.soap.WorkdayResponse)
+    assert isinstance(talent_client.talent._client.wsdl, LazyDocument)
+    assert talent_client.talent._client.wsdl.compiled_operations == ["Get_Languages"]
+
+    talent_client._lazy_schema = False
+    talent_client._apis["talent"] = "https://workday.com/ccx/service/testdomain/Talent/v30.1"
+    assert zeep.helpers.serialize_object(
+        talent_client.talent.Get_Languages().data
+    ) == zeep.helpers.serialize_object(response.data)
+
+
+def test_client_lazy_schema_snapshot(test_authentication, tmpdir):
+    with pytest.raises(ValueError):
+        workday.WorkdayClient(
+            wsdls={"talent": "https://workday.com/ccx/service/testdomain/Talent/v30.1"},
+            authentication=test_authentication,
+            snapshot_dir=str(tmpdir),
+            lazy_schema=True,
+        )
@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+# Licensed to Anthony Shaw (anthonyshaw@apache.org) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+
+import pytest
+import requests
+
+import zeep.exceptions
+
+import workday.exceptions
+from workday.metrics import Metrics, fault_code
+from workday.timing import CallTimings
+
+
+def _timings(method, total, error=None, paged=True, api="hcm"):
+    timings = CallTimings(api, method)
+    timings.total = total
+    timings.parse = total / 2
+    timings.request_bytes = 100
+    timings.response_bytes = 1000
+    timings.error = error
+    timings.paged = paged and error is None
+    return timings
+
+
+def test_metrics_snapshot():
+    metrics = Metrics(buckets=(0.1, 1.0, 10.0))
+    for _ in range(90):
+        metrics(_timings("Get_Workers", 0.05))
+    for _ in range(10):
+        metrics(_timings("Get_Workers", 5.0))
+    metrics(_timings("Put_Worker", 0.5, paged=False))
+    snapshot = metrics.snapshot()
+    workers = snapshot[("hcm", "Get_Workers")]
+    assert workers["calls"] == 100
+    assert workers["pages"] == 100
+    assert workers["request_bytes"] == 10000
+    assert workers["response_bytes"] == 100000
+    assert workers["p50"] == pytest.approx(0.1 * 50 / 90)
+    assert 1.0 < workers["p95"] < workers["p99"] <= 10.0
+    assert workers["phases"]["parse"] == pytest.approx(workers["seconds"] / 2)
+    assert snapshot[("hcm", "Put_Worker")]["pages"] == 0
+
+
+def test_metrics_faults():
+    metrics = Metrics()
+    fault = workday.exceptions.WorkdaySoapApiError(
+        zeep.exceptions.Fault("Invalid ID", code="SOAP-ENV:Client.validationError")
+    )
+    metrics(_timings("Get_Workers", 0.1, error=fault))
+    metrics(_timings("Get_Workers", 0.1, error=fault))
+    metrics(_timings("Get_Workers", 0.1, error=requests.ConnectionError()))
+    assert metrics.snapshot()[("hcm", "Get_Workers")]["faults"] == {
+        "SOAP-ENV:Client.validationError": 2,
+        "ConnectionError": 1,
+    }
+    assert fault_code(ValueError()) == "ValueError"
+
+
+def test_metrics_threads():
+    metrics = Metrics()
+
+    def record():
+        for _ in range(1000):
+            metrics(_timings("Get_Workers", 0.2))
+
+    threads = [threading.Thread(target=record) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert metrics.snapshot()[("hcm", "Get_Workers")]["calls"] == 8000
+    metrics.reset()
+    assert metrics.snapshot() == {}
+
+
+def test_metrics_short_lived_threads():
+    metrics = Metrics()
+    metrics(_timings("Get_Workers", 0.2))
+    for _ in range(50):
+        thread = threading.Thread(target=metrics, args=(_timings("Get_Workers", 0.2),))
+        thread.start()
+        thread.join()
+    # The shards of ended threads were folded into the base
+    assert len(metrics._shards) == 1
+    assert metrics.snapshot()[("hcm", "Get_Workers")]["calls"] == 51
+
+
+def test_metrics_render():
+    metrics = Metrics(buckets=(0.1, 1.0))
+    metrics(_timings("Get_Workers", 0.5))
+    metrics(_timings('Get_"Odd"', 2.0, api="talent"))
+    text = metrics.render()
+    assert "# TYPE workday_call_duration_seconds histogram" in text
+    assert 'workday_call_duration_seconds_bucket{api="hcm",le="0.1",method="Get_Workers"} 0' in text
+    assert 'workday_call_duration_seconds_bucket{api="hcm",le="1.0",method="Get_Workers"} 1' in text
+    assert 'workday_call_duration_seconds_bucket{api="hcm",le="+Inf",method="Get_Workers"} 1' in text
+    assert 'workday_call_duration_seconds_count{api="hcm",method="Get_Workers"} 1' in text
+    assert 'workday_calls_total{api="talent",method="Get_\\"Odd\\""} 1' in text
+    assert 'workday_pages_total{api="hcm",method="Get_Workers"} 1' in text
+    assert 'workday_phase_seconds_total{api="hcm",method="Get_Workers",phase="parse"} 0.25' in text
+
+
+def test_metrics_hook(talent_client):
+    metrics = Metrics()
+    talent_client.talent.hooks.append(metrics)
+    talent_client.talent.Get_Languages()
+    with pytest.raises(workday.exceptions.WorkdaySoapApiError):
+        talent_client.talent.Get_Mentorships()
+    snapshot = metrics.snapshot()
+    assert snapshot[("talent", "Get_Languages")]["pages"] == 1
+    assert snapshot[("talent", "Get_Mentorships")]["faults"] == {
+        "SOAP-ENV:Server.processingError": 1
+    }
+
+
+def test_metrics_server():
+    metrics = Metrics()
+    metrics(_timings("Get_Workers", 0.5))
+    server = metrics.serve(port=0)
+    try:
+        session = requests.Session()
+        session.trust_env = False
+        response = session.get(server.url)
+        assert response.status_code == 200
+        assert response.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+        assert 'workday_calls_total{api="hcm",method="Get_Workers"} 1' in response.text
+        assert session.get(server.url.replace("/metrics", "/other")).status_code == 404
+    finally:
+        server.close()
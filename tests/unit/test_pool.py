@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+# Licensed to Anthony Shaw (anthonyshaw@apache.org) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+
+import pytest
+import requests
+from six.moves import BaseHTTPServer, socketserver
+
+import workday
+from workday.pool import WorkdayHTTPAdapter
+
+
+class KeepAliveHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, *args):
+        pass
+
+
+class Server(socketserver.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+    daemon_threads = True
+
+
+@pytest.fixture()
+def server_url():
+    server = Server(("127.0.0.1", 0), KeepAliveHandler)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    yield "http://127.0.0.1:{0}/".format(server.server_address[1])
+    server.shutdown()
+    server.server_close()
+
+
+def _session(adapter, keep_alive=True):
+    session = requests.Session()
+    session.mount("http://", adapter)
+    if not keep_alive:
+        session.headers["Connection"] = "close"
+    return session
+
+
+def test_pool_stats_reuse(server_url):
+    adapter = WorkdayHTTPAdapter()
+    session = _session(adapter)
+    for _ in range(4):
+        assert session.get(server_url).content == b"ok"
+    assert adapter.stats.requests == 4
+    assert adapter.stats.connections == 1
+    assert adapter.stats.reuse_ratio == 0.75
+
+
+def test_pool_stats_no_keep_alive(server_url):
+    adapter = WorkdayHTTPAdapter()
+    session = _session(adapter, keep_alive=False)
+    for _ in range(3):
+        session.get(server_url)
+    assert adapter.stats.connections == 3
+    assert adapter.stats.reuse_ratio == 0.0
+
+
+def test_pool_warm(server_url):
+    adapter = WorkdayHTTPAdapter(pool_maxsize=3)
+    session = _session(adapter)
+    settings = session.merge_environment_settings(server_url, {}, None, None, None)
+    adapter.warm(server_url, 5, proxies=settings["proxies"], verify=settings["verify"])
+    assert adapter.stats.connections == 3
+    session.get(server_url)
+    assert adapter.stats.connections == 3
+
+
+def test_pool_default_timeout(server_url, mocker):
+    adapter = WorkdayHTTPAdapter(timeout=(1, 5))
+    send = mocker.spy(requests.adapters.HTTPAdapter, "send")
+    _session(adapter).get(server_url)
+    assert send.call_args[1]["timeout"] == (1, 5)
+
+
+def test_client_warm_connections(server_url, test_authentication):
+    client = workday.WorkdayClient(
+        wsdls={"test": server_url + "api/v30"},
+        authentication=test_authentication,
+        warm_connections=2,
+    )
+    assert client.pool_stats.connections == 2
+    client._session.get(server_url)
+    assert client.pool_stats.connections == 2
+
+
+def test_client_warm_unreachable_host(test_authentication):
+    client = workday.WorkdayClient(
+        wsdls={"test": "http://127.0.0.1:1/api/v30"},
+        authentication=test_authentication,
+        warm_connections=1,
+    )
+    assert client.pool_stats.reuse_ratio == 0.0
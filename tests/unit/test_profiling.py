@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+# Licensed to Anthony Shaw (anthonyshaw@apache.org) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import io
+import os
+import pstats
+import tracemalloc
+
+import pytest
+
+import workday.exceptions
+from workday.profiling import Profiler, component
+
+
+def test_profile_call(talent_client, tmpdir):
+    with talent_client.profile(str(tmpdir), operations=["Get_Languages"]) as profiler:
+        talent_client.talent.Get_Languages()
+        talent_client.talent.Get_Certifications()
+    assert talent_client.talent.profiler is None
+    assert len(profiler.reports) == 1
+    report_path = profiler.reports[0]
+    name = os.path.basename(report_path)
+    assert name.startswith("talent.Get_Languages.") and name.endswith(".txt")
+    prof_path = report_path[: -len(".txt")] + ".prof"
+    stats = pstats.Stats(prof_path)
+    assert stats.total_tt > 0
+    with io.open(report_path, encoding="utf-8") as fo:
+        report = fo.read()
+    assert "Phases (wall clock):" in report
+    assert "CPU time by component" in report
+    assert "  objects " in report
+    assert "Memory still allocated after the call, by component:" in report
+    assert "Top functions by cumulative time:" in report
+
+
+def test_profile_max_calls(talent_client, tmpdir):
+    profiler = Profiler(str(tmpdir.join("profiles")), max_calls=2)
+    talent_client.talent.profiler = profiler
+    for _ in range(3):
+        talent_client.talent.Get_Languages()
+    assert len(profiler.reports) == 2
+    assert len(os.listdir(str(tmpdir.join("profiles")))) == 4
+
+
+def test_profile_failed_call(talent_client, tmpdir):
+    with talent_client.profile(str(tmpdir)) as profiler:
+        with pytest.raises(workday.exceptions.WorkdaySoapApiError):
+            talent_client.talent.Get_Mentorships()
+    with io.open(profiler.reports[0], encoding="utf-8") as fo:
+        assert "failed: " in fo.read()
+
+
+def test_profile_one_call_at_a_time(tmpdir):
+    profiler = Profiler(str(tmpdir))
+    first = profiler.start("hcm", "Get_Workers")
+    assert first is not None
+    assert profiler.start("hcm", "Get_Workers") is None
+
+    class timings(object):
+        serialize = sign = queue = ttfb = download = parse = build = total = 0.0
+        request_bytes = response_bytes = 0
+        error = None
+
+    first.finish(timings)
+    second = profiler.start("hcm", "Get_Workers")
+    assert second is not None
+    second.finish(timings)
+    assert not tracemalloc.is_tracing()
+
+
+@pytest.mark.parametrize(
+    "location,expected",
+    [
+        ("/site-packages/urllib3/connectionpool.py:urlopen", "transport"),
+        ("/site-packages/zeep/wsse/signature.py:apply", "signing"),
+        ("~:<built-in method lxml.etree.fromstring>", "parsing"),
+        ("/site-packages/zeep/xsd/types/complex.py:parse_xmlelement", "objects"),
+        ("/app/main.py:main", "other"),
+    ],
+)
+def test_component(location, expected):
+    assert component(location) == expected
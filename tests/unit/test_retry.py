@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+# Licensed to Anthony Shaw (anthonyshaw@apache.org) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import pytest
+import requests
+
+from workday.retry import TRANSIENT_ERRORS, backoff_delay, call_with_retries
+
+
+def _transient(exc):
+    return isinstance(exc, TRANSIENT_ERRORS)
+
+
+def test_backoff_delay():
+    assert 0.5 <= backoff_delay(0, 1.0, 30.0) <= 1.0
+    assert 4.0 <= backoff_delay(3, 1.0, 30.0) <= 8.0
+    assert 15.0 <= backoff_delay(10, 1.0, 30.0) <= 30.0
+
+
+def test_call_with_retries():
+    failures = [requests.ConnectionError("reset"), requests.Timeout("timed out")]
+    retries = []
+
+    def send():
+        if failures:
+            raise failures.pop(0)
+        return "ok"
+
+    result = call_with_retries(
+        send, _transient, backoff=0, on_retry=lambda exc, delay: retries.append(exc)
+    )
+    assert result == "ok"
+    assert [type(exc) for exc in retries] == [requests.ConnectionError, requests.Timeout]
+
+
+def test_call_with_retries_gives_up():
+    calls = []
+
+    def send():
+        calls.append(1)
+        raise requests.ConnectionError("reset")
+
+    with pytest.raises(requests.ConnectionError):
+        call_with_retries(send, _transient, max_retries=2, backoff=0)
+    assert len(calls) == 3
+
+
+def test_call_with_retries_other_errors():
+    calls = []
+
+    def send():
+        calls.append(1)
+        raise ValueError("bad payload")
+
+    with pytest.raises(ValueError):
+        call_with_retries(send, _transient, backoff=0)
+    assert len(calls) == 1
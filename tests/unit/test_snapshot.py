@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+# Licensed to Anthony Shaw (anthonyshaw@apache.org) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+
+import requests
+
+import zeep.transports
+
+import workday
+from workday.snapshot import SnapshotClient, compile_snapshot, load_snapshot
+
+
+_TALENT_WSDL = "tests/fixtures/v30_1/talent_wsdl"
+_TALENT_URL = "https://workday.com/ccx/service/testdomain/Talent/v30.1?wsdl"
+
+
+class WsdlServer(object):
+    """
+    Serves the Talent WSDL with an ETag, and answers conditional GETs
+    """
+
+    def __init__(self, etag='"v1"'):
+        self.headers = {}
+        self.etag = etag
+        self.requests = []
+
+    def get(self, url, timeout=None, headers=None):
+        headers = headers or {}
+        self.requests.append(headers)
+        response = requests.Response()
+        response.url = url
+        if headers.get("If-None-Match") == self.etag:
+            response.status_code = 304
+            response._content = b""
+        else:
+            response.status_code = 200
+            response.headers["ETag"] = self.etag
+            with open(_TALENT_WSDL, "rb") as fo:
+                response._content = fo.read()
+        return response
+
+
+def test_snapshot_roundtrip(tmpdir):
+    path = str(tmpdir.join("talent.snapshot"))
+    compile_snapshot(_TALENT_WSDL, path)
+    document = load_snapshot(path, _TALENT_WSDL, zeep.transports.Transport())
+    assert document is not None
+    client = SnapshotClient(document)
+    assert hasattr(client.service, "Get_Languages")
+    message = client.create_message(
+        client.service, "Get_Languages", Response_Filter={"Page": 2}
+    )
+    assert b"<ns0:Page>2</ns0:Page>" in zeep.wsdl.utils.etree_to_string(message)
+
+
+def test_snapshot_missing(tmpdir):
+    path = str(tmpdir.join("missing.snapshot"))
+    assert load_snapshot(path, _TALENT_WSDL, zeep.transports.Transport()) is None
+
+
+def test_snapshot_other_wsdl(tmpdir):
+    path = str(tmpdir.join("talent.snapshot"))
+    compile_snapshot(_TALENT_WSDL, path)
+    assert (
+        load_snapshot(path, "tests/fixtures/v30_1/test_wsdl", zeep.transports.Transport())
+        is None
+    )
+
+
+def test_client_snapshot_dir(workday_client, tmpdir, mocker):
+    workday_client._snapshot_dir = str(tmpdir)
+    assert hasattr(workday_client.test, "sayHello")
+    assert os.path.exists(str(tmpdir.join("test.snapshot")))
+    assert isinstance(
+        workday_client.test.sayHello("xavier"), workday.soap.WorkdayResponse
+    )
+
+    # A second client loads the snapshot instead of parsing the WSDL
+    mocker.patch("workday.snapshot.compile_snapshot", side_effect=AssertionError)
+    workday_client._apis["test"] = "https://workday.com/api/v30"
+    assert isinstance(workday_client.test._client, SnapshotClient)
+    assert isinstance(
+        workday_client.test.sayHello("xavier"), workday.soap.WorkdayResponse
+    )
+
+
+def test_snapshot_wsdl_changed(tmpdir):
+    wsdl = tmpdir.join("talent_wsdl")
+    with open(_TALENT_WSDL, "rb") as fo:
+        wsdl.write_binary(fo.read())
+    path = str(tmpdir.join("talent.snapshot"))
+    compile_snapshot(str(wsdl), path)
+    assert load_snapshot(path, str(wsdl), zeep.transports.Transport()) is not None
+
+    # Changed behind the same URL
+    wsdl.write_binary(wsdl.read_binary() + b"\n<!-- v30.1 patch -->\n")
+    assert load_snapshot(path, str(wsdl), zeep.transports.Transport()) is None
+
+
+def test_snapshot_conditional_get(tmpdir):
+    server = WsdlServer()
+    transport = zeep.transports.Transport(session=server)
+    path = str(tmpdir.join("talent.snapshot"))
+    compile_snapshot(_TALENT_URL, path, transport)
+    # Downloaded once to parse and to keep its digest
+    assert server.requests == [{}]
+    assert load_snapshot(path, _TALENT_URL, transport) is not None
+    assert server.requests[1:] == [{"If-None-Match": '"v1"'}]
+
+    # A new ETag, but the same content
+    server.etag = '"v2"'
+    assert load_snapshot(path, _TALENT_URL, transport) is not None
+    assert len(server.requests) == 3
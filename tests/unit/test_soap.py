@@ -14,7 +14,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
 import pytest
+import requests
 
 import workday
 from workday.soap import WorkdayResponse, BaseSoapApiClient
@@ -128,3 +132,282 @@ def test_paging_from_page2(paged_response, mock_soap_client):
         pytest.fail("Did not raise StopIteration")
     except StopIteration:
         pass
+
+
+@pytest.fixture
+def many_pages():
+    return [
+        {
+            "Response_Results": {
+                "Page": page,
+                "Total_Pages": 10,
+                "Total_Results": 10,
+                "Page_Results": 1,
+            },
+            "Response_Data": {"TestData": [{"TestRecord": page}]},
+        }
+        for page in range(1, 11)
+    ]
+
+
+@pytest.fixture
+def many_pages_service(many_pages):
+    class test_service(object):
+        def __init__(self):
+            self.filters = []
+
+        def Get_Test(self, **kwargs):
+            self.filters.append(kwargs["Response_Filter"])
+            return many_pages[kwargs["Response_Filter"]["Page"] - 1]
+
+    return test_service()
+
+
+@pytest.mark.parametrize("max_workers", (1, 4))
+def test_iter_pages(many_pages, many_pages_service, max_workers):
+    page_1 = WorkdayResponse(
+        response=many_pages[0],
+        service=many_pages_service,
+        method="Get_Test",
+        called_args=(),
+        called_kwargs={"Response_Filter": {"Count": 1}},
+    )
+    pages = list(page_1.iter_pages(max_workers=max_workers))
+    assert [page.page for page in pages] == list(range(2, 11))
+    # Every worker has its own copy of the filter
+    assert sorted(f["Page"] for f in many_pages_service.filters) == list(range(2, 11))
+    assert all(f["Count"] == 1 for f in many_pages_service.filters)
+    assert page_1.called_kwargs == {"Response_Filter": {"Count": 1}}
+
+
+def test_iter_pages_unordered(many_pages, many_pages_service):
+    page_1 = WorkdayResponse(
+        response=many_pages[0],
+        service=many_pages_service,
+        method="Get_Test",
+        called_args=(),
+        called_kwargs={},
+    )
+    pages = page_1.iter_pages(max_workers=4, ordered=False)
+    assert sorted(page.page for page in pages) == list(range(2, 11))
+
+
+def test_iter_max_workers(many_pages, many_pages_service):
+    page_1 = WorkdayResponse(
+        response=many_pages[0],
+        service=many_pages_service,
+        method="Get_Test",
+        called_args=(),
+        called_kwargs={},
+        max_workers=3,
+    )
+    assert [page.page for page in page_1] == list(range(2, 11))
+
+
+def test_iter_pages_prefetch(many_pages, many_pages_service):
+    page_1 = WorkdayResponse(
+        response=many_pages[0],
+        service=many_pages_service,
+        method="Get_Test",
+        called_args=(),
+        called_kwargs={},
+        prefetch=2,
+    )
+    pages = iter(page_1)
+    assert [page.page for page in pages] == list(range(2, 11))
+    assert pages.stats.items == 9
+
+
+def test_iter_records(many_pages, many_pages_service):
+    page_1 = WorkdayResponse(
+        response=many_pages[0],
+        service=many_pages_service,
+        method="Get_Test",
+        called_args=(),
+        called_kwargs={},
+    )
+    records = page_1.iter_records("TestData", max_workers=2)
+    assert [r["TestRecord"] for r in records] == list(range(1, 11))
+
+
+@pytest.mark.parametrize("max_workers", (1, 4))
+def test_iter_records_stops_early(many_pages, many_pages_service, max_workers):
+    page_1 = WorkdayResponse(
+        response=many_pages[0],
+        service=many_pages_service,
+        method="Get_Test",
+        called_args=(),
+        called_kwargs={},
+        prefetch=1,
+    )
+    threads = set(threading.enumerate())
+    records = page_1.iter_records("TestData", max_workers=max_workers)
+    assert [next(records)["TestRecord"] for _ in range(3)] == [1, 2, 3]
+    assert set(threading.enumerate()) - threads
+    records.close()
+    assert not set(threading.enumerate()) - threads
+
+
+def test_iter_stops_early(many_pages, many_pages_service):
+    page_1 = WorkdayResponse(
+        response=many_pages[0],
+        service=many_pages_service,
+        method="Get_Test",
+        called_args=(),
+        called_kwargs={},
+        prefetch=1,
+    )
+    threads = set(threading.enumerate())
+    for page in page_1:
+        if page.page == 3:
+            break
+    # The abandoned prefetch iterator was collected and stops its thread
+    for thread in set(threading.enumerate()) - threads:
+        thread.join(timeout=1)
+        assert not thread.is_alive()
+
+
+def test_soap_method_iter_records(many_pages, many_pages_service):
+    class api(object):
+        max_workers = None
+        prefetch = None
+        service = many_pages_service
+
+    many_pages_service.Get_Test = lambda **kwargs: many_pages[
+        kwargs.get("Response_Filter", {}).get("Page", 1) - 1
+    ]
+    method = workday.soap.SoapMethod(api, "Get_Test")
+    assert [r["TestRecord"] for r in method.iter_records("TestData")] == list(
+        range(1, 11)
+    )
+
+
+def test_soap_method_iter_records_options(many_pages, many_pages_service, fake_api):
+    calls = []
+    threads = set()
+
+    def get_test(**kwargs):
+        calls.append(kwargs)
+        threads.add(threading.current_thread().name)
+        return many_pages[kwargs.get("Response_Filter", {}).get("Page", 1) - 1]
+
+    many_pages_service.Get_Test = get_test
+    records = fake_api(many_pages_service).Get_Test.iter_records(
+        "TestData", max_workers=4, prefetch=2, Response_Filter={"Count": 1}
+    )
+    assert [r["TestRecord"] for r in records] == list(range(1, 11))
+    # The following pages were fetched by the worker threads
+    assert len(threads) > 1
+    # Only the arguments of the web method are sent
+    assert all(set(call) == {"Response_Filter"} for call in calls)
+
+
+def test_response_mode_dict(talent_client):
+    talent_client._response_mode = "dict"
+    response = talent_client.talent.Get_Languages()
+    assert response.page == 1
+    assert response.total_pages == 1
+    assert response.total_results == 87
+    languages = response.data["Language"]
+    assert len(languages) == 87
+    assert languages[0]["Language_Reference"]["ID"] == [
+        {"type": "WID", "_value_1": "f942185b33c210c3b1644501bdf38835"},
+        {"type": "Language_ID", "_value_1": "English"},
+    ]
+    assert languages[0]["Language_Data"]["Language_Description"] == "English"
+
+
+def test_response_mode_xml(talent_client):
+    talent_client._response_mode = "xml"
+    response = talent_client.talent.Get_Languages()
+    assert response.total_results == 87
+    assert response.data.tag == "{urn:com.workday/bsvc}Response_Data"
+    assert len(list(response.iter_records("Language"))) == 87
+
+
+def test_response_mode_fault(talent_client):
+    talent_client._response_mode = "dict"
+    with pytest.raises(workday.exceptions.WorkdaySoapApiError):
+        talent_client.talent.Get_Mentorships()
+
+
+def test_response_mode_transport_error(talent_client, mocker):
+    talent_client._response_mode = "dict"
+    api = talent_client.talent
+    mocker.patch.object(
+        talent_client._session, "post", side_effect=requests.ConnectionError("reset")
+    )
+    with pytest.raises(requests.ConnectionError):
+        api.Get_Languages()
+    mocker.stopall()
+    # zeep calls on this thread still return zeep objects
+    api.response_mode = "zeep"
+    assert api.Get_Languages().total_results == 87
+
+
+def test_bad_response_mode(test_wsdl, test_authentication):
+    client = workday.WorkdayClient(
+        wsdls=test_wsdl, authentication=test_authentication, response_mode="banana"
+    )
+    with pytest.raises(ValueError):
+        client.test
+
+
+def test_response_mode_slots(talent_client):
+    talent_client._response_mode = "slots"
+    response = talent_client.talent.Get_Languages()
+    assert response.total_results == 87
+    languages = list(response.iter_records("Language"))
+    assert len(languages) == 87
+    language = languages[0]
+    assert not hasattr(language, "__dict__")
+    assert language.Language_Data[0].Language_Description == "English"
+    ids = language.Language_Reference.ID
+    assert [(i.type, i._value_1) for i in ids] == [
+        ("WID", "f942185b33c210c3b1644501bdf38835"),
+        ("Language_ID", "English"),
+    ]
+    # Reference type IDs are shared between records
+    assert ids[1].type is languages[1].Language_Reference.ID[1].type
+    assert type(language) is type(languages[1])
+    assert language["Language_Reference"] is language.Language_Reference
+
+
+def test_response_mode_slots_as_dict(talent_client):
+    talent_client._response_mode = "slots"
+    language = talent_client.talent.Get_Languages().data["Language"][0]
+    assert language.as_dict()["Language_Reference"]["ID"][0] == {
+        "type": "WID",
+        "_value_1": "f942185b33c210c3b1644501bdf38835",
+    }
+
+
+@pytest.fixture()
+def parse_executor():
+    executor = ProcessPoolExecutor(max_workers=2)
+    yield executor
+    executor.shutdown(wait=True)
+
+
+def test_parse_executor(talent_client, parse_executor):
+    talent_client._response_mode = "dict"
+    expected = talent_client.talent.Get_Languages().data
+    talent_client.talent.parse_executor = parse_executor
+    response = talent_client.talent.Get_Languages()
+    assert response.total_results == 87
+    assert response.data == expected
+
+
+def test_parse_executor_fault(talent_client, parse_executor):
+    talent_client._response_mode = "dict"
+    talent_client.talent.parse_executor = parse_executor
+    with pytest.raises(workday.exceptions.WorkdaySoapApiError) as exc:
+        talent_client.talent.Get_Mentorships()
+    assert exc.value._fault.code == "SOAP-ENV:Server.processingError"
+
+
+def test_parse_processes_requires_dict(test_wsdl, test_authentication):
+    with pytest.raises(ValueError):
+        workday.WorkdayClient(
+            wsdls=test_wsdl, authentication=test_authentication, parse_processes=2
+        )
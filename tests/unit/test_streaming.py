@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+# Licensed to Anthony Shaw (anthonyshaw@apache.org) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import io
+
+import pytest
+from lxml import etree
+
+import workday.exceptions
+from workday.streaming import StreamingResponse
+
+
+def test_stream_matches_regular_response(talent_client):
+    expected = talent_client.talent.Get_Languages().data["Language"]
+    stream = talent_client.talent.Get_Languages.stream()
+    assert isinstance(stream, StreamingResponse)
+    assert stream.page == 1
+    assert stream.total_pages == 1
+    assert stream.total_results == 87
+    records = list(stream)
+    assert len(records) == 87
+    assert records == expected
+
+
+def test_stream_elements(talent_client):
+    stream = StreamingResponse(talent_client.talent, "Get_Languages", (), {}, parse=False)
+    tags = []
+    for element in stream:
+        # Records are complete when handed out
+        assert element.find("{urn:com.workday/bsvc}Language_Data") is not None
+        tags.append(element.tag)
+    assert tags == ["{urn:com.workday/bsvc}Language"] * 87
+
+
+def test_stream_iter_records(talent_client):
+    records = list(talent_client.talent.Get_Degrees.stream().iter_records())
+    assert len(records) == len(talent_client.talent.Get_Degrees().data["Degree"])
+
+
+def test_stream_fault(talent_client):
+    with pytest.raises(workday.exceptions.WorkdaySoapApiError) as exc:
+        list(talent_client.talent.Get_Mentorships.stream())
+    assert exc.value.message == "Processing error occurred. The task submitted is not authorized."
+
+
+class _StreamedReply(object):
+    status_code = 200
+
+    def __init__(self, content):
+        self.raw = io.BytesIO(content)
+
+    def close(self):
+        pass
+
+
+def test_stream_entities_not_expanded(talent_client, mocker):
+    with open("tests/fixtures/v30_1/talent/Get_Languages.xml", "rb") as fo:
+        content = fo.read()
+    content = content.replace(
+        b"?>", b'?>\n<!DOCTYPE env:Envelope [<!ENTITY boom "BOOM">]>', 1
+    ).replace(b">English<", b">&boom;<", 1)
+    api = talent_client.talent
+    mocker.patch.object(
+        api._client.transport, "post_stream", return_value=_StreamedReply(content)
+    )
+    stream = StreamingResponse(api, "Get_Languages", (), {}, parse=False)
+    records = [etree.tostring(element) for element in stream]
+    assert len(records) == 87
+    assert not [record for record in records if b"BOOM" in record]
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+# Licensed to Anthony Shaw (anthonyshaw@apache.org) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+
+from workday.checkpoint import CheckpointStore
+from workday.sync import DeltaSync
+
+
+class ChangeService(object):
+    """
+    Returns every worker without criteria, only the changed ones with
+    """
+
+    def __init__(self):
+        self.calls = []
+
+    def Get_Workers(self, **kwargs):
+        self.calls.append(kwargs)
+        criteria = kwargs.get("Request_Criteria", {})
+        workers = [1, 2, 3] if "Transaction_Log_Criteria_Data" not in criteria else [2]
+        return {
+            "Response_Results": {
+                "Page": 1,
+                "Total_Pages": 1,
+                "Total_Results": len(workers),
+                "Page_Results": len(workers),
+            },
+            "Response_Data": {"Worker": workers},
+        }
+
+
+@pytest.fixture()
+def client(fake_api):
+    class client(object):
+        hcm = fake_api(ChangeService(), name="hcm")
+
+    return client()
+
+
+def test_delta_sync(client, tmpdir):
+    store = CheckpointStore(str(tmpdir))
+    sync = DeltaSync(client, "hcm", "Get_Workers", "Worker", store, overlap=0)
+    assert sync.watermark is None
+    assert list(sync.changes(Request_Criteria={"Exclude_Inactive_Workers": True})) == [1, 2, 3]
+    watermark = sync.watermark
+    assert watermark is not None
+
+    assert list(sync.changes(Request_Criteria={"Exclude_Inactive_Workers": True})) == [2]
+    call = client.hcm.service.calls[-1]
+    assert call["Request_Criteria"]["Exclude_Inactive_Workers"] is True
+    window = call["Request_Criteria"]["Transaction_Log_Criteria_Data"][
+        "Transaction_Date_Range_Data"
+    ]
+    assert window["Updated_From"] == watermark
+    assert window["Updated_Through"] == call["Response_Filter"]["As_Of_Entry_DateTime"]
+    assert sync.watermark >= watermark
+
+
+def test_delta_sync_interrupted_run_keeps_watermark(client, tmpdir):
+    store = CheckpointStore(str(tmpdir))
+    sync = DeltaSync(client, "hcm", "Get_Workers", "Worker", store)
+    changes = sync.changes()
+    next(changes)
+    del changes
+    assert sync.watermark is None
+
+
+def test_delta_sync_without_initial_load(client, tmpdir):
+    store = CheckpointStore(str(tmpdir))
+    sync = DeltaSync(client, "hcm", "Get_Workers", "Worker", store, full_initial=False)
+    assert list(sync.changes()) == []
+    assert sync.watermark is not None
+    assert list(sync.changes()) == [2]
+    sync.reset()
+    assert sync.watermark is None
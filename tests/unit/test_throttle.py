@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+# Licensed to Anthony Shaw (anthonyshaw@apache.org) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+import time
+
+import pytest
+import requests
+
+from workday.concurrency import bounded_map
+from workday.throttle import ConcurrencyGovernor, Throttle, TokenBucket
+from workday.transport import WorkdayTransport
+
+
+class MockResponse(object):
+    def __init__(self, status_code, content=b"", headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+_FAULT = (
+    b"<env:Envelope><env:Body><env:Fault><faultcode>SOAP-ENV:Client.throttled</faultcode>"
+    b"<faultstring>Too many requests, try again later</faultstring>"
+    b"</env:Fault></env:Body></env:Envelope>"
+)
+
+
+def test_token_bucket_rate():
+    bucket = TokenBucket(rate=50, burst=5)
+    start = time.time()
+    for _ in range(10):
+        bucket.acquire()
+    # 5 from the burst, 5 more at 50/s
+    assert time.time() - start >= 0.09
+
+
+def test_governor_additive_increase():
+    governor = ConcurrencyGovernor(initial=2, maximum=3)
+    for _ in range(20):
+        governor.acquire()
+        governor.release(0.01)
+    assert governor.limit == 3
+
+
+def test_governor_decreases_once_per_round_trip():
+    governor = ConcurrencyGovernor(initial=16)
+    for _ in range(4):
+        governor.acquire()
+    for _ in range(4):
+        governor.release(1.0, throttled=True)
+    assert governor.limit == 8
+    governor.acquire()
+    governor.release(0.0, throttled=True)
+    assert governor.limit == 4
+
+
+def test_governor_latency_target():
+    governor = ConcurrencyGovernor(initial=4, latency_target=0.5)
+    governor.acquire()
+    governor.release(2.0)
+    assert governor.limit == 2
+
+
+def test_governor_limits_concurrency():
+    governor = ConcurrencyGovernor(initial=2, maximum=2)
+    active = []
+    peak = []
+    lock = threading.Lock()
+
+    def work(_):
+        governor.acquire()
+        with lock:
+            active.append(1)
+            peak.append(len(active))
+        time.sleep(0.01)
+        with lock:
+            active.pop()
+        governor.release(0.01)
+
+    list(bounded_map(work, range(10), max_workers=6))
+    assert max(peak) == 2
+
+
+@pytest.mark.parametrize(
+    "throttled",
+    [
+        MockResponse(503),
+        MockResponse(429),
+        MockResponse(500, _FAULT),
+    ],
+)
+def test_throttle_retries(throttled):
+    throttle = Throttle(backoff=0.001)
+    replies = [throttled, MockResponse(200, b"ok")]
+    response = throttle.send(lambda: replies.pop(0))
+    assert response.content == b"ok"
+    assert throttled.closed
+    assert throttle.stats.requests == 2
+    assert throttle.stats.throttled == 1
+    assert throttle.governor.limit < 4
+
+
+def test_throttle_other_faults_not_retried():
+    throttle = Throttle(backoff=0.001)
+    fault = MockResponse(500, b"<faultstring>Invalid ID value</faultstring>")
+    assert throttle.send(lambda: fault) is fault
+    assert throttle.stats.requests == 1
+
+
+def test_throttle_gives_up():
+    throttle = Throttle(backoff=0.001, max_retries=2)
+    response = throttle.send(lambda: MockResponse(503))
+    assert response.status_code == 503
+    assert throttle.stats.requests == 3
+
+
+def test_throttle_retry_after(mocker):
+    sleep = mocker.patch("workday.throttle.time.sleep")
+    throttle = Throttle()
+    replies = [MockResponse(503, headers={"Retry-After": "7"}), MockResponse(200)]
+    throttle.send(lambda: replies.pop(0))
+    sleep.assert_called_once_with(7.0)
+
+
+def test_throttle_errors_decrease_limit():
+    throttle = Throttle(initial_concurrency=4)
+
+    def send():
+        raise requests.ConnectionError("connection reset")
+
+    with pytest.raises(requests.ConnectionError):
+        throttle.send(send)
+    assert throttle.governor.limit == 2
+    assert throttle.governor.active == 0
+    assert throttle.stats.requests == 1
+
+
+def test_transport_throttle():
+    class MockSession(object):
+        headers = {}
+
+        def __init__(self):
+            self.replies = [MockResponse(503), MockResponse(200, b"ok")]
+
+        def post(self, address, data=None, headers=None, timeout=None):
+            return self.replies.pop(0)
+
+    throttle = Throttle(backoff=0.001)
+    transport = WorkdayTransport(session=MockSession(), throttle=throttle)
+    assert transport.post("https://x", b"<envelope/>", {}).content == b"ok"
+    assert throttle.stats.throttled == 1
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+# Licensed to Anthony Shaw (anthonyshaw@apache.org) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+
+import workday.exceptions
+from workday.timing import PHASES, CallTimings
+
+
+@pytest.mark.parametrize("mode", ["zeep", "dict"])
+def test_response_timings(talent_client, mode):
+    talent_client._response_mode = mode
+    response = talent_client.talent.Get_Languages()
+    timings = response.timings
+    assert isinstance(timings, CallTimings)
+    assert (timings.api, timings.method) == ("talent", "Get_Languages")
+    assert timings.attempts == 1
+    assert timings.error is None
+    assert timings.paged
+    assert timings.request_bytes > 0
+    assert timings.response_bytes > 10000
+    for phase in PHASES:
+        assert getattr(timings, phase) >= 0
+    assert timings.serialize > 0
+    assert timings.parse > 0
+    assert timings.build > 0
+    assert sum(getattr(timings, phase) for phase in PHASES) <= timings.total
+
+
+def test_timing_hooks(talent_client):
+    calls = []
+    talent_client.talent.hooks.append(calls.append)
+    response = talent_client.talent.Get_Languages()
+    assert calls == [response.timings]
+    with pytest.raises(workday.exceptions.WorkdaySoapApiError):
+        talent_client.talent.Get_Mentorships()
+    assert calls[1].method == "Get_Mentorships"
+    assert calls[1].error is not None
+
+
+def test_timing_hook_errors_are_logged(talent_client, caplog):
+    def broken(timings):
+        raise RuntimeError("broken hook")
+
+    talent_client.talent.hooks.append(broken)
+    assert talent_client.talent.Get_Languages().total_results == 87
+    assert "broken hook" in caplog.text
+
+
+def test_timings_as_dict(talent_client):
+    timings = talent_client.talent.Get_Languages().timings.as_dict()
+    assert set(timings) == set(PHASES) | {
+        "api",
+        "method",
+        "total",
+        "request_bytes",
+        "response_bytes",
+        "attempts",
+        "error",
+        "paged",
+    }
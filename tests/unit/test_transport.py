@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+# Licensed to Anthony Shaw (anthonyshaw@apache.org) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import gzip
+import io
+
+from workday.transport import WorkdayTransport
+
+
+class MockSession(object):
+    def __init__(self):
+        self.headers = {}
+        self.posts = []
+
+    def post(self, address, data=None, headers=None, timeout=None, stream=False):
+        self.posts.append((data, headers))
+        return object()
+
+
+def test_transport_accepts_compressed_replies():
+    session = MockSession()
+    WorkdayTransport(session=session).post("https://x", b"<envelope/>", {})
+    assert session.posts[0] == (b"<envelope/>", {"Accept-Encoding": "gzip, deflate"})
+
+
+def test_transport_compress_requests():
+    session = MockSession()
+    transport = WorkdayTransport(session=session, compress_requests=100)
+    transport.post("https://x", b"<small/>", {"SOAPAction": '""'})
+    large = b"<envelope>" + b"<a>1</a>" * 100 + b"</envelope>"
+    transport.post("https://x", large, {"SOAPAction": '""'})
+    small_body, small_headers = session.posts[0]
+    assert small_body == b"<small/>"
+    assert "Content-Encoding" not in small_headers
+    body, headers = session.posts[1]
+    assert headers["Content-Encoding"] == "gzip"
+    assert headers["SOAPAction"] == '""'
+    assert len(body) < len(large)
+    assert gzip.GzipFile(fileobj=io.BytesIO(body)).read() == large